@@ -1,29 +1,38 @@
 from __future__ import annotations
-# PDF-Erzeugung
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4, A3, letter, landscape
-from reportlab.lib import colors
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.pdfbase import pdfmetrics
-# Benutzeroberfläche
-from tkinter import ttk, messagebox, filedialog as fd
-import ttkbootstrap as ttkb
-from ttkbootstrap.icons import Icon
-import configparser
+import time
+_T_START = time.perf_counter() # Beginn des Modul-Imports, für die Messung der Startzeit
 
-import icalendar     # .ics-Parser
-import requests      # HTTP-Abruf
+# Schwere Pakete werden erst geladen, wenn sie gebraucht werden, damit Fenster und Kommandozeile schnell da sind:
+#  - reportlab (PDF-Erzeugung)     in PdfSchreiber
+#  - requests (HTTP-Abruf)         in get_session
+#  - icalendar (.ics-Parser)       nur im Parser-Modus 'icalendar'
+#  - dateutil (Monatsarithmetik)   beim Einlesen
+#  - ttkbootstrap / tkinter (GUI)  nur in jcal_gui.py
+import configparser
 
 from pathlib import Path
 import calendar
-from icalendar import Calendar
 import datetime as dt
 from datetime import datetime, timedelta, date
-from dateutil.relativedelta import relativedelta
 import locale
 import tempfile
 import webbrowser
 from collections import defaultdict
+import hashlib
+import json
+import io
+import re
+import functools
+import zoneinfo
+import bisect
+from array import array
+import itertools
+import threading
+import argparse
+import contextlib
+import logging
+from typing import NamedTuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import sys, subprocess, os
 
@@ -53,313 +62,1518 @@ def open_file(path: str | os.PathLike):
    else:
       subprocess.run(["xdg-open", path], check=False)
 
+# --- Protokoll und Laufzeitmessung ---------------------------------------------------------------------------------
+#     Statt print(): Meldungen mit Stufe; ausgeschaltete Stufen kosten in den Schleifen nur einen Vergleich
+#     (Argumente werden erst formatiert, wenn die Meldung wirklich ausgegeben wird)
+log = logging.getLogger("jcal")
+
+def setup_logging(verbose=0):
+   # --- 0: Warnungen, 1 (-v): Zusammenfassungen, 2 (-vv): jeder Termin und jede Monatsspalte
+   level = (logging.WARNING, logging.INFO, logging.DEBUG)[min(verbose, 2)]
+   log.setLevel(level)
+   if sys.stderr is None:         # z.B. PyInstaller-Build ohne Konsole: keine Ausgabe möglich
+      log.addHandler(logging.NullHandler())
+      log.propagate = False
+   else:
+      logging.basicConfig(format="%(message)s")
+
+class Metriken:
+   # --- Zeitabschnitte (Summe der Sekunden, Anzahl) und Zähler eines Laufs, auch aus mehreren Threads
+   def __init__(self):
+      self._lock   = threading.Lock()
+      self.spans   = defaultdict(lambda: [0.0, 0])
+      self.zaehler = defaultdict(int)
+
+   @contextlib.contextmanager
+   def span(self, name):
+      t0 = time.perf_counter()
+      try:
+         yield
+      finally:
+         self.add_span(name, time.perf_counter() - t0)
+
+   def add_span(self, name, sekunden):
+      with self._lock:
+         span = self.spans[name]
+         span[0] += sekunden
+         span[1] += 1
+      log.debug("Zeit %s: %.3f s", name, sekunden)
+
+   def zaehle(self, name, anzahl=1):
+      with self._lock:
+         self.zaehler[name] += anzahl
+
+   def report(self) -> dict:
+      with self._lock:
+         return {'spans':   {name: {'sekunden': round(sek, 6), 'anzahl': anz} for name, (sek, anz) in self.spans.items()},
+                 'zaehler': dict(self.zaehler)}
+
 FONT_DIR = Path(__file__).with_name("fonts")
 #INI_PATH = get_ini_path()
 INI_PATH = Path.home() / "jcal.ini"
 ICON_PATH = Path(__file__).with_name("icon") / "Chaninja-Chaninja-Folder-Program-Files.ico"
+CACHE_DIR = Path.home() / "jcal_cache"
+CACHE_MAX_AGE   = 0                   # Sekunden, in denen ein Feed ohne Rückfrage beim Server verwendet wird
+CACHE_MAX_BYTES = 200 * 1024 * 1024   # Obergrenze für die Gesamtgröße des Caches
+CACHE_MEM_TTL   = 300                 # Sekunden, in denen ein gerade geladener Feed im Prozess wiederverwendet wird
+HTTP_TIMEOUT    = (5, 30)             # (Verbindungsaufbau, Lesen) in Sekunden
+HTTP_RETRIES    = 3                   # Wiederholungen bei Verbindungsfehlern und 429/5xx, mit Backoff
+CHECK_BYTES     = 4096                # so viele Bytes reichen zur Prüfung auf einen iCalendar-Stream
+FEED_WORKERS    = 8                   # so viele Feeds werden gleichzeitig abgerufen
+STORE_PATH      = CACHE_DIR / "jcal_termine.sqlite"  # lokaler Terminspeicher (optional, siehe EventStore)
+
+# --- eine gemeinsame HTTP-Session für alle Abrufe (Connection-Pooling, Timeouts, Retry/Backoff) ---------------
+_session = None
+def get_session():
+   global _session
+   if _session is None:
+      import requests
+      from requests.adapters import HTTPAdapter
+      from urllib3.util.retry import Retry
+      retry   = Retry(total=HTTP_RETRIES, backoff_factor=0.5,
+                      status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET", "HEAD"))
+      adapter = HTTPAdapter(max_retries=retry, pool_connections=8, pool_maxsize=8)
+      _session = requests.Session()
+      _session.mount("http://",  adapter)
+      _session.mount("https://", adapter)
+   return _session
+
+def split_feeds(feedurl) -> list[str]:
+   # --- ein oder mehrere Feeds: Liste oder ein Feed je Zeile (INI, Stapeldatei); nur an Zeilenumbrüchen trennen,
+   #     lokale Pfade und file://-URLs dürfen Leerzeichen enthalten
+   if isinstance(feedurl, str):
+      feedurl = feedurl.splitlines()
+   return [url.strip() for url in feedurl if url.strip()]
+
+def ical_probe(head: bytes) -> str | None:
+   # sehr grobe Prüfung auf ics-Stream (kann je nach Quelle variieren)
+   if b"BEGIN:VCALENDAR" not in head[:CHECK_BYTES]:
+      return "Das scheint kein gültiger iCalendar-Stream zu sein"
+   return None
+
+# ################################################################################################################
+# ### Feed-Cache: Zwischenspeicher für Kalenderfeeds mit bedingten Abfragen (ETag / Last-Modified) ###############
+# ################################################################################################################
+class FeedCache:
+   def __init__(self, cache_dir=CACHE_DIR, max_age=CACHE_MAX_AGE, max_bytes=CACHE_MAX_BYTES, mem_ttl=CACHE_MEM_TTL,
+                stand=None):
+      self.cache_dir = Path(cache_dir)
+      self.stand     = stand or {}  # feste Inhalte je URL, z.B. vom Render-Dienst: kein Abruf, kein Ablauf
+      self.max_age   = max_age
+      self.max_bytes = max_bytes
+      self.mem_ttl   = mem_ttl
+      self._mem      = {}   # In-Prozess-Speicher: url -> (Zeitpunkt, Inhalt), z.B. von der Verbindungsprüfung geladen
+      self._lock     = threading.Lock() # mehrere Feeds werden parallel abgerufen
+      # --- Statistik: Treffer (Feed kam aus dem Cache), Fehlschläge (Feed musste komplett geladen werden)
+      self.hits           = 0
+      self.misses         = 0
+      self.revalidated    = 0    # davon Treffer per "304 Not Modified"
+      self.bytes_saved    = 0
+      self.seconds_saved  = 0.0
+
+   def _paths(self, url):
+      key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+      return self.cache_dir / f"{key}.ics", self.cache_dir / f"{key}.json"
+
+   def _write(self, path, data: bytes):
+      # --- erst in eine temporäre Datei schreiben und dann umbenennen, damit nie eine halbe Datei im Cache liegt;
+      #     eigener Name je Prozess und Thread, da derselbe Feed gleichzeitig mehrfach abgerufen werden kann
+      tmp = path.with_suffix(f"{path.suffix}.{os.getpid()}.{threading.get_ident()}.tmp")
+      tmp.write_bytes(data)
+      os.replace(tmp, path)
+
+   def _read_meta(self, meta_path):
+      try:
+         return json.loads(meta_path.read_text(encoding="utf-8"))
+      except (OSError, ValueError):
+         return None
+
+   def _hit(self, meta, meta_path, body_path, seconds_needed=0.0):
+      body = body_path.read_bytes()
+      with self._lock:
+         self.hits          += 1
+         self.bytes_saved   += len(body)
+         self.seconds_saved += max(0.0, meta.get("dl_seconds", 0.0) - seconds_needed)
+      meta["accessed"] = time.time()
+      self._write(meta_path, json.dumps(meta).encode("utf-8"))
+      return body
+
+   # --- Feed abrufen: aus dem Prozess-Speicher, dem Cache, per bedingter Abfrage oder komplett -------------------
+   #     probe(kopf) prüft die ersten CHECK_BYTES und liefert ggf. eine Fehlermeldung; ein ungeeigneter Stream wird
+   #     dann nach den ersten Kilobytes abgebrochen statt komplett geladen; revalidate: immer beim Server nachfragen
+   #     (bedingt, also meist nur "304 Not Modified"), z.B. im Überwachungsmodus
+   def fetch(self, url: str, probe=None, revalidate=False) -> bytes:
+      if url in self.stand:
+         return self._check(probe, self.stand[url])
+      gemerkt = self._mem.get(url)
+      if gemerkt and not revalidate and time.monotonic() - gemerkt[0] < self.mem_ttl:
+         body = gemerkt[1]
+         self._check(probe, body)
+         with self._lock:
+            self.hits        += 1
+            self.bytes_saved += len(body)
+         return body
+
+      body_path, meta_path = self._paths(url)
+      meta = self._read_meta(meta_path) if body_path.exists() else None
+
+      headers = {}
+      if meta:
+         # --- noch frisch genug? Dann gar nicht erst beim Server nachfragen
+         if self.max_age and not revalidate and time.time() - meta["fetched"] < self.max_age:
+            return self._remember(url, self._check(probe, self._hit(meta, meta_path, body_path)))
+         if meta.get("etag"):          headers["If-None-Match"]     = meta["etag"]
+         if meta.get("last_modified"): headers["If-Modified-Since"] = meta["last_modified"]
+
+      t0 = time.perf_counter()
+      with get_session().get(url, headers=headers, timeout=HTTP_TIMEOUT, stream=True) as response:
+         if response.status_code == 304 and meta:
+            with self._lock:
+               self.revalidated += 1
+            meta["fetched"] = time.time()
+            return self._remember(url, self._check(probe, self._hit(meta, meta_path, body_path, time.perf_counter() - t0)))
+         response.raise_for_status()
+         kopf = next(response.iter_content(chunk_size=CHECK_BYTES), b"")
+         self._check(probe, kopf)
+         body = b"".join([kopf, *response.iter_content(chunk_size=64 * 1024)])
+      with self._lock:
+         self.misses += 1
+
+      jetzt = time.time()
+      meta = {'url':           url,
+              'etag':          response.headers.get("ETag"),
+              'last_modified': response.headers.get("Last-Modified"),
+              'fetched':       jetzt,
+              'accessed':      jetzt,
+              'size':          len(body),
+              'dl_seconds':    time.perf_counter() - t0}
+      try:
+         self.cache_dir.mkdir(parents=True, exist_ok=True)
+         self._write(body_path, body)
+         self._write(meta_path, json.dumps(meta).encode("utf-8"))
+         with self._lock:
+            self.evict()
+      except OSError as exc:
+         log.warning("Feed-Cache: Feed konnte nicht gespeichert werden (%s)", exc)
+      return self._remember(url, body)
+
+   def _check(self, probe, body: bytes) -> bytes:
+      if probe is not None:
+         fehler = probe(body[:CHECK_BYTES])
+         if fehler:
+            raise ValueError(fehler)
+      return body
+
+   def _remember(self, url, body: bytes) -> bytes:
+      # --- nur die zuletzt verwendeten Feeds im Prozess halten
+      with self._lock:
+         self._mem.pop(url, None)
+         self._mem[url] = (time.monotonic(), body)
+         while len(self._mem) > 8:
+            del self._mem[next(iter(self._mem))]
+      return body
+
+   # --- LRU: die am längsten nicht verwendeten Feeds löschen, bis die Größenbeschränkung eingehalten wird ---------
+   def evict(self):
+      eintraege = []
+      for meta_path in self.cache_dir.glob("*.json"):
+         meta = self._read_meta(meta_path)
+         if meta is None:
+            continue
+         eintraege.append((meta.get("accessed", 0), meta.get("size", 0), meta_path))
+      gesamt = sum(size for _, size, _ in eintraege)
+      for _, size, meta_path in sorted(eintraege):
+         if gesamt <= self.max_bytes:
+            break
+         meta_path.with_suffix(".ics").unlink(missing_ok=True)
+         meta_path.unlink(missing_ok=True)
+         gesamt -= size
+
+   # --- Version eines gespeicherten Feeds laut Server (ETag, sonst Last-Modified), z.B. als Teil eines Cache-Schlüssels
+   def validator(self, url: str) -> str | None:
+      meta = self._read_meta(self._paths(url)[1])
+      if not meta:
+         return None
+      return meta.get("etag") or meta.get("last_modified")
+
+   def stats(self) -> dict:
+      return {'hits':          self.hits,
+              'misses':        self.misses,
+              'revalidated':   self.revalidated,
+              'bytes_saved':   self.bytes_saved,
+              'seconds_saved': round(self.seconds_saved, 3)}
+
+   def summary(self) -> str:
+      return (f"{self.hits} Treffer ({self.revalidated} davon per 304), {self.misses} Downloads, "
+              f"{self.bytes_saved/1024:.0f} KB und {self.seconds_saved:.2f} s gespart")
+
+# ################################################################################################################
+# ### Lokale Feeds: Dateipfade, file://-URLs, .ics.gz und stdin ('-') ############################################
+# ################################################################################################################
+#     Archivierte Feeds werden ohne Netz und ohne Feed-Cache gelesen: eine .ics-Datei über mmap (der Parser liest
+#     die Zeilen direkt aus dem Seitencache des Betriebssystems, die Datei wird nicht vorher in den Speicher
+#     kopiert), eine gzip-Datei als Strom (nie ganz entpackt im Speicher), stdin zeilenweise, z.B. in Pipelines:
+#        zcat archiv.ics.gz | python jcal.py -f - -m 8 -y 2025
+GZIP_MAGIC = b"\x1f\x8b"
+
+def ist_lokal(url: str) -> bool:
+   return url == "-" or url.lower().startswith("file:") or "://" not in url
+
+def lokaler_feed(url: str) -> LokalerFeed:
+   # --- stdin lässt sich nur einmal lesen, daher gibt es dafür nur eine Instanz je Prozess
+   return _stdin_feed() if url == "-" else LokalerFeed(url)
+
+@functools.lru_cache(maxsize=1)
+def _stdin_feed() -> LokalerFeed:
+   return LokalerFeed("-")
+
+class LokalerFeed:
+   def __init__(self, url: str):
+      self.url = url
+      if url == "-":
+         self.pfad = None
+      elif url.lower().startswith("file:"):
+         from urllib.parse import urlsplit
+         from urllib.request import url2pathname
+         self.pfad = Path(url2pathname(urlsplit(url).path))
+      else:
+         self.pfad = Path(url).expanduser()
+      self._puffer  = None    # stdin, sobald es mehr als einmal gebraucht wird (Version, Kopf)
+      self._gelesen = False
+
+   # --- Zeilen des Feeds (Bytes mit Zeilenende), nur innerhalb des with-Blocks gültig
+   @contextlib.contextmanager
+   def zeilen(self):
+      if self.pfad is None:
+         yield self._stdin()
+         return
+      with open(self.pfad, "rb") as datei:
+         if datei.read(2) == GZIP_MAGIC:
+            import gzip
+            datei.seek(0)
+            with gzip.GzipFile(fileobj=datei) as entpackt:
+               yield entpackt
+         elif os.fstat(datei.fileno()).st_size == 0:
+            yield iter(())
+         else:
+            import mmap
+            with mmap.mmap(datei.fileno(), 0, access=mmap.ACCESS_READ) as abbild:
+               yield iter(abbild.readline, b"")
+
+   def _stdin(self):
+      if self._puffer is not None:
+         return io.BytesIO(self._puffer)
+      if self._gelesen:
+         raise ValueError("stdin wurde bereits gelesen und kann nicht erneut gelesen werden")
+      self._gelesen = True
+      strom = sys.stdin.buffer
+      if strom.peek(2)[:2] == GZIP_MAGIC:
+         import gzip
+         return gzip.GzipFile(fileobj=strom)
+      return strom
+
+   # --- Prüfsumme des Inhalts (gzip: der gepackten Datei), z.B. für den Terminspeicher und den Überwachungsmodus
+   def version(self) -> str:
+      h = hashlib.sha1()
+      if self.pfad is None:
+         if self._puffer is None:
+            with self.zeilen() as zeilen:
+               self._puffer = b"".join(zeilen)
+         h.update(self._puffer)
+      else:
+         with open(self.pfad, "rb") as datei:
+            for block in iter(lambda: datei.read(1024 * 1024), b""):
+               h.update(block)
+      return h.hexdigest()
+
+   # --- Anfang des (entpackten) Inhalts, z.B. für ical_probe
+   def kopf(self) -> bytes:
+      if self.pfad is None:
+         self.version()
+         return self._puffer[:CHECK_BYTES]
+      kopf = b""
+      with self.zeilen() as zeilen:
+         for zeile in zeilen:
+            kopf += zeile
+            if len(kopf) >= CHECK_BYTES:
+               break
+      return kopf[:CHECK_BYTES]
+
+   def groesse(self) -> int:
+      if self.pfad is None:
+         return len(self._puffer) if self._puffer is not None else 0
+      return self.pfad.stat().st_size
+
+# --- Feed prüfen (z.B. in der GUI vor dem Erzeugen): lokale Feeds nur am Anfang lesen, alle anderen über den
+#     Feed-Cache laden, damit parseEvents sie ohne zweiten Abruf verwenden kann
+def pruefe_feed(cache: FeedCache, url: str, probe=ical_probe):
+   if not ist_lokal(url):
+      cache.fetch(url, probe)
+      return
+   fehler = probe(lokaler_feed(url).kopf())
+   if fehler:
+      raise ValueError(fehler)
+
+# --- Prüfsumme eines Feeds für den Überwachungsmodus (entfernte Feeds: bedingt beim Server nachfragen)
+def feed_pruefsumme(cache: FeedCache, url: str) -> bytes:
+   if ist_lokal(url):
+      return bytes.fromhex(lokaler_feed(url).version())
+   return hashlib.sha1(cache.fetch(url, revalidate=True)).digest()
+
+# ################################################################################################################
+# ### Termin-Datensätze und Parser (Streaming-Parser und icalendar als Rückfalloption) ###########################
+# ################################################################################################################
+# --- Termin-Datensatz: ein Tupel je Termin statt eines dict (deutlich kleiner, kein Schlüssel je Eintrag) -------
+class Termin(NamedTuple):
+   kategorien:    tuple[str, ...]     # gemeinsam genutzte Tupel aus internierten Namen, siehe kategorien_tupel()
+   ev_start:      datetime
+   ev_end:        datetime
+   summary:       str
+   ev_typ:        str                 # '1-mehrtaegig', '2-ganztaegig', '3-mehrtaegig_mZ' oder '4-default'
+   uid:           str | None = None
+   wiederholung:  dict | None = None  # Serientermin: {'dtstart', 'dtend', 'rrule', 'rdate', 'exdate'}, sonst None
+   recurrence_id: date | None = None  # Einzeltermin einer Serie: ursprünglicher Beginn, sonst None
+   ort:           str | None = None   # LOCATION, nur für die Terminfilter (siehe TerminFilter)
+
+# --- Kategorien kommen in einem Feed immer wieder in denselben Kombinationen vor: jede Kombination gibt es nur einmal
+@functools.lru_cache(maxsize=4096)
+def kategorien_tupel(*namen: str) -> tuple[str, ...]:
+   return tuple(sys.intern(name) for name in namen)
+
+# --- Termin-Datensatz aus DTSTART/DTEND/SUMMARY/CATEGORIES erzeugen (Terminart, Anfang und Ende bestimmen) -------
+def make_event(dtstart, dtend, summary, category_list, uid=None, wiederholung=None, recurrence_id=None,
+               ort=None) -> Termin:
+   ev_typ = "4-default"
+   if dtend:
+      if isinstance(dtstart, date) and not isinstance(dtstart, datetime): # ganztägig
+         dauer = (dtend - dtstart).days
+         if dauer > 1:                                                     # ganztägig mehrtägig
+            ev_typ = '1-mehrtaegig'
+         else:                                                             # ganztägig eintägig
+            ev_typ = '2-ganztaegig'
+      else:                                                               # Ereignis mit Zeitangabe
+         dauer = dtend -dtstart
+         if dauer.days >= 1:                                               # mehrtägiges Ereignis mit Zeitangabe
+            ev_typ = '3-mehrtaegig_mZ'
+         else:                                                             # normaler Temrin mit Zeitangabe
+            pass
+   else:
+      pass                                                                # kein DTEND, Dauer kann nicht bestimmt werden
+
+   evstart = dtstart if isinstance(dtstart, datetime) else datetime.combine(dtstart, datetime.min.time())
+   if isinstance(dtend, datetime):
+      evend = dtend
+   elif dtend:
+      evend = datetime.combine(dtend, datetime.min.time())
+   else:
+      evend = evstart + timedelta(days=1)
+
+   return Termin(kategorien_tupel(*category_list), evstart, evend, summary, ev_typ, uid, wiederholung, recurrence_id,
+                 ort)
+
+# --- Terminfilter und Rollen der Kategorien ------------------------------------------------------------------------
+#     Die Filter werden einmal je Lauf übersetzt und schon beim Einlesen angewendet: ein verworfener Termin wird im
+#     Streaming-Parser nicht einmal in datetime-Objekte umgewandelt und taucht in keinem Index auf. Die Rollen legen
+#     fest, welche Kategorien Feiertage bzw. Ferien markieren (eingefärbte Tage statt Legende); alle anderen
+#     Kategorien sind normale Termine.
+ROLLE_FEIERTAG, ROLLE_FERIEN, ROLLE_NORMAL = "feiertag", "ferien", "normal"
+KATEGORIE_ROLLEN = {"Feiertag": ROLLE_FEIERTAG, "Feiertage": ROLLE_FEIERTAG, "Ferien": ROLLE_FERIEN}
+
+class TerminFilter:
+   #     kategorien:      nur Termine mit mindestens einer dieser Kategorien (leer: alle)
+   #     ohne_kategorien: keine Termine mit einer dieser Kategorien
+   #     summary, ort:    reguläre Ausdrücke, die im Titel bzw. Ort vorkommen müssen (ohne_...: nicht vorkommen dürfen)
+   #     rollen:          Kategorie -> 'feiertag', 'ferien' oder 'normal', ergänzt bzw. überschreibt KATEGORIE_ROLLEN
+   def __init__(self, kategorien=(), ohne_kategorien=(), summary=None, ohne_summary=None, ort=None, ohne_ort=None,
+                rollen=None):
+      self.kategorien      = frozenset(kategorien)
+      self.ohne_kategorien = frozenset(ohne_kategorien)
+      try:
+         self.muster = [(feld, re.compile(ausdruck), soll) for feld, ausdruck, soll in
+                        ((0, summary, True), (0, ohne_summary, False), (1, ort, True), (1, ohne_ort, False)) if ausdruck]
+      except re.error as exc:
+         raise ValueError(f"ungültiger regulärer Ausdruck im Terminfilter: {exc}") from None
+      self.rollen = {**KATEGORIE_ROLLEN, **(rollen or {})}
+      for kategorie, rolle in self.rollen.items():
+         if rolle not in (ROLLE_FEIERTAG, ROLLE_FERIEN, ROLLE_NORMAL):
+            raise ValueError(f"unbekannte Rolle '{rolle}' für die Kategorie '{kategorie}'")
+      self.aktiv = bool(self.kategorien or self.ohne_kategorien or self.muster)
+      self._rollen_je_kombination = {}
+
+   # --- Filter aus den Profilschlüsseln (INI: durch Kommas getrennte Listen, 'Kategorie=Rolle'; JSON: Listen/dict)
+   @classmethod
+   def aus_profil(cls, profil: dict) -> TerminFilter:
+      def liste(wert):
+         if not wert:
+            return []
+         return [teil.strip() for teil in (wert.split(",") if isinstance(wert, str) else wert) if teil.strip()]
+      rollen = profil.get('rollen') or {}
+      if not isinstance(rollen, dict):
+         rollen = dict(eintrag.partition("=")[::2] for eintrag in liste(rollen))
+      return cls(liste(profil.get('kategorien')), liste(profil.get('ohne_kategorien')), profil.get('summary'),
+                 profil.get('ohne_summary'), profil.get('ort'), profil.get('ohne_ort'),
+                 {kategorie.strip(): rolle.strip().lower() for kategorie, rolle in rollen.items()})
+
+   def passt(self, kategorien, summary: str, ort: str | None) -> bool:
+      if self.kategorien and self.kategorien.isdisjoint(kategorien):
+         return False
+      if self.ohne_kategorien and not self.ohne_kategorien.isdisjoint(kategorien):
+         return False
+      for feld, muster, soll in self.muster:
+         if (muster.search((summary, ort)[feld] or "") is not None) != soll:
+            return False
+      return True
+
+   # --- Rollen eines Termins ('feiertag', 'ferien'; leer: normaler Termin), je Kombination von Kategorien einmal
+   def rollen_von(self, kategorien: tuple[str, ...]) -> frozenset:
+      rollen = self._rollen_je_kombination.get(kategorien)
+      if rollen is None:
+         rollen = frozenset(self.rollen[k] for k in kategorien if self.rollen.get(k, ROLLE_NORMAL) != ROLLE_NORMAL)
+         self._rollen_je_kombination[kategorien] = rollen
+      return rollen
+
+STANDARD_FILTER = TerminFilter()
+
+# --- Rückfalloption: kompletter icalendar-Objektbaum (langsam und speicherhungrig bei großen Feeds) -------------
+def iter_vevents_icalendar(body: bytes, auswahl: TerminFilter | None = None):
+   from icalendar import Calendar
+   cal = Calendar.from_ical(body)
+   for element in cal.walk():
+      if element.name == "VEVENT":
+         dtstart = element.get('DTSTART').dt
+         dtend   = element.get("DTEND")
+         dtend   = dtend.dt if dtend else None
+         categories = element.get('CATEGORIES')
+         if categories:
+            categories_str = categories.to_ical().decode()
+            category_list  = [cat.strip() for cat in categories_str.split(',')]
+         else:
+            category_list  = []
+         ort = element.get("LOCATION")
+         ort = str(ort) if ort is not None else None
+         summary = str(element.get("SUMMARY") or "")   # wie im Streaming-Parser: str statt vText, "" ohne SUMMARY
+         if auswahl is not None and not auswahl.passt(category_list, summary, ort):
+            continue
+         uid = element.get("UID")
+         rrule = element.get("RRULE")
+         rdate, exdate = _ical_dt_listen(element.get("RDATE")), _ical_dt_listen(element.get("EXDATE"))
+         wiederholung = None
+         if rrule or rdate:
+            wiederholung = {'dtstart': dtstart, 'dtend': dtend, 'rrule': rrule.to_ical().decode() if rrule else None,
+                            'rdate': rdate, 'exdate': exdate}
+         rid = element.get("RECURRENCE-ID")
+         yield make_event(dtstart, dtend, summary, category_list, str(uid) if uid else None,
+                          wiederholung, rid.dt if rid else None, ort)
+
+def _ical_dt_listen(eigenschaft) -> list:
+   # --- RDATE/EXDATE aus icalendar: eine oder mehrere Zeilen mit jeweils einer Liste von Zeitpunkten
+   if eigenschaft is None:
+      return []
+   zeilen = eigenschaft if isinstance(eigenschaft, list) else [eigenschaft]
+   return [wert.dt[0] if isinstance(wert.dt, tuple) else wert.dt for zeile in zeilen for wert in zeile.dts]
+
+# --- Streaming-Parser ---------------------------------------------------------------------------------------------
+#     liest den Feed Zeile für Zeile, setzt gefaltete Zeilen zusammen und merkt sich nur die benötigten
+#     Eigenschaften. Termine außerhalb des Zeitraums werden anhand der Datumsziffern verworfen, bevor irgendein
+#     Objekt erzeugt wird; der Speicherbedarf hängt damit nicht von der Anzahl der Termine im Feed ab.
+VEVENT_PROPS = (b"DTSTART", b"DTEND", b"SUMMARY", b"CATEGORIES", b"UID", b"RRULE", b"RDATE", b"EXDATE", b"RECURRENCE-ID",
+                b"LOCATION")
+
+def iter_vevents(zeilen, start_date=None, end_date=None, auswahl: TerminFilter | None = None):
+   # --- Grenzen als 'JJJJMMTT'-Bytes, mit einem Tag Puffer für Zeitzonenverschiebungen
+   von = (start_date - timedelta(days=1)).strftime("%Y%m%d").encode() if start_date else None
+   bis = (end_date   + timedelta(days=1)).strftime("%Y%m%d").encode() if end_date   else None
+   props = None   # Eigenschaften des aktuellen VEVENT, None außerhalb eines VEVENT
+   tiefe = 0      # Verschachtelung innerhalb des VEVENT (z.B. VALARM), deren Eigenschaften werden übergangen
+   name  = None   # Eigenschaft, zu der gefaltete Folgezeilen gehören (None = wird nicht benötigt)
+   for zeile in zeilen:
+      if zeile.startswith((b" ", b"\t")):       # gefaltete Folgezeile
+         if name is not None:
+            props[name][-1] += zeile[1:].rstrip(b"\r\n")
+         continue
+      zeile = zeile.rstrip(b"\r\n")
+      name  = None
+      if props is None:
+         if zeile == b"BEGIN:VEVENT":
+            props = {}
+            tiefe = 0
+         continue
+      if zeile.startswith(b"BEGIN:"):
+         tiefe += 1
+      elif zeile.startswith(b"END:"):
+         if tiefe:
+            tiefe -= 1
+            continue
+         termin = _vevent_record(props, von, bis, auswahl)
+         props  = None
+         if termin is not None:
+            yield termin
+      elif not tiefe:
+         for prop in VEVENT_PROPS:
+            if zeile.startswith(prop) and zeile[len(prop):len(prop)+1] in (b":", b";"):
+               props.setdefault(prop, []).append(zeile)
+               name = prop
+               break
+
+def _vevent_record(props, von, bis, auswahl=None):
+   if b"DTSTART" not in props:
+      return None
+   s_params, s_wert = _split_prop(props[b"DTSTART"][0])
+   e_params, e_wert = _split_prop(props[b"DTEND"][0]) if b"DTEND" in props else (None, None)
+   # --- Vorfilter auf den Datumsziffern, noch bevor ein datetime-Objekt entsteht; Serientermine und ihre
+   #     geänderten Einzeltermine können auch mit einem DTSTART außerhalb des Zeitraums hineinfallen
+   serie = b"RRULE" in props or b"RDATE" in props or b"RECURRENCE-ID" in props
+   if bis and not serie and s_wert[:8].encode() > bis:
+      return None
+   if von and not serie and (e_wert or s_wert)[:8].encode() < von:
+      return None
+   summary = _ical_text(_split_prop(props[b"SUMMARY"][0])[1]) if b"SUMMARY" in props else ""
+   category_list = []
+   for zeile in props.get(b"CATEGORIES", ()):
+      category_list += [_ical_text(cat).strip() for cat in re.split(r"(?<!\\),", _split_prop(zeile)[1])]
+   ort = _ical_text(_split_prop(props[b"LOCATION"][0])[1]) if b"LOCATION" in props else None
+   # --- Terminfilter vor dem Umwandeln der Zeitpunkte
+   if auswahl is not None and not auswahl.passt(category_list, summary, ort):
+      return None
+   dtstart = _ical_dt(s_wert, s_params)
+   dtend   = _ical_dt(e_wert, e_params) if e_wert else None
+   uid = _split_prop(props[b"UID"][0])[1] if b"UID" in props else None
+   wiederholung = recurrence_id = None
+   if serie:
+      if b"RRULE" in props or b"RDATE" in props:
+         wiederholung = {'dtstart': dtstart, 'dtend': dtend,
+                         'rrule':   _split_prop(props[b"RRULE"][0])[1] if b"RRULE" in props else None,
+                         'rdate':   [wert for zeile in props.get(b"RDATE", ()) for wert in _ical_dt_werte(zeile)],
+                         'exdate':  [wert for zeile in props.get(b"EXDATE", ()) for wert in _ical_dt_werte(zeile)]}
+      if b"RECURRENCE-ID" in props:
+         rid_params, rid_wert = _split_prop(props[b"RECURRENCE-ID"][0])
+         recurrence_id = _ical_dt(rid_wert, rid_params)
+   return make_event(dtstart, dtend, summary, category_list, uid, wiederholung, recurrence_id, ort)
+
+def _ical_dt_werte(zeile: bytes) -> list:
+   # --- RDATE/EXDATE: durch Kommas getrennte Zeitpunkte, bei PERIOD-Werten ('Beginn/Ende') zählt der Beginn
+   params, wert = _split_prop(zeile)
+   return [_ical_dt(teil.split("/")[0], params) for teil in wert.split(",") if teil.strip()]
+
+def _split_prop(zeile: bytes) -> tuple[dict, str]:
+   # --- 'NAME;PARAM=WERT;...:WERT' zerlegen; Parameterwerte in Anführungszeichen dürfen ':' und ';' enthalten
+   if b'"' in zeile:
+      in_quotes = False
+      for pos, zeichen in enumerate(zeile):
+         if zeichen == 34:                     # '"'
+            in_quotes = not in_quotes
+         elif zeichen == 58 and not in_quotes: # ':'
+            break
+      kopf, wert = zeile[:pos], zeile[pos+1:]
+      teile = re.findall(rb'[^;"]*(?:"[^"]*"[^;"]*)*', kopf)
+   else:
+      kopf, _, wert = zeile.partition(b":")
+      teile = kopf.split(b";")
+   params = {}
+   for teil in teile[1:]:
+      key, _, val = teil.partition(b"=")
+      if key:
+         params[key.decode().upper()] = val.strip(b'"').decode("utf-8", "replace")
+   return params, wert.decode("utf-8", "replace")
+
+def _ical_dt(wert: str, params: dict):
+   wert = wert.strip()
+   if params.get("VALUE") == "DATE" or len(wert) == 8:
+      return date(int(wert[0:4]), int(wert[4:6]), int(wert[6:8]))
+   zeitpunkt = datetime(int(wert[0:4]), int(wert[4:6]), int(wert[6:8]), int(wert[9:11]), int(wert[11:13]), int(wert[13:15]))
+   if wert.endswith("Z"):
+      return zeitpunkt.replace(tzinfo=dt.timezone.utc)
+   if "TZID" in params:
+      zone = _zeitzone(params["TZID"])
+      if zone is not None:
+         return zeitpunkt.replace(tzinfo=zone)
+   return zeitpunkt
+
+@functools.lru_cache(maxsize=None)
+def _zeitzone(tzid: str):
+   try:
+      return zoneinfo.ZoneInfo(tzid)
+   except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+      return None
+
+def _ical_text(wert: str) -> str:
+   if "\\" not in wert:
+      return wert
+   return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) in "nN" else m.group(1), wert)
+
+# --- Serientermine (RRULE/RDATE/EXDATE) nur innerhalb des Zeitraums ausrollen -------------------------------------
+#     Die Regel wird in der Ortszeit von DTSTART ausgewertet (die Uhrzeit bleibt über die Sommerzeit-Umstellung
+#     gleich) und nur bis zum Ende des Zeitraums durchlaufen; auch eine Regel ohne COUNT/UNTIL liefert damit nie mehr
+#     Termine, als in den Zeitraum passen. Geänderte Einzeltermine (RECURRENCE-ID) ersetzen den Termin der Serie.
+RRULE_MAX_TERMINE = 5000   # Obergrenze je Serie und Zeitraum (z.B. FREQ=MINUTELY)
+
+def expand_recurrences(termine, win_von: date, win_bis: date):
+   termine = list(termine)
+   ersetzt = defaultdict(list)   # UID -> ursprünglicher Beginn der geänderten Einzeltermine
+   for ev_data in termine:
+      if ev_data.recurrence_id is not None and ev_data.uid:
+         ersetzt[ev_data.uid].append(ev_data.recurrence_id)
+   for ev_data in termine:
+      if ev_data.wiederholung is None:
+         yield ev_data
+      else:
+         yield from _serie_termine(ev_data, win_von, win_bis, ersetzt.get(ev_data.uid, ()))
+
+def _serie_termine(ev_data, win_von: date, win_bis: date, ersetzt):
+   regel   = ev_data.wiederholung
+   dtstart = regel['dtstart']
+   zone    = dtstart.tzinfo if isinstance(dtstart, datetime) else None
+   dauer   = ev_data.ev_end - ev_data.ev_start if regel['dtend'] else None
+   beginne = _serie_beginne(ev_data.uid, win_von, win_bis, _ortszeit(dtstart, zone), regel['rrule'],
+                            tuple(_ortszeit(zp, zone) for zp in regel['rdate']),
+                            frozenset(_ortszeit(zp, zone) for zp in itertools.chain(regel['exdate'], ersetzt)),
+                            ev_data.ev_end - ev_data.ev_start)
+   for beginn in beginne:
+      if zone is not None:
+         beginn = beginn.replace(tzinfo=zone)
+      elif not isinstance(dtstart, datetime):
+         beginn = beginn.date()
+      yield make_event(beginn, beginn + dauer if dauer is not None else None, ev_data.summary, ev_data.kategorien,
+                       ev_data.uid, recurrence_id=beginn, ort=ev_data.ort)
+
+def _ortszeit(zeitpunkt, zone) -> datetime:
+   # --- Zeitpunkt als naive Ortszeit in der Zeitzone des Serienbeginns (ganztägig: Mitternacht)
+   if not isinstance(zeitpunkt, datetime):
+      return datetime.combine(zeitpunkt, datetime.min.time())
+   if zeitpunkt.tzinfo is not None:
+      return zeitpunkt.astimezone(zone).replace(tzinfo=None) if zone is not None else naive_zeit(zeitpunkt)
+   return zeitpunkt
+
+# --- ausgerollte Serien je (UID, Zeitraum) merken; Regel und Ausnahmen gehören zum Schlüssel, damit eine geänderte
+#     Serie neu ausgerollt wird
+@functools.lru_cache(maxsize=1024)
+def _serie_beginne(uid, win_von: date, win_bis: date, dtstart: datetime, rrule: str | None,
+                   rdate: tuple, exdate: frozenset, dauer: timedelta) -> tuple[datetime, ...]:
+   from dateutil.rrule import rruleset, rrulestr
+   regeln = rruleset()
+   regeln.rdate(dtstart)                      # DTSTART ist immer der erste Termin der Serie
+   for zeitpunkt in rdate:
+      regeln.rdate(zeitpunkt)
+   if rrule:
+      try:
+         regeln.rrule(rrulestr(rrule, dtstart=dtstart, ignoretz=True))
+      except (ValueError, TypeError) as exc:
+         log.warning("Serientermin %s: RRULE '%s' nicht lesbar (%s), nur der erste Termin wird übernommen", uid, rrule, exc)
+   # --- Termine, die vor dem Zeitraum beginnen, aber noch hineinreichen, gehören dazu
+   von = datetime.combine(win_von, datetime.min.time()) - max(dauer, timedelta(0))
+   bis = datetime.combine(win_bis, datetime.min.time())
+   beginne = []
+   for beginn in regeln:                       # rruleset erzeugt die Termine erst beim Durchlaufen
+      if beginn >= bis:
+         break
+      if beginn < von or beginn in exdate:
+         continue
+      beginne.append(beginn)
+      if len(beginne) >= RRULE_MAX_TERMINE:
+         log.warning("Serientermin %s: nach %d Terminen abgebrochen", uid, RRULE_MAX_TERMINE)
+         break
+   return tuple(beginne)
+
+# --- belegte Tage eines Termins als halboffenes Intervall [erster Tag, Tag nach dem letzten Tag) -----------------
+#     (ein Tag zählt, wenn der Termin vor dem Ende noch in ihn hineinreicht, gemessen ab der Anfangszeit)
+def event_tage(evstart: datetime, evend: datetime) -> tuple[date, date]:
+   von = evstart.date()
+   if evend <= evstart:
+      return von, von
+   return von, von + timedelta(days=-((evstart - evend) // timedelta(days=1)))
+
+def naive_zeit(zeitpunkt: datetime) -> datetime:
+   # --- Termine aus mehreren Feeds mischen Zeitangaben mit und ohne Zeitzone; zum Vergleichen in Ortszeit umrechnen
+   if zeitpunkt.tzinfo is None:
+      return zeitpunkt
+   return zeitpunkt.astimezone().replace(tzinfo=None)
+
+TAG_FEIERTAG, TAG_FERIEN, TAG_SAMSTAG, TAG_SONNTAG = 1, 2, 4, 8   # Bits in JCal.tagesflags
+
+def ist_fussnotentermin(ev_data, auswahl: TerminFilter = STANDARD_FILTER) -> bool:
+   # --- mehrtägiger Termin, aber kein Feiertag oder Ferientermin
+   return ev_data.ev_typ == "1-mehrtaegig" and not auswahl.rollen_von(ev_data.kategorien)
+
+# --- Eintrag in der Legende eines Monats: verweist auf den Termin, statt ihn zu kopieren
+class Fussnote(NamedTuple):
+   termin: Termin
+   text:   str     # Summary des Termins bzw. Tagestext mit Uhrzeit bei überzähligen Tagesterminen
+
+# ################################################################################################################
+# ### Feiertage und Schulferien ohne Feed ########################################################################
+# ################################################################################################################
+#     Gesetzliche Feiertage werden je Bundesland aus Ostern und festen Daten berechnet (Regeln ab 1995, dem Jahr, in
+#     dem der Buß- und Bettag außer in Sachsen entfiel); Feiertage einzelner Gemeinden (z.B. Fronleichnam in Teilen
+#     Sachsens und Thüringens, Mariä Himmelfahrt in Bayern, Friedensfest in Augsburg) fehlen. Schulferien kommen aus
+#     einer Tabelle (siehe ferien()), da sie jedes Jahr neu festgelegt werden. Beides wird je (Jahr, Land) einmal
+#     berechnet und in parseEvents wie Feiertags- bzw. Ferientermine eines Feeds übernommen.
+BUNDESLAENDER = {'BW': 'Baden-Württemberg', 'BY': 'Bayern', 'BE': 'Berlin', 'BB': 'Brandenburg', 'HB': 'Bremen',
+                 'HH': 'Hamburg', 'HE': 'Hessen', 'MV': 'Mecklenburg-Vorpommern', 'NI': 'Niedersachsen',
+                 'NW': 'Nordrhein-Westfalen', 'RP': 'Rheinland-Pfalz', 'SL': 'Saarland', 'SN': 'Sachsen',
+                 'ST': 'Sachsen-Anhalt', 'SH': 'Schleswig-Holstein', 'TH': 'Thüringen'}
+FERIEN_TABELLE = Path(__file__).with_name("ferien.csv")   # mitgelieferte Ferientabelle, falls vorhanden
+
+def bundesland(kuerzel) -> str | None:
+   if not kuerzel:
+      return None
+   land = str(kuerzel).strip().upper()
+   if land not in BUNDESLAENDER:
+      raise ValueError(f"unbekanntes Bundesland '{kuerzel}', erwartet eines von {', '.join(BUNDESLAENDER)}")
+   return land
+
+@functools.lru_cache(maxsize=64)
+def ostersonntag(jahr: int) -> date:
+   # --- Gaußsche Osterformel für den gregorianischen Kalender (Form nach Meeus/Jones/Butcher)
+   a = jahr % 19
+   b, c = divmod(jahr, 100)
+   d, e = divmod(b, 4)
+   f = (b + 8) // 25
+   g = (b - f + 1) // 3
+   h = (19*a + b - d - g + 15) % 30
+   i, k = divmod(c, 4)
+   l = (32 + 2*e + 2*i - h - k) % 7
+   m = (a + 11*h + 22*l) // 451
+   monat, tag = divmod(h + l - 7*m + 114, 31)
+   return date(jahr, monat, tag + 1)
+
+@functools.lru_cache(maxsize=256)
+def feiertage(jahr: int, land: str) -> tuple[tuple[date, str], ...]:
+   ostern = ostersonntag(jahr)
+   tage = [(date(jahr, 1, 1),   "Neujahr"),
+           (ostern - timedelta(days=2),  "Karfreitag"),
+           (ostern + timedelta(days=1),  "Ostermontag"),
+           (date(jahr, 5, 1),   "Tag der Arbeit"),
+           (ostern + timedelta(days=39), "Christi Himmelfahrt"),
+           (ostern + timedelta(days=50), "Pfingstmontag"),
+           (date(jahr, 12, 25), "1. Weihnachtstag"),
+           (date(jahr, 12, 26), "2. Weihnachtstag")]
+   if jahr >= 1990:
+      tage.append((date(jahr, 10, 3), "Tag der Deutschen Einheit"))
+   if land in ('BW', 'BY', 'ST'):
+      tage.append((date(jahr, 1, 6), "Heilige Drei Könige"))
+   if (land == 'BE' and jahr >= 2019) or (land == 'MV' and jahr >= 2023):
+      tage.append((date(jahr, 3, 8), "Internationaler Frauentag"))
+   if land == 'BE' and jahr in (2020, 2025):
+      tage.append((date(jahr, 5, 8), "Tag der Befreiung"))
+   if land == 'BB':
+      tage += [(ostern, "Ostersonntag"), (ostern + timedelta(days=49), "Pfingstsonntag")]
+   if land in ('BW', 'BY', 'HE', 'NW', 'RP', 'SL'):
+      tage.append((ostern + timedelta(days=60), "Fronleichnam"))
+   if land == 'SL':
+      tage.append((date(jahr, 8, 15), "Mariä Himmelfahrt"))
+   if land == 'TH' and jahr >= 2019:
+      tage.append((date(jahr, 9, 20), "Weltkindertag"))
+   if (land in ('BB', 'MV', 'SN', 'ST', 'TH') or jahr == 2017
+         or (land in ('HB', 'HH', 'NI', 'SH') and jahr >= 2018)):
+      tage.append((date(jahr, 10, 31), "Reformationstag"))
+   if land in ('BW', 'BY', 'NW', 'RP', 'SL'):
+      tage.append((date(jahr, 11, 1), "Allerheiligen"))
+   if land == 'SN' or jahr < 1995:
+      bettag = date(jahr, 11, 22)
+      tage.append((bettag - timedelta(days=(bettag.weekday() - 2) % 7), "Buß- und Bettag"))
+   return tuple(sorted(tage))
+
+# --- Schulferien eines Landes, die das Jahr berühren, als (erster Tag, Tag nach dem letzten Tag, Name) -------------
+#     Tabelle: UTF-8-Textdatei, je Zeile 'Land;Name;erster Tag;letzter Tag' mit Datumsangaben JJJJ-MM-TT (so wie die
+#     Kultusministerkonferenz sie veröffentlicht), Leerzeilen und Zeilen mit '#' werden übergangen, z.B.
+#        BY;Herbstferien;2025-11-03;2025-11-07
+#     Eine geänderte Datei wird neu gelesen (ihr Änderungszeitpunkt gehört zum Schlüssel des Zwischenspeichers).
+def ferien(pfad, jahr: int, land: str) -> tuple[tuple[date, date, str], ...]:
+   pfad = Path(pfad)
+   return _ferien_im_jahr(str(pfad), pfad.stat().st_mtime_ns, jahr, land)
+
+@functools.lru_cache(maxsize=256)
+def _ferien_im_jahr(pfad: str, stand: int, jahr: int, land: str) -> tuple[tuple[date, date, str], ...]:
+   von, bis = date(jahr, 1, 1), date(jahr + 1, 1, 1)
+   return tuple(eintrag for eintrag in _ferien_tabelle(pfad, stand).get(land, ()) if eintrag[0] < bis and eintrag[1] > von)
+
+@functools.lru_cache(maxsize=8)
+def _ferien_tabelle(pfad: str, stand: int) -> dict[str, tuple]:
+   tabelle = defaultdict(list)
+   with open(pfad, encoding="utf-8") as datei:
+      for nr, zeile in enumerate(datei, start=1):
+         zeile = zeile.strip()
+         if not zeile or zeile.startswith("#"):
+            continue
+         try:
+            land, name, erster, letzter = (teil.strip() for teil in zeile.split(";"))
+            eintrag = (date.fromisoformat(erster), date.fromisoformat(letzter) + timedelta(days=1), name)
+         except ValueError:
+            raise ValueError(f"{pfad}, Zeile {nr}: erwartet 'Land;Name;erster Tag;letzter Tag' (JJJJ-MM-TT)") from None
+         tabelle[land.upper()].append(eintrag)
+   return {land: tuple(sorted(eintraege)) for land, eintraege in tabelle.items()}
+
+# ################################################################################################################
+# ### Intervall-Index: sortierte Arrays über halboffene Intervalle [von, bis) ####################################
+# ################################################################################################################
+class IntervalIndex:
+   def __init__(self):
+      self._eintraege = []     # (von, bis, lfd. Nr., Wert), nach dem Aufbau sortiert nach von
+      self._aktuell   = False
+
+   def add(self, von, bis, wert=None):
+      if bis <= von:
+         return
+      self._eintraege.append((von, bis, len(self._eintraege), wert))
+      self._aktuell = False
+
+   def __len__(self):
+      return len(self._eintraege)
+
+   def _aufbauen(self):
+      self._eintraege.sort(key=lambda e: (e[0], e[2]))
+      self._starts = [e[0] for e in self._eintraege]
+      # --- größtes Ende bis zur jeweiligen Position: damit bricht die Suche nach überlappenden Intervallen früh ab
+      self._max_bis = list(itertools.accumulate((e[1] for e in self._eintraege), max))
+      # --- Vereinigung aller Intervalle als disjunkte, sortierte Liste für Punktabfragen (covers)
+      self._u_von, self._u_bis = [], []
+      for von, bis, _, _ in self._eintraege:
+         if self._u_bis and von <= self._u_bis[-1]:
+            self._u_bis[-1] = max(self._u_bis[-1], bis)
+         else:
+            self._u_von.append(von)
+            self._u_bis.append(bis)
+      self._aktuell = True
+
+   # --- alle Intervalle, die [von, bis) überlappen, in der Reihenfolge des Einfügens -----------------------------
+   def overlapping(self, von, bis) -> list[tuple]:
+      if not self._aktuell: self._aufbauen()
+      treffer = []
+      pos = bisect.bisect_left(self._starts, bis) - 1
+      while pos >= 0 and self._max_bis[pos] > von:
+         eintrag = self._eintraege[pos]
+         if eintrag[1] > von:
+            treffer.append(eintrag)
+         pos -= 1
+      treffer.sort(key=lambda e: e[2])
+      return [(e[0], e[1], e[3]) for e in treffer]
+
+   # --- Intervalle, die vor dem Tag enden, entfernen (bereits ausgegebene Seiten) --------------------------------
+   def discard_before(self, tag):
+      self._eintraege = [eintrag for eintrag in self._eintraege if eintrag[1] > tag]
+      self._aktuell   = False
+
+   # --- liegt der Punkt in mindestens einem Intervall? -----------------------------------------------------------
+   def covers(self, punkt) -> bool:
+      if not self._aktuell: self._aufbauen()
+      pos = bisect.bisect_right(self._u_von, punkt) - 1
+      return pos >= 0 and punkt < self._u_bis[pos]
+
+   # --- die Teile von [von, bis), die kein Intervall überdeckt ---------------------------------------------------
+   def luecken(self, von, bis) -> list[tuple]:
+      if not self._aktuell: self._aufbauen()
+      luecken = []
+      pos = max(bisect.bisect_right(self._u_von, von) - 1, 0)
+      for u_von, u_bis in zip(self._u_von[pos:], self._u_bis[pos:]):
+         if u_von >= bis:
+            break
+         if u_von > von:
+            luecken.append((von, u_von))
+         von = max(von, u_bis)
+      if von < bis:
+         luecken.append((von, bis))
+      return luecken
+
+# ################################################################################################################
+# ### Terminspeicher: normalisierte Termine aller Feeds in SQLite, abfragbar nach Zeitraum und Feed ##############
+# ################################################################################################################
+#     Ein Feed wird nur dann (vollständig, mit allen vergangenen Jahren) eingelesen, wenn sich sein Inhalt geändert
+#     hat; jeder beliebige Zeitraum wird danach per Bereichsabfrage gelesen. Serientermine werden mit ihrer Regel
+#     gespeichert und erst für den abgefragten Zeitraum ausgerollt.
+STORE_VERSION = 2
+
+class EventStore:
+   def __init__(self, path=STORE_PATH):
+      import sqlite3
+      self.path = Path(path)
+      self.path.parent.mkdir(parents=True, exist_ok=True)
+      self._lock = threading.Lock()   # eine Verbindung für alle Threads (Feeds werden parallel geladen)
+      self.db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+      self.db.execute("PRAGMA journal_mode=WAL")  # mehrere Prozesse (Stapelbetrieb) lesen, während einer schreibt
+      if self.db.execute("PRAGMA user_version").fetchone()[0] != STORE_VERSION:
+         with self.db:
+            self.db.executescript(f"""
+               DROP TABLE IF EXISTS feeds;
+               DROP TABLE IF EXISTS termine;
+               CREATE TABLE feeds (url TEXT PRIMARY KEY, sha1 TEXT, eingelesen REAL, anzahl INTEGER, max_tage INTEGER);
+               CREATE TABLE termine (
+                  nr            INTEGER PRIMARY KEY,  -- Reihenfolge im Feed
+                  feed          TEXT NOT NULL,
+                  serie         INTEGER NOT NULL,     -- 1: Serie (RRULE/RDATE) oder geänderter Einzeltermin
+                  tag_von       INTEGER NOT NULL,     -- erster belegter Tag (date.toordinal)
+                  tag_bis       INTEGER NOT NULL,     -- Tag nach dem letzten belegten Tag
+                  ev_start      TEXT NOT NULL,
+                  ev_end        TEXT NOT NULL,
+                  typ           TEXT NOT NULL,
+                  summary       TEXT,
+                  kategorien    TEXT,                 -- JSON-Liste
+                  uid           TEXT,
+                  recurrence_id TEXT,
+                  regel         TEXT,                 -- JSON: dtstart, dtend, rrule, rdate, exdate
+                  ort           TEXT
+               );
+               CREATE INDEX termine_zeitraum ON termine (feed, serie, tag_von);
+               PRAGMA user_version = {STORE_VERSION};""")
+
+   def close(self):
+      self.db.close()
+
+   def has_feed(self, url: str) -> bool:
+      with self._lock:
+         return self.db.execute("SELECT 1 FROM feeds WHERE url = ?", (url,)).fetchone() is not None
+
+   # --- Feed übernehmen, falls sich der Inhalt geändert hat (parse(body) liefert die Termine des ganzen Feeds)
+   def sync(self, url: str, body: bytes | LokalerFeed, parse) -> bool:
+      sha1 = body.version() if isinstance(body, LokalerFeed) else hashlib.sha1(body).hexdigest()
+      with self._lock:
+         zeile = self.db.execute("SELECT sha1 FROM feeds WHERE url = ?", (url,)).fetchone()
+      if zeile and zeile[0] == sha1:
+         return False
+      zeilen = [self._zeile(url, ev_data) for ev_data in parse(body)]
+      max_tage = max((bis - von for serie, von, bis, *_ in zeilen if not serie), default=0)
+      with self._lock, self.db:
+         self.db.execute("DELETE FROM termine WHERE feed = ?", (url,))
+         self.db.executemany("INSERT INTO termine (feed, serie, tag_von, tag_bis, ev_start, ev_end, typ, summary, kategorien, "
+                             "uid, recurrence_id, regel, ort) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                             [(url, *z) for z in zeilen])
+         self.db.execute("INSERT OR REPLACE INTO feeds VALUES (?, ?, ?, ?, ?)", (url, sha1, time.time(), len(zeilen), max_tage))
+      return True
+
+   def _zeile(self, url, ev_data) -> tuple:
+      von, bis = event_tage(ev_data.ev_start, ev_data.ev_end)
+      regel    = ev_data.wiederholung
+      rid      = ev_data.recurrence_id
+      serie    = regel is not None or rid is not None
+      if regel is not None:                          # Serie: ab dem ersten Termin ohne Ende (Regel entscheidet)
+         bis = date.max
+         regel = json.dumps({'dtstart': _zeit_text(regel['dtstart']),
+                             'dtend':   _zeit_text(regel['dtend']),
+                             'rrule':   regel['rrule'],
+                             'rdate':   [_zeit_text(zp) for zp in regel['rdate']],
+                             'exdate':  [_zeit_text(zp) for zp in regel['exdate']]})
+      if rid is not None:                            # geänderter Einzeltermin: auch am ursprünglichen Tag finden
+         rid_tag = rid.date() if isinstance(rid, datetime) else rid
+         von, bis = min(von, rid_tag), max(bis, rid_tag + timedelta(days=1))
+      return (int(serie), von.toordinal(), bis.toordinal(), _zeit_text(ev_data.ev_start), _zeit_text(ev_data.ev_end),
+              ev_data.ev_typ,
+              ev_data.summary, json.dumps(ev_data.kategorien, ensure_ascii=False), ev_data.uid,
+              _zeit_text(rid), regel, ev_data.ort)
+
+   # --- Termine eines Feeds, die den Zeitraum [von, bis) berühren, in der Reihenfolge des Feeds
+   def query(self, url: str, von: date, bis: date) -> list[Termin]:
+      with self._lock:
+         max_tage = self.db.execute("SELECT max_tage FROM feeds WHERE url = ?", (url,)).fetchone()
+         if max_tage is None:
+            return []
+         zeilen = self.db.execute(
+            "SELECT nr, ev_start, ev_end, typ, summary, kategorien, uid, recurrence_id, regel, ort FROM termine "
+            "WHERE feed = ? AND serie = 0 AND tag_von >= ? AND tag_von < ? AND tag_bis > ? "
+            "UNION ALL SELECT nr, ev_start, ev_end, typ, summary, kategorien, uid, recurrence_id, regel, ort FROM termine "
+            "WHERE feed = ? AND serie = 1 AND tag_von < ? AND tag_bis > ? ORDER BY nr",
+            (url, von.toordinal() - max_tage[0], bis.toordinal(), von.toordinal(),
+             url, bis.toordinal(), von.toordinal())).fetchall()
+      termine = []
+      for _, ev_start, ev_end, typ, summary, kategorien, uid, rid, regel, ort in zeilen:
+         if regel is not None:
+            regel = json.loads(regel)
+            regel = {'dtstart': _zeit_aus_text(regel['dtstart']), 'dtend': _zeit_aus_text(regel['dtend']),
+                     'rrule':   regel['rrule'],
+                     'rdate':   [_zeit_aus_text(zp) for zp in regel['rdate']],
+                     'exdate':  [_zeit_aus_text(zp) for zp in regel['exdate']]}
+         # --- wie make_event(), aber mit der gespeicherten Terminart
+         termine.append(Termin(kategorien_tupel(*json.loads(kategorien)), _zeit_aus_text(ev_start), _zeit_aus_text(ev_end),
+                               summary, typ, uid, regel, _zeit_aus_text(rid), ort))
+      return termine
+
+# --- Zeitpunkte als Text: Datum, naive Zeit oder Ortszeit mit Zeitzonenname ('2024-09-02T08:00:00|Europe/Berlin'),
+#     damit Serien nach dem Laden wieder über die Sommerzeit-Umstellung hinweg richtig ausgerollt werden
+def _zeit_text(zeitpunkt) -> str | None:
+   if zeitpunkt is None or not isinstance(zeitpunkt, datetime) or zeitpunkt.tzinfo is None:
+      return zeitpunkt.isoformat() if zeitpunkt is not None else None
+   if zeitpunkt.tzinfo is dt.timezone.utc:
+      return f"{zeitpunkt.replace(tzinfo=None).isoformat()}|UTC"
+   if getattr(zeitpunkt.tzinfo, "key", None):
+      return f"{zeitpunkt.replace(tzinfo=None).isoformat()}|{zeitpunkt.tzinfo.key}"
+   return zeitpunkt.isoformat()                        # sonst feste Abweichung von UTC
+
+def _zeit_aus_text(text: str | None):
+   if text is None:
+      return None
+   wert, _, zone = text.partition("|")
+   if len(wert) == 10:
+      return date.fromisoformat(wert)
+   zeitpunkt = datetime.fromisoformat(wert)
+   if zone:
+      zeitpunkt = zeitpunkt.replace(tzinfo=dt.timezone.utc if zone == "UTC" else _zeitzone(zone))
+   return zeitpunkt
+
+# ################################################################################################################
+# ### Schriften: einmal pro Prozess laden und registrieren #######################################################
+# ################################################################################################################
+FONT_FACES = {  # Name in der PDF: (Datei in FONT_DIR, eingebauter Ersatz, falls die Datei fehlt)
+   'Calibri':             ("calibri.ttf",   "Helvetica"),
+   'Calibri-Kursiv':      ("calibrii.ttf",  "Helvetica-Oblique"),
+   'Calibri-Fett':        ("calibrib.ttf",  "Helvetica-Bold"),
+   'Calibri-Fett-kursiv': ("calibriz.ttf",  "Helvetica-BoldOblique"),
+   'Calibri-Fein':        ("calibril.ttf",  "Helvetica"),
+   'Calibri-Fein-Kursiv': ("calibrili.ttf", "Helvetica-Oblique"),
+}
+_fonts      = {}   # Name -> tatsächlich verwendete Schrift (registrierter TrueType-Font oder eingebauter Ersatz)
+_fonts_lock = threading.Lock()
+
+# --- liest und registriert jede Schrift nur beim ersten Aufruf im Prozess; die geparsten Fonts liegen in der
+#     Registry von reportlab und werden bei fork() an Worker-Prozesse vererbt (siehe run_batch)
+def register_fonts() -> dict[str, str]:
+   with _fonts_lock:
+      if not _fonts:
+         from reportlab.pdfbase import pdfmetrics
+         from reportlab.pdfbase.ttfonts import TTFont, TTFError
+         for name, (datei, ersatz) in FONT_FACES.items():
+            try:
+               pdfmetrics.registerFont(TTFont(name, FONT_DIR / datei))
+               _fonts[name] = name
+            except (OSError, TTFError) as exc:
+               log.warning("Schrift '%s' nicht verfügbar (%s), verwende stattdessen '%s'", name, exc, ersatz)
+               _fonts[name] = ersatz
+      return dict(_fonts)
+
+# --- Farben der Tageszeilen (RGB 0..1) und Kurznamen der Wochentage (Montag = 0) -----------------------------------
+FARBE_MONAT    = (153/255, 204/255, 1)        # Kopfzeile mit dem Monatsnamen
+FARBE_FEIERTAG = (1, 224/255, 104/255)        # Sonn- und Feiertage
+FARBE_SAMSTAG  = (1, 235/255, 153/255)
+FARBE_FERIEN   = (218/255, 1, 163/255)
+FARBE_LEER     = (0.81, 0.81, 0.81)           # fehlende Tageszeilen bis zum 31.
+WOCHENEND_FARBEN = {5: FARBE_SAMSTAG, 6: FARBE_FEIERTAG}
+WOCHENTAGE_KURZ = ('Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So')
+TAGE_IM_FORM    = 28                          # so viele Tage hat jeder Monat, sie stehen im wiederverwendeten Raster
+MONATE_JE_SEITE = 6                           # eine Seite (A3 quer) zeigt ein Halbjahr
+MONATSNAMEN     = ('Januar', 'Februar', 'März', 'April', 'Mai', 'Juni', 'Juli', 'August', 'September', 'Oktober',
+                   'November', 'Dezember')
+
+def tagesfarbe(flags: int):
+   # --- Füllfarbe einer Tageszeile aus ihren Bits: Sonn- und Feiertage, Samstage, Ferientage, sonst keine (weiß)
+   if flags & (TAG_FEIERTAG | TAG_SONNTAG):
+      return FARBE_FEIERTAG
+   if flags & TAG_SAMSTAG:
+      return FARBE_SAMSTAG
+   if flags & TAG_FERIEN:
+      return FARBE_FERIEN
+   return None
+
+# --- Kalendergerüst eines Zeitraums: alle Tage über einen fortlaufenden Index (0 = erster Tag des Startmonats), ---
+#     dazu Wochentag, Kalenderwoche und Wochenend-Bits als Spalten sowie die Monate mit ihren Indexgrenzen
+class Monat(NamedTuple):
+   jahr:        int
+   monat:       int
+   name:        str    # Monatsüberschrift, z.B. "September 24"
+   erster:      int    # Index des 1. im Kalendergerüst
+   tage:        int
+   erster_wtag: int    # Wochentag des 1. (Montag = 0)
+   von:         date
+   bis:         date   # erster Tag des Folgemonats
+
+class KalenderSkelett:
+   __slots__ = ('von', 'bis', 'tage', 'wochentag', 'kw', 'flags', 'monate', '_monate')
+
+   def __init__(self, start_month: int, start_year: int, anzahl_monate: int):
+      monate, jahr, monat, erster = [], start_year, start_month, 0
+      for _ in range(anzahl_monate):
+         von = date(jahr, monat, 1)
+         tage = calendar.monthrange(jahr, monat)[1]
+         monate.append(Monat(jahr, monat, f"{MONATSNAMEN[monat-1]} {str(jahr)[2:4]}", erster, tage, von.weekday(),
+                             von, von + timedelta(days=tage)))
+         erster += tage
+         jahr, monat = (jahr + 1, 1) if monat == 12 else (jahr, monat + 1)
+      self.von, self.bis = monate[0].von, monate[-1].bis
+      self.tage      = tuple(self.von + timedelta(days=i) for i in range(erster))
+      self.wochentag = array('B', (tag.weekday() for tag in self.tage))
+      self.kw        = array('B', (tag.isocalendar().week for tag in self.tage))
+      self.flags     = bytes(TAG_SAMSTAG if wtag == 5 else TAG_SONNTAG if wtag == 6 else 0 for wtag in self.wochentag)
+      self.monate    = tuple(monate)
+      self._monate   = {(mo.jahr, mo.monat): mo for mo in monate}
+
+   def __len__(self):
+      return len(self.tage)
+
+   def index(self, tag: date) -> int:
+      return (tag - self.von).days
+
+   def monat(self, jahr: int, monat: int) -> Monat:
+      return self._monate[(jahr, monat)]
+
+# --- das Gerüst hängt nur vom Zeitraum ab und wird von allen Läufen (auch parallelen Jobs) geteilt, daher unveränderlich
+@functools.lru_cache(maxsize=32)
+def kalender_skelett(start_month: int, start_year: int, anzahl_monate: int = 12) -> KalenderSkelett:
+   return KalenderSkelett(start_month, start_year, anzahl_monate)
 
 # ################################################################################################################
 # ### Klasse zum Abrufen der Kalenderdaten und zur Erzeugung der PDF #############################################
 # ################################################################################################################
+class Abgebrochen(Exception):
+   # --- der Lauf wurde über JCal.abbruch (threading.Event) abgebrochen, z.B. aus der GUI
+   pass
+
 class JCal:
    ## Klasseninitialisierung
-   def __init__(self, header_prefix='Jahreskalender', fn='Jahreskalender.pdf', feedurl=''):
+   def __init__(self, header_prefix='Jahreskalender', fn='Jahreskalender.pdf', feedurl='', cache: FeedCache | None = None,
+                parser='stream', store: EventStore | None = None, termin_filter: TerminFilter | None = None,
+                land: str | None = None, ferien_tabelle=None):
       self.startM = 1
       self.startY = int(dt.date.today().year)
-
-      self.locale = {
-         'monate': {
-            'de': {
-               'January':   'Januar',
-               'February':  'Februar',
-               'March':     'März',
-               'April':     'April',
-               'May':       'Mai',
-               'June':      'Juni',
-               'July':      'Juli',
-               'August':    'August',
-               'September': 'September',
-               'October':   'Oktober',
-               'November':  'November',
-               'December':  'Dezember'
-            }
-         },
-         'wochentage': {
-            'de': {
-               'Monday':    'Montag',
-               'Tuesday':   'Dienstag',
-               'Wednesday': 'Mittwoch',
-               'Thursday':  'Donnerstag',
-               'Friday':    'Freitag',
-               'Saturday':  'Samstag',
-               'Sunday':    'Sonntag'
-            }
-         },
-         'wochentageK': {
-            'de': {
-               'Mon': 'Mo',
-               'Tue': 'Di',
-               'Wed': 'Mi',
-               'Thu': 'Do',
-               'Fri': 'Fr',
-               'Sat': 'Sa',
-               'Sun': 'So'
-            }
-         }
-      }
-      
-   
-   
-
+      self.cache  = cache if cache is not None else FeedCache()
+      self.parser = parser # 'stream' (Streaming-Parser) oder 'icalendar' (kompletter Objektbaum)
+      self.store  = store  # optionaler Terminspeicher: Feeds nur bei Änderungen einlesen, Zeitraum per Abfrage
+      self.termin_filter = termin_filter if termin_filter is not None else STANDARD_FILTER # Filter und Rollen
+      self.land   = bundesland(land) # eingebaute Feiertage (und Ferien aus ferien_tabelle) dieses Landes, siehe feiertage()
+      self.ferien_tabelle = ferien_tabelle if ferien_tabelle or not FERIEN_TABELLE.exists() else FERIEN_TABELLE
+      self.metriken   = Metriken() # Laufzeiten und Zähler des letzten Laufs, siehe report()
+      self.feed_stats = []
+      self.tagesflags = bytearray()  # Feier-/Ferientage des Zeitraums, siehe build_day_flags()
+      self.skelett    = None       # Kalendergerüst des Zeitraums bzw. der aktuellen Seite, siehe build_window()
+      self.anzahl_monate = 12      # Länge des Zeitraums, siehe parseEvents()
+      self.pdf_statistik = None    # Größe und Operatoren je Seite der zuletzt geschriebenen PDF, siehe ausgeben()
+      self.progress   = None       # Rückruf progress(stufe, erledigt, gesamt), z.B. aus einem Worker-Thread an die GUI
+      self.abbruch    = None       # threading.Event: ist es gesetzt, bricht der Lauf an der nächsten Prüfstelle ab
 
    # ------------------------------------------------------------------------------------------------------------
    # Kalenderdaten sammeln und ordnen ---------------------------------------------------------------------------
-   def parseEvents(self, start_month, start_year, feedurl):
+   def parseEvents(self, start_month, start_year, feedurl, anzahl_monate=12):
+      from dateutil.relativedelta import relativedelta
       self.startM  = int(start_month)
       self.startY  = int(start_year)
-      self.jahrgewechselt = False
-      self.feedurl = feedurl
-      
-      # Kalenderdaten auslesen
-      response = requests.get(feedurl)
-      response.raise_for_status()
-      cal = Calendar.from_ical(response.content)
+      self.anzahl_monate = int(anzahl_monate)
+      if self.anzahl_monate < 1:
+         raise ValueError(f"Anzahl der Monate muss mindestens 1 sein, nicht {anzahl_monate}")
+      self.metriken = Metriken()
+      # --- feedurl: ein Feed oder mehrere (Liste bzw. einer je Zeile), z.B. Schultermine, Feiertage, Ferien
+      feeds = split_feeds(feedurl)
+      self.feedurl = " ".join(feeds)
 
-      # Enddatum, geanu 1 Jahr später
+      # --- Zeitraum: ab dem 1. des Startmonats, anzahl_monate lang (Standard: genau 1 Jahr)
       start_date = dt.datetime(self.startY, self.startM, 1)
-      end_date   = start_date + relativedelta(years=1)
-
-      # Dictionary zur Speicherung der Termine
-      self.ebd = defaultdict(dict) # ebd = events_by_day
-      self.fbm = defaultdict(dict) # fbm = footnotes by month
-
-      # --- alle Termine durchlaufen und die relevanten Termine in den ------------------------------------------
-      #     Dictionaries self.ebd und self.fbm speichern --------------------------------------------------------
-      for element in cal.walk():
-        
-         if element.name == "VEVENT":
-            
-            dtstart = element.get('DTSTART').dt
-            dtend   = element.get("DTEND")
-            dtend = dtend.dt if dtend else None
-            mehrtaegig_mZ = False
-            mehrtaegig_oZ = False
-            ganztaegig    = False
-            
-            ev_typ = "4-default"
-            if dtend:
-               if isinstance(dtstart, date) and not isinstance(dtstart, datetime): # ganztägig
-                  dauer = (dtend - dtstart).days
-                  if dauer > 1:                                                     # ganztägig mehrtägig
-                     ev_typ = '1-mehrtaegig'
-                  else:                                                             # ganztägig eintägig
-                     ev_typ = '2-ganztaegig'
-               else:                                                               # Ereignis mit Zeitangabe
-                  dauer = dtend -dtstart
-                  if dauer.days >= 1:                                               # mehrtägiges Ereignis mit Zeitangabe
-                     ev_typ = '3-mehrtaegig_mZ'
-                  else:                                                             # normaler Temrin mit Zeitangabe
-                     pass
-            else:
-               pass                                                                # kein DTEND, Dauer kann nicht bestimmt werden
-
-            evstart = dtstart if isinstance(dtstart, datetime) else datetime.combine(dtstart, datetime.min.time())
-            if isinstance(dtend, datetime):
-               evend = dtend
-            elif dtend:
-               evend = datetime.combine(dtend, datetime.min.time())
-            else:
-               evend = evstart + timedelta(days=1)
-            
-            # -- Lese den Termin nur ein, wenn er innerhalb des zu erfassenden Jahres liegt: start_date <=evstart <= end_date ODER evend >= start_date
-            if (start_date.date() <= evstart.date() <= end_date.date()) or (evend.date() >= start_date.date()):
-               print(f"Lese Termin ein.")
-               summary       = element.get("SUMMARY")
-               categories    = element.get('CATEGORIES')
-               if categories:
-                  categories_str = categories.to_ical().decode()
-                  category_list  = [cat.strip() for cat in categories_str.split(',')]
-               else:
-                  categories_str = ''
-                  category_list  = []
-               
-               print(f"Termin '{summary}': evstart = {evstart} - evend = {evend} | Typ: {ev_typ} | Kategorien: {categories_str}")
-               
-               ev_data = {
-                  'kategorien': category_list,
-                  'ev_start':   evstart,
-                  'ev_end':     evend,
-                  'summary':    summary,
-                  'ev_typ':     ev_typ
-               }
-
-               # --- Mehrtagestermine müssen in das Dict. self.fbm (footnotes_by_month) für die fußnoten (Legende) des monats hinterlegt werden, 
-               #     und auch die Termine, die die anzahl von maximal 4 anzeigbaren terminen pro zeile übersteigen - aber das sollte erst passieren, 
-               #     nachdem die Tagestermien nach anfangszeit ortiert sind... kompliziert!! - kann erst nach dem kompletten Einlesen aller Termine erfolgen
-               if ev_typ == "1-mehrtaegig" and not set(("Feiertag","Feiertage")) & set(category_list) and "Ferien" not in category_list: # -- ist ein mehrtägiger Termin, aber kein Feiertag oder Ferientermin
-                  monate = self.betroffene_monate(evstart, evend)
-                  #print(f'>> Der Termin erstreckt sich über {len(monate)} Monate, und zwar über {monate}')
-                  for monat in monate:
-                     key_fbm = monat
-                     if key_fbm not in self.fbm: # --- falls es im dict self.fbm noch keinen eintrag für den aktuellen Monat gibt:
-                        self.fbm[key_fbm] = []   #     Eintrag anlegen
-                        #print(f'>> im dictionary fbm sind für den Monat [{key_fbm}] noch keine Fussnoten erfasst - Datenstaz self.fbm[{key_fbm}] wird angelegt.')
-                     if not any(eintrag.get('fn_summary') == summary for eintrag in self.fbm[key_fbm]): # --- nur falls es in diesme Monat für diesen Summarytext noch keinen Eintrag gibt:
-                        self.fbm[key_fbm].append({                                                      #     anlegen
-                           'fn_evstart': evstart,
-                           'fn_evend':   evend,
-                           'fn_summary': summary,
-                           'fn_typ':     ev_typ
-                        })
-                        #print(f">> im Array self.fbm['{key_fbm}'] gibt es noch keinen Eintrag mit der Summary '{summary}' - wird angelegt.")
-
-               cur_day = evstart
-               while cur_day < evend:
-                  
-                  cur_day_dt = cur_day.date()
-                  # --- falls der tag im dict self.ebd (eventds_by_day) noch nicht angelegt wurde, dann anlegen mit Default-Daten
-                  if cur_day_dt not in self.ebd:
-                     self.ebd[cur_day_dt] = {
-                        'termine':      [],
-                        'is_feiertag':  False,
-                        'is_ferientag': False,
-                        'tagestexte':   []
-                     }
-                  
-                  # --- jetzt die Daten für das Datum hinterlegen:
-                  # --- 1. ggf. ändern, dass der tag ein Feiertag ist
-                  if set(("Feiertag","Feiertage")) & set(category_list): self.ebd[cur_day_dt]['is_feiertag']  = True 
-                  # --- 2. ggf. ändern, dass der tag ein Ferientag ist
-                  if "Ferien" in category_list: self.ebd[cur_day_dt]['is_ferientag'] = True 
-                  # ---NUR für den ersten Tag jeden Termins (die mehrtägigen Termine müssen nicht mehrfach gespeichert werden):
-                  if cur_day == evstart or (cur_day == start_date and evstart < start_date):
-                     # --- 3. Tagestexte hinzufügen: ein Array, dessen einträge später die zeilen der tagestexte sind: das wird aber erst nach dem Sortieren geschrieben
-                     # self.ebd[cur_day_dt]['tagestexte'].append(summary)
-                     # --- 4. die Termin-Daten an das array ...['termine'] anhängen
-                     self.ebd[cur_day_dt]['termine'].append(ev_data)
-                  elif ev_typ == '1-mehrtaegig' and not set(("Feiertag","Feiertage")) & set(category_list) and "Ferien" not in category_list: # bei mehrtägigen terminen, die über Monatsgrenzen hinweg gehen, auch am 1. der betroffenen Monate als Termin einfügen
-                     if len(monate)>1:
-                        print(f">> der Termin '{ev_data['summary']}' vom {ev_data['ev_start']} geht über mehr als einen Monat hinweg. Prüfe ob das Tuple ({cur_day.year}, {cur_day.month}) im array monate vorkommt (cur_day.day = {cur_day.day}): ", end=" -> ")
-                        if (cur_day.year, cur_day.month) in monate and cur_day > evstart and cur_day.day==1:
-                           print(f" ja (True)")
-                           self.ebd[cur_day_dt]['termine'].append(ev_data)
-                        else:
-                           print("nein")
-
-                  
-                  
-                  #print(f" der tag {cur_day_dt} erhält] den Status is_feiertag: {self.ebd[cur_day_dt]['is_feiertag']}")
-                  print(f"...Der Tag {cur_day_dt} erhält den Status is_ferientag: {self.ebd[cur_day_dt]['is_ferientag']}")
-                  cur_day += timedelta(days=1)
-
-      # --- jetzt die Tagestexte und die mehrtägigen Termine (Fussnoten) sortieren ------------------------------    
-      # --- 1-Tagestermine sortieren
-      if len(self.ebd) > 0:
-         for tag, daten in self.ebd.items():
-            if 'termine' in daten:
-               daten['termine'].sort(key=lambda ev: (ev['ev_typ'], ev['ev_start']))
-            # --- Tagestexte neu schreiben (oder erst jetzt hier schreiben, muss vorher gar nicht erfolgen)
-            if len(daten['tagestexte']) > 0: self.ebd[tag]['tagestexte'].clear()
-            max_zeilen = 4
-            ctr = 0
-            for termin in daten['termine']:
-               uhrzeit    = termin['ev_start'].strftime("%H:%M")
-               zeilentext = termin['summary'].strip()
-               if termin['ev_typ'] == '4-default': zeilentext = str(f"{uhrzeit} {zeilentext}")
-               if ctr < max_zeilen: # --- bis zu 4 Tageseinträge? Diese als Tagestexte sortiert ausgeben
-                  self.ebd[tag]['tagestexte'].append(zeilentext)
-               else: # --- mehr als 4 Tageseinträge? Dann die letzten mit an die Fußnoten anhängen
-                  key_fbm = (tag.year, tag.month)
-                  if key_fbm not in self.fbm:
-                     self.fbm[key_fbm] = []
-                  self.fbm[key_fbm].append({
-                     'fn_evstart': termin['ev_start'],
-                     'fn_evend':   termin['ev_end'],
-                     'fn_summary': zeilentext,
-                     'fn_typ':     termin['ev_typ']
-                  })
-               ctr += 1
-      # --- 2-Fußnoten sortieren nach Anfangszeit und dann sowohl als Legendeneinträge speichern als auch -------
-      #     täglich für die Verweise in den Tageszeilen ---------------------------------------------------------
-      print("\n<<<----------------------------------------------------------------------------------------------------------------------------->>>")
-      print("<<< Sortiere die Fußnoten und erzeuge das dictionary self.fbd (footnotes_by_day). ---------------------------------------------->>>\n")
-      self.fbd = defaultdict(dict) # --- fbd = footnotes_by_day, zur Speicherung und Ausgabe der Verweisnrn.
-      print(f">> es gibt {len(self.fbm)} Elemente im Dictionary self.fbm (footnotes_by_month)")
-      if len(self.fbm) > 0:
-         for monat in self.fbm:
-            #print(f"!! >>> Monat: {monat}: vor dem Sortieren: Anzahl der Elemente in self.fbm['{monat}']: {len(self.fbm[monat])}")
-            self.fbm[monat].sort(key=lambda ev: ev['fn_evstart'].strftime("%y:%m:%D %H:%M"))
-            #print(f"!! >>> Monat: {monat}: nach dem Sortieren: Anzahl der Elemente in self.fbm['{monat}']: {len(self.fbm[monat])}")
-            #for i, v in enumerate(self.fbm[monat], start=1):
-            #   print(f'Termin {i}: {v['fn_summary']} | fn_evstart: {v['fn_evstart']} | fn_evend: {v['fn_evend']}')
-
-            for index, fn in enumerate(self.fbm[monat], start=1):
-               erster_des_monats  = date(monat[0], monat[1], 1)
-               letzter_des_monats = erster_des_monats + relativedelta(months=1) - relativedelta(days=1)
-               vorletzter_des_termins = fn['fn_evend'].date() - relativedelta(days=1)
-               # --- startdatum zum durchlaufen: Anfansdatum des termins oder erster_des_Monats, falls das Anfangsdatum in einem der vormonate liegt
-               cur_date    = fn['fn_evstart'].date() if fn['fn_evstart'].date() >= erster_des_monats else erster_des_monats
-               # --- Enddatum latest_date: abhängig von der Temrinart und Lage des letzten termintages --
-               # --- Achtung: bei mehrtägigen Terminen leigt das enddatum am Folgetag um 00:00 Uhr!!
-               if fn['fn_typ'] == "4-default":
-                  latest_date = fn['fn_evend'].date() if fn['fn_evend'].date() <= letzter_des_monats else letzter_des_monats
-               elif fn['fn_typ'] == "2-ganztaegig":
-                  latest_date = fn['fn_evend'].date() if fn['fn_evend'].date() <= letzter_des_monats else letzter_des_monats
-               elif fn['fn_typ'] == "1-mehrtaegig":
-                   latest_date = vorletzter_des_termins if vorletzter_des_termins <= letzter_des_monats else letzter_des_monats
-               else: 
-                  latest_date = fn['fn_evend'].date() if fn['fn_evend'].date() <= letzter_des_monats else letzter_des_monats
-               while (
-                  #(fn['fn_typ'] == "1-mehrtaegig" and cur_date < latest_date) or
-                  #(fn['fn_typ'] == "2-ganztaegig" and cur_date <= latest_date) or
-                  #(fn['fn_typ'] == "4-default" and cur_date <= latest_date)
-                  cur_date <= latest_date
-               ):
-                  #print(f'!! >>> Monat: {monat}: index: {index} | cur_date: {cur_date}')
-                  if cur_date not in self.fbd:
-                     #print(f"!! >>> Für das Datum '{cur_date} gibt es im Dictionary self.fbd noch keinen Eintrag -> wird angelegt und index: '{index}' hinzugefügt.")
-                     self.fbd[cur_date] = []
-                  self.fbd[cur_date].append(index)
-                  cur_date += timedelta(days=1)
-         
+      end_date   = start_date + relativedelta(months=self.anzahl_monate)
+      self.win_von, self.win_bis = start_date.date(), end_date.date()
 
+      # --- Kalenderdaten aller Feeds gleichzeitig abrufen und einlesen (die Wartezeit ist dann etwa die des
+      #     langsamsten Feeds statt der Summe); die Reihenfolge der Ergebnisse entspricht der Reihenfolge der Feeds
+      t0 = time.perf_counter()
+      with ThreadPoolExecutor(max_workers=max(1, min(FEED_WORKERS, len(feeds)))) as pool:
+         ergebnisse = []
+         for ergebnis in pool.map(lambda url: self._lade_feed(url, start_date, end_date), feeds):
+            ergebnisse.append(ergebnis)
+            self.melde('feeds', len(ergebnisse), len(feeds))
+      log.info("Feed-Cache: %s", self.cache.summary())
+      serien = _serie_beginne.cache_info()
+      log.info("Serientermine: %d ausgerollt, %d aus dem Cache", serien.misses, serien.hits)
 
+      # --- Intervall-Indizes über die Tage der Termine: statt jeden Termin Tag für Tag auszurollen, werden nur
+      #     [erster Tag, Tag nach dem letzten Tag) gespeichert und später für den sichtbaren Zeitraum abgefragt
+      self.idx_termine   = IntervalIndex() # alle Termine im Zeitraum
+      self.idx_feiertage = IntervalIndex() # Tage mit Feiertagen
+      self.idx_ferien    = IntervalIndex() # Ferientage
+      # --- Termine zusammenführen: ein Termin, der schon in einem vorherigen Feed vorkam (gleiche UID und bei
+      #     Serien gleicher Einzeltermin bzw. gleicher Anfang und gleicher Text), wird übersprungen
+      gesehen_uids, gesehen_keys = set(), set()
+      self.feed_stats = []
+      debug = log.isEnabledFor(logging.DEBUG)
+      for termine, info in ergebnisse:
+         uids, keys = set(), set()
+         for von, bis, ev_data in termine:
+            key = (ev_data.ev_start, ev_data.summary)
+            uid = (ev_data.uid, ev_data.recurrence_id)
+            if uid in gesehen_uids or key in gesehen_keys:
+               info['duplikate'] += 1
+               continue
+            if ev_data.uid: uids.add(uid)
+            keys.add(key)
+            if debug:
+               log.debug("Termin '%s': evstart = %s - evend = %s | Typ: %s | Kategorien: %s", ev_data.summary,
+                         ev_data.ev_start, ev_data.ev_end, ev_data.ev_typ, ', '.join(ev_data.kategorien))
+            rollen = self.termin_filter.rollen_von(ev_data.kategorien)
+            if ROLLE_FEIERTAG in rollen: self.idx_feiertage.add(von, bis)
+            if ROLLE_FERIEN in rollen:   self.idx_ferien.add(von, bis)
+            self.idx_termine.add(von, bis, ev_data)
+         gesehen_uids |= uids
+         gesehen_keys |= keys
+         self.feed_stats.append(info)
+         log.info("Feed %s: %d Termine im Zeitraum (%d Duplikate), %.0f KB, Abruf %.2f s, Einlesen %.2f s, Serien %.2f s",
+                  info['feed'][0:100], info['termine'], info['duplikate'], info['bytes']/1024, info['fetch_s'],
+                  info['parse_s'], info['expand_s'])
+      if self.land:
+         self.eingebaute_termine()
+      self.metriken.zaehle('termine_im_zeitraum', len(self.idx_termine))
+      self.melde('termine', len(self.idx_termine))
+      log.info("%d Feed(s) in %.2f s abgerufen und eingelesen", len(feeds), time.perf_counter() - t0)
+      # --- Tagestexte und Fußnoten entstehen erst bei der Ausgabe, Seite für Seite (siehe iter_teile)
 
+   # --- Feiertage und Ferien des Landes ohne Feed als ganztägige Termine mit der Kategorie 'Feiertag' bzw. 'Ferien'
+   #     (Terminfilter, Rollen, Tagestext und Einfärbung wie aus einem Feed); eingetragen werden nur die Tage, die noch
+   #     kein Termin mit derselben Rolle markiert, ein teilweise überdeckter Zeitraum wird also in Stücke geteilt
+   def eingebaute_termine(self):
+      jahre = range(self.win_von.year, (self.win_bis - timedelta(days=1)).year + 1)
+      eintraege = [(tag, tag + timedelta(days=1), name, "Feiertag")
+                   for jahr in jahre for tag, name in feiertage(jahr, self.land)]
+      if self.ferien_tabelle:
+         eintraege += [(von, bis, name, "Ferien")
+                       for von, bis, name in dict.fromkeys(itertools.chain.from_iterable(
+                          ferien(self.ferien_tabelle, jahr, self.land) for jahr in jahre))]
+      anzahl = 0
+      for von, bis, name, kategorie in eintraege:
+         # --- derselbe Filter und dieselben Rollen wie für die Termine der Feeds
+         if bis <= self.win_von or von >= self.win_bis or not self.termin_filter.passt((kategorie,), name, None):
+            continue
+         rollen = self.termin_filter.rollen_von((kategorie,))
+         teile  = [(von, bis)]
+         for rolle, index in ((ROLLE_FEIERTAG, self.idx_feiertage), (ROLLE_FERIEN, self.idx_ferien)):
+            if rolle in rollen:
+               teile = [luecke for teil in teile for luecke in index.luecken(*teil)]
+         for teil_von, teil_bis in teile:
+            if teil_bis <= self.win_von or teil_von >= self.win_bis:
+               continue
+            self.idx_termine.add(teil_von, teil_bis, make_event(teil_von, teil_bis, name, (kategorie,)))
+            if ROLLE_FEIERTAG in rollen: self.idx_feiertage.add(teil_von, teil_bis)
+            if ROLLE_FERIEN in rollen:   self.idx_ferien.add(teil_von, teil_bis)
+            anzahl += 1
+      self.metriken.zaehle('termine_eingebaut', anzahl)
+      log.info("%d eingebaute Feiertage/Ferientermine für %s", anzahl, BUNDESLAENDER[self.land])
 
-   def betroffene_monate(self, evstart:date, evend:date) -> list[tuple[int, int]]:
-      monate = []
-      aktuelles_datum = evstart.replace(day=1)
-      end_datum       = evend
-      #print(f"Funtkion betroffen_monate(evstart='{evstart}', evend='{evend}'): (evend - evstart).days = '{(evend - evstart).days}'")
-      if (evend - evstart).days > 1: end_datum -= relativedelta(days=1)
-      #print(f"Überprüfe aktuelles_datum ('{aktuelles_datum})' <= end_datum ({end_datum})")
-      while aktuelles_datum <= end_datum:
-         #print("...passt")
-         monate.append((aktuelles_datum.year, aktuelles_datum.month))
-         aktuelles_datum += relativedelta(months=1)
-      return monate
+   # --- einen Feed abrufen und die Termine im Zeitraum als (erster Tag, Tag nach dem letzten Tag, Termin) liefern ---
+   def _lade_feed(self, url, start_date, end_date):
+      t0 = time.perf_counter()
+      with self.metriken.span('abruf'):
+         try:
+            # --- lokale Feeds werden nicht abgerufen, sondern erst beim Einlesen gelesen (siehe LokalerFeed)
+            body = lokaler_feed(url) if ist_lokal(url) else self.cache.fetch(url)
+         except Exception as exc:
+            if self.store is None or not self.store.has_feed(url):
+               raise
+            log.warning("Feed %s nicht abrufbar (%s), verwende die gespeicherten Termine", url[0:100], exc)
+            body = None
+      t1 = time.perf_counter()
+      win_von, win_bis = start_date.date(), end_date.date()
+      with self.metriken.span('einlesen'):
+         if self.store is not None:
+            # --- Terminspeicher: den ganzen Feed (ungefiltert) nur bei geänderter Version einlesen, dann den Zeitraum
+            #     abfragen und erst die abgefragten Termine filtern
+            if body is not None and self.store.sync(url, body, self._parse):
+               self.metriken.zaehle('feeds_gespeichert')
+            termine = self.store.query(url, win_von, win_bis)
+            if self.termin_filter.aktiv:
+               termine = [ev_data for ev_data in termine
+                          if self.termin_filter.passt(ev_data.kategorien, ev_data.summary, ev_data.ort)]
+         else:
+            # --- Streaming-Modus: nur die benötigten Eigenschaften lesen, Termine außerhalb des Zeitraums und
+            #     ausgefilterte Termine früh verwerfen
+            termine = list(self._parse(body, start_date, end_date, self.termin_filter if self.termin_filter.aktiv else None))
+      self.metriken.zaehle('termine_gelesen', len(termine))
+      t2 = time.perf_counter()
+      im_zeitraum = []
+      with self.metriken.span('serien'):
+         for ev_data in expand_recurrences(termine, win_von, win_bis):
+            von, bis = event_tage(ev_data.ev_start, ev_data.ev_end)
+            # -- Lese den Termin nur ein, wenn er mindestens einen Tag innerhalb des zu erfassenden Jahres belegt
+            if bis <= win_von or von >= win_bis:
+               continue
+            im_zeitraum.append((von, bis, ev_data))
+      groesse = body.groesse() if isinstance(body, LokalerFeed) else len(body) if body is not None else 0
+      return im_zeitraum, {'feed':      url,
+                           'bytes':     groesse,
+                           'fetch_s':   t1 - t0,
+                           'parse_s':   t2 - t1,
+                           'expand_s':  time.perf_counter() - t2,
+                           'termine':   len(im_zeitraum),
+                           'duplikate': 0}
 
-   def is_ferientag(self, tag):
-      tag = tag.date()
-      if tag in self.ebd:
-         return self.ebd[tag]["is_ferientag"]
-      else:
-         return False
-   
-   def is_feiertag(self, tag):
-      tag = tag.date()
-      if tag in self.ebd:
-         return self.ebd[tag]["is_feiertag"]
-      else:
-         return False
+   def _parse(self, body: bytes | LokalerFeed, start_date=None, end_date=None, auswahl: TerminFilter | None = None):
+      if isinstance(body, LokalerFeed):
+         return self._parse_lokal(body, start_date, end_date, auswahl)
+      if self.parser == "icalendar":
+         return iter_vevents_icalendar(body, auswahl)
+      return iter_vevents(io.BytesIO(body), start_date, end_date, auswahl)
+
+   def _parse_lokal(self, feed: LokalerFeed, start_date, end_date, auswahl):
+      # --- Generator: die Datei bleibt nur geöffnet, bis alle Termine gelesen sind
+      with feed.zeilen() as zeilen:
+         if self.parser == "icalendar":
+            yield from iter_vevents_icalendar(b"".join(zeilen), auswahl)
+         else:
+            yield from iter_vevents(zeilen, start_date, end_date, auswahl)
+
+   # ------------------------------------------------------------------------------------------------------------
+   # Tagestexte (self.ebd) und Fußnoten (self.fbm, self.fbd) für den sichtbaren Zeitraum aus dem Index aufbauen ---
+   #     teil: nur diese Monate aufbauen (z.B. eine Seite), der Zeitraum bestimmt weiterhin den ersten Tag
+   def build_window(self, win_von: date, win_bis: date, teil: KalenderSkelett | None = None):
+      # --- Kalendergerüst des Zeitraums (ab dem ersten des Startmonats), alle Spalten laufen über seinen Tagesindex
+      if teil is None:
+         anzahl_monate = (win_bis.year - win_von.year)*12 + win_bis.month - win_von.month + (win_bis.day > 1)
+         teil = kalender_skelett(win_von.month, win_von.year, anzahl_monate)
+      self.skelett = skelett = teil
+      self.ebd = [()] * len(skelett)      # ebd = events_by_day: Tagesindex -> Tagestexte (höchstens 4 Zeilen)
+      self.fbd = [()] * len(skelett)      # fbd = footnotes_by_day: Tagesindex -> Verweisnummern in die Legende
+      self.fbm = defaultdict(list) # fbm = footnotes by month: (Jahr, Monat) -> Fussnote (verweist auf den Termin)
+      termine_am_tag = defaultdict(list)
+      self.build_day_flags(max(win_von, skelett.von), min(win_bis, skelett.bis))
+
+      # --- Monat für Monat nur die Termine abfragen, die den Monat berühren -------------------------------------
+      tage = 0   # belegte Tage im Zeitraum, über alle Termine summiert
+      for mo in skelett.monate:
+         monat_von, monat_bis = mo.von, mo.bis
+         key_fbm   = (mo.jahr, mo.monat)
+         for von, bis, ev_data in self.idx_termine.overlapping(monat_von, monat_bis):
+            tage += (min(bis, monat_bis, win_bis) - max(von, monat_von, win_von)).days
+            fussnote = ist_fussnotentermin(ev_data, self.termin_filter)
+            # --- Tagestermin am ersten Tag des Termins bzw. am ersten Tag des Zeitraums; mehrtägige Termine über
+            #     Monatsgrenzen hinweg zusätzlich am 1. jedes weiteren betroffenen Monats
+            erster_tag = max(von, win_von)
+            if monat_von <= erster_tag < monat_bis:
+               termine_am_tag[erster_tag].append(ev_data)
+            elif fussnote and von < monat_von < bis:
+               termine_am_tag[monat_von].append(ev_data)
+            # --- Mehrtagestermine (kein Feiertag oder Ferientermin) kommen in die Fußnoten (Legende) des Monats,
+            #     jeder Summarytext nur einmal pro Monat
+            if fussnote and not any(fn.text == ev_data.summary for fn in self.fbm[key_fbm]):
+               self.fbm[key_fbm].append(Fussnote(ev_data, ev_data.summary))
+      self.metriken.zaehle('tage_ausgerollt', tage)
+
+      # --- jetzt die Tagestexte und die mehrtägigen Termine (Fussnoten) sortieren ------------------------------
+      # --- 1-Tagestermine sortieren
+      for tag in sorted(termine_am_tag):
+         termine = termine_am_tag[tag]
+         termine.sort(key=lambda ev: (ev.ev_typ, naive_zeit(ev.ev_start)))
+         max_zeilen = 4
+         tagestexte = []
+         for ctr, termin in enumerate(termine):
+            zeilentext = termin.summary.strip()
+            if termin.ev_typ == '4-default': zeilentext = f"{termin.ev_start.strftime('%H:%M')} {zeilentext}"
+            if ctr < max_zeilen: # --- bis zu 4 Tageseinträge? Diese als Tagestexte sortiert ausgeben
+               tagestexte.append(zeilentext)
+            else: # --- mehr als 4 Tageseinträge? Dann die letzten mit an die Fußnoten anhängen
+               self.fbm[(tag.year, tag.month)].append(Fussnote(termin, zeilentext))
+         self.ebd[skelett.index(tag)] = tagestexte
+      # --- 2-Fußnoten sortieren nach Anfangszeit und dann sowohl als Legendeneinträge speichern als auch -------
+      #     täglich für die Verweise in den Tageszeilen (über die Indexgrenzen des Monats im Kalendergerüst) ----
+      log.debug("es gibt %d Elemente im Dictionary self.fbm (footnotes_by_month)", len(self.fbm))
+      self.metriken.zaehle('fussnoten', sum(len(fussnoten) for fussnoten in self.fbm.values()))
+      for monat, fussnoten in self.fbm.items():
+         fussnoten.sort(key=lambda fn: (fn.termin.ev_start.year % 100, fn.termin.ev_start.month, fn.termin.ev_start.day,
+                                        fn.termin.ev_start.hour, fn.termin.ev_start.minute))
+         mo = skelett.monat(*monat)
+         letzter_des_monats = mo.erster + mo.tage - 1
+         for index, fn in enumerate(fussnoten, start=1):
+            ev_start, ev_end, ev_typ = fn.termin.ev_start, fn.termin.ev_end, fn.termin.ev_typ
+            # --- Achtung: bei mehrtägigen Terminen liegt das Enddatum am Folgetag um 00:00 Uhr!!
+            letzter_tag = skelett.index(ev_end.date()) - (ev_typ == "1-mehrtaegig")
+            for i in range(max(skelett.index(ev_start.date()), mo.erster), min(letzter_tag, letzter_des_monats) +1):
+               self.fbd[i] += (index,)
+
+   # --- Feier- und Ferientage des Zeitraums als Bits je Tag über den Index des Kalendergerüsts, zusätzlich zu den
+   #     Wochenend-Bits aus dem Gerüst (ein Byte pro Tag statt einer Abfrage je Tag)
+   def build_day_flags(self, win_von: date, win_bis: date):
+      self.tagesflags = bytearray(self.skelett.flags)
+      for index, bit in ((self.idx_feiertage, TAG_FEIERTAG), (self.idx_ferien, TAG_FERIEN)):
+         for von, bis, _ in index.overlapping(win_von, win_bis):
+            for i in range(self.skelett.index(max(von, win_von)), self.skelett.index(min(bis, win_bis))):
+               self.tagesflags[i] |= bit
+
+   # --- Prüfstelle für Fortschritt und Abbruch (wird aus dem Thread des Laufs aufgerufen) -------------------------
+   def melde(self, stufe: str, erledigt: int, gesamt: int | None = None):
+      if self.abbruch is not None and self.abbruch.is_set():
+         raise Abgebrochen(stufe)
+      if self.progress is not None:
+         self.progress(stufe, erledigt, gesamt)
+
+   # --- Bericht über den letzten Lauf: Zeitabschnitte, Zähler, Feeds und Feed-Cache (JSON-fähig) ---------------
+   def report(self) -> dict:
+      messungen = text_breite.cache_info()
+      return {**self.metriken.report(),
+              'feeds':      [dict(info) for info in self.feed_stats],
+              'feed_cache': self.cache.stats(),
+              'pdf':        self.pdf_statistik,
+              'textbreiten': {'gemessen': messungen.misses, 'aus_cache': messungen.hits}}
    # ------------------------------------------------------------------------------------------------------------
-   # PDF-Datei aus geordneten Kalenderdaten erstellen -----------------------------------------------------------
+   # Layout aus geordneten Kalenderdaten berechnen und als PDF bzw. SVG ausgeben ----------------------------------
+   #     Die Seiten (je 6 Monate) entstehen nacheinander: Tagestexte und Fußnoten der Seite aufbauen, Layout
+   #     berechnen, an alle Ausgaben geben, dann verwerfen. Der Speicherbedarf hängt so nicht von der Länge des
+   #     Zeitraums ab, und PDF und SVG im selben Lauf kosten nur eine Layout-Berechnung je Seite
    def createPdf(self, fpath: Path, header: str):
-      self.fpath  = fpath
-      self.header = header.strip()
-      # --- PDF-Konfiguration (Fonts, Fontgrößen, Dateiname, etc.....) ------------------------------------------
-      self.pgsz = landscape(A3)
-      self.wd, self.ht = self.pgsz
+      self.ausgeben(fpath, header, pdf=True)
+
+   # --- je Seite eine SVG-Datei neben fpath (<name>_1.svg, <name>_2.svg, ...), liefert die geschriebenen Dateien;
+   #     seiten: nur diese Seiten (1, 2, ...) schreiben
+   def createSvg(self, fpath: Path, header: str, seiten=None) -> list[Path]:
+      return self.ausgeben(fpath, header, pdf=False, svg=True, svg_seiten=seiten)
+
+   # --- PDF und/oder SVG in einem Durchgang über die Seiten schreiben; freigeben: Termine bereits ausgegebener
+   #     Seiten aus den Indizes entfernen (nur für einmalige Läufe, danach lässt sich der Kalender nicht erneut
+   #     ausgeben); kompakt: PDF mit zusammengefassten Zeichenbefehlen und komprimierten Seiten (PdfSchreiber)
+   def ausgeben(self, fpath: Path, header: str, pdf=True, svg=False, svg_seiten=None, freigeben=False,
+                kompakt=False) -> list[Path]:
+      self.fpath = fpath
+      self.seitenmasse()
+      self.header = self.header_text(header)
+      layout  = Layout(self.wd, self.ht)
+      dateien = []
+      with contextlib.ExitStack() as stapel:
+         schreiber = None
+         if pdf:
+            tmp = stapel.enter_context(atomar(Path(fpath)))
+            schreiber = PdfSchreiber(layout, tmp, kompakt)
+         for nr, teil in self.iter_teile(freigeben):
+            with self.metriken.span('layout'):
+               seite = self.layout_seite(layout, nr)
+            if schreiber is not None:
+               with self.metriken.span('speichern'):
+                  schreiber.seite(seite)
+            if svg and (svg_seiten is None or nr in svg_seiten):
+               with self.metriken.span('svg'):
+                  datei = svg_pfad(fpath, nr)
+                  with atomar(datei) as tmp_svg:
+                     tmp_svg.write_text(render_svg(layout, seite), encoding="utf-8")
+               dateien.append(datei)
+            self.melde('seiten', nr, self.anzahl_seiten())
+         if schreiber is not None:
+            with self.metriken.span('speichern'):
+               schreiber.schliessen()
+            self.pdf_statistik = {'kompakt': kompakt, 'bytes': tmp.stat().st_size, 'seiten': schreiber.statistik}
+            for zeile in schreiber.statistik:
+               log.info("PDF Seite %d: %d Operatoren, %.1f KB Inhalt", zeile['seite'], zeile['operatoren'], zeile['bytes']/1024)
+            self.metriken.zaehle('pdf_operatoren', sum(zeile['operatoren'] for zeile in schreiber.statistik))
+      self.metriken.zaehle('seiten', self.anzahl_seiten())
+      return dateien
+
+   def anzahl_seiten(self) -> int:
+      return -(-self.anzahl_monate // MONATE_JE_SEITE)
+
+   # --- Seiten des Zeitraums der Reihe nach als (Seitennummer, Teilgerüst); vor jeder Seite sind Tagestexte,
+   #     Fußnoten und Tagesflags genau für deren Monate aufgebaut
+   def iter_teile(self, freigeben=False):
+      from dateutil.relativedelta import relativedelta
+      for nr in range(1, self.anzahl_seiten() +1):
+         erster = self.win_von + relativedelta(months=(nr-1)*MONATE_JE_SEITE)
+         teil   = kalender_skelett(erster.month, erster.year, min(MONATE_JE_SEITE, self.anzahl_monate - (nr-1)*MONATE_JE_SEITE))
+         with self.metriken.span('fussnoten'):
+            self.build_window(self.win_von, self.win_bis, teil)
+         yield nr, teil
+         if freigeben:
+            for index in (self.idx_termine, self.idx_feiertage, self.idx_ferien):
+               index.discard_before(teil.bis)
+
+   # --- Prüfsumme je Seite über alles, was die Seite zeigt (Monate, Tagesflags, Tagestexte, Verweise, Legende,
+   #     Überschrift, Feeds), aber ohne den Erstellungszeitpunkt: gleiche Prüfsumme = gleiche Seite
+   def seiten_digests(self, header: str) -> list[str]:
+      digests = []
+      for _, teil in self.iter_teile():
+         h = hashlib.sha1(repr((self.header_text(header), self.feedurl[0:100])).encode("utf-8"))
+         for mo in teil.monate:
+            tage = range(mo.erster, mo.erster + mo.tage)
+            h.update(repr((mo.jahr, mo.monat, [(self.tagesflags[i], tuple(self.ebd[i]), self.fbd[i]) for i in tage],
+                           [fn.text for fn in self.fbm.get((mo.jahr, mo.monat), ())])).encode("utf-8"))
+         digests.append(h.hexdigest())
+      return digests
+
+   # --- Seitenformat, Ränder, Schriftgrößen, Spaltenbreiten und Zeilenhöhen (alle Maße in pt) ---------------------
+   def seitenmasse(self):
+      self.wd, self.ht = mm2pts(420), mm2pts(297) # A3 quer
       # --- Seitenränder ----------------------------------------------------------------------------------------
       self.mgl  = mm2pts(8)                     # linker Rand
       self.mgr  = mm2pts(8)                     # rechter Rand
@@ -368,19 +1582,7 @@ class JCal:
       self.mgm  = mm2pts(8)
       self.wdp  = self.wd - self.mgl -self.mgr  # Breite der Seite ohne Ränder, automatisch ermittelt
       self.htp  = self.ht - self.mgb - self.mgt # Höhe der Seite ohne Ränder, automatisch ermittelt
-      # --- Fonts -----------------------------------------------------------------------------------------------
-      pdfmetrics.registerFont(TTFont('Calibri',             FONT_DIR / "calibri.ttf"))
-      pdfmetrics.registerFont(TTFont('Calibri-Kursiv',      FONT_DIR / "calibrii.ttf"))
-      pdfmetrics.registerFont(TTFont('Calibri-Fett',        FONT_DIR / "calibrib.ttf"))
-      pdfmetrics.registerFont(TTFont('Calibri-Fett-kursiv', FONT_DIR / "calibriz.ttf"))
-      pdfmetrics.registerFont(TTFont('Calibri-Fein',        FONT_DIR / "calibril.ttf"))
-      pdfmetrics.registerFont(TTFont('Calibri-Fein-Kursiv', FONT_DIR / "calibrili.ttf"))
-      self.ftsz         = 10
-      self.ftsz_termine =  6
-      # self.ftfm         = 'Calibri'
-      self.fontfms      = {'default': 'Calibri',
-                           'header':  'Calibri-Fett',
-                           'footer':  'Calibri-Kursiv'}
+      # --- Fontgrößen (die Schriften selbst wählt die Ausgabe, siehe SCHRIFTEN) ---------------------------------
       self.fontsizes    = {'default':          10,
                            'header':           14,
                            'footer':           6,
@@ -390,8 +1592,8 @@ class JCal:
                            'spalte_fussnoten': 6,
                            'spalte_kw':        4,
                            'legende':          6}
-      # --- Spaltenbereiten und Zeilenhöhen ---------------------------------------------------------------------
-      self.anz_m = 6 # Anzahl der Monate pro Seite
+      # --- Spaltenbreiten und Zeilenhöhen ----------------------------------------------------------------------
+      self.anz_m = MONATE_JE_SEITE # Anzahl der Monate pro Seite
       self.widths = {'Monat':         (self.wdp - self.mgm) / self.anz_m,
                      'Tag':           mm2pts(6),
                      'Wochentag':     mm2pts(6),
@@ -400,389 +1602,843 @@ class JCal:
       self.widths['Termintexte'] =    self.widths["Monat"] - (self.widths["Tag"] + self.widths["Wochentag"] + self.widths["Fussnote"] + self.widths["Kalenderwoche"])
       self.heights = {"Monat":        mm2pts(6),
                       "Tag":          mm2pts(8)}
-      # --- PDF-Canvas initialisieren ---------------------------------------------------------------------------
-      self.canv = canvas.Canvas(str(self.fpath), pagesize=self.pgsz)
-      self.canv.setFont(self.fontfms['default'], self.fontsizes["default"])
-      self.canv.setStrokeColor(colors.black)
-      self.canv.setLineWidth(0.03)
-      # --- Platzhalter im Header erstzen, z.B. mit Angaben zum Startjahr self.startY
-      if self.startM == 1:
+
+   # --- Platzhalter im Header erstzen, z.B. mit den Jahren des Zeitraums: 2025, 2025/26 oder 2025-2027
+   def header_text(self, header: str) -> str:
+      letztes_jahr = (self.win_bis - timedelta(days=1)).year
+      if letztes_jahr == self.startY:
          str_hd_jahre = str(self.startY)
+      elif letztes_jahr == self.startY + 1:
+         str_hd_jahre = f"{self.startY}/" + str(letztes_jahr)[2:4]
       else:
-         str_hd_jahre = f"{self.startY}/" + str(self.startY+1)[2:4]
-      self.header = self.header.format(jahre=str_hd_jahre)
-
-      # --- PDF-Seiten hinzufügen--------------------------------------------------------------------------------
-      self.pdf_addPage(1)
-      self.pdf_addPage(2)
-      # --- PDF-Datei speichern _--------------------------------------------------------------------------------
-      self.canv.save()
-   
+         str_hd_jahre = f"{self.startY}-{letztes_jahr}"
+      return header.strip().format(jahre=str_hd_jahre)
 
-   
-   # --- PDF-Seite hinzufügen -----------------------------------------------------------------------------------
-   def pdf_addPage(self, pgNo=1):
-      self.canv.setLineWidth(0.03)
-      self.pgNo=pgNo
-      self.pgStartM = int(self.startM)
-      self.pgStartY = int(self.startY)
-      if self.jahrgewechselt:
-         self.pgStartY += 1
+   # --- eine Seite (6 Monate des aktuellen Teilgerüsts) als Liste von Flächen, Texten und Vorlagen in Zeichen-
+   #     reihenfolge; auf der letzten Seite eines Zeitraums bleiben nicht belegte Spalten leer
+   def layout_seite(self, layout: Layout, pgNo=1) -> list:
+      seite = []
       
-      # --- äußere Rahmen zeichnen
-      self.canv.rect(self.mgl, self.mgb, (self.wdp - self.mgm)/2, self.htp)
-      self.canv.rect((self.wd+self.mgm)/2, self.mgb, (self.wdp-self.mgm)/2, self.htp)
+      # --- äußere Rahmen (für alle Seiten gleich, daher als Vorlage)
+      seite.append(Vorlage(layout.vorlage("jc_rahmen", lambda: [
+         Flaeche(self.mgl, self.mgb, (self.wdp - self.mgm)/2, self.htp, rahmen=True),
+         Flaeche((self.wd+self.mgm)/2, self.mgb, (self.wdp-self.mgm)/2, self.htp, rahmen=True)]), 0))
       
       # --- Monate: Spaltenüberschrift
       mgm_offset = 0
-      for mo in range(6):
-         
-         monatCtr = int(self.startM + mo)
-         print(f"monatCtr: {monatCtr}")
-
-         
-         if pgNo==1:
-            #''' Bestimme Monat und Jahr für die Seite 1'''
-            #''' Bestimme Monat '''
-            if monatCtr > 12:
-               monat = monatCtr - 12
-               if not self.jahrgewechselt:
-                  self.jahrgewechselt = True
-                  print(f"ggf. Jahreswechsel")
-            else:
-               monat = monatCtr
-            #''' Bestimme Jahr '''
-            if self.jahrgewechselt:
-               jahr = int(self.pgStartY) + 1
-            else:
-               jahr = int(self.pgStartY)
-         else:
-            #''' Bestimme Monat und Jahr für die Seite 2'''
-            #''' Bestimme Monat '''
-            if monatCtr > 6:
-               monat = monatCtr - 6
-            else:
-               monat = monatCtr + 6
-            #''' Bestimme Jahr '''
-            if mo == 0 and monat == 1:
-                  self.jahrgewechselt = True
-                  self.pgStartY = self.startY + 1
-            if self.jahrgewechselt:
-               jahr = int(self.startY) +1
-            else:
-               if monat < 6:
-                  if not self.jahrgewechselt:
-                     self.jahrgewechselt = True
-                  jahr = int(self.startY) + 1
-               else:
-                  jahr = int(self.pgStartY)
-         
-         print(f"mo: {mo} - monat: {monat} - jahr: {jahr}")
+      for mo, sk_monat in enumerate(self.skelett.monate):
+         self.melde('monate', (pgNo-1)*MONATE_JE_SEITE + mo, self.anzahl_monate)
+         jahr, monat = sk_monat.jahr, sk_monat.monat
+         log.debug("mo: %d - monat: %d - jahr: %d", mo, monat, jahr)
 
          if(mo > 2): mgm_offset = self.mgm
          
          # --- Überschriften und Fußzeilen schreiben, nur alle 3 Monate, also auf jeder A4-Hälfte
          if mo==0 or mo==3:
-            self.pdf_writeHeader(self.header, self.mgl + mo*self.widths["Monat"] + mgm_offset, self.ht - self.mgt +5) 
-            self.pdf_writeFooter(mo, mgm_offset)
+            self.layout_header(seite, self.header, self.mgl + mo*self.widths["Monat"] + mgm_offset, self.ht - self.mgt +5)
+            self.layout_footer(seite, mo, mgm_offset)
          
-         # --- Monatsüberschriften
-         try:
-            monatsname = self.locale['monate']['de'][dt.date(jahr, monat, 1).strftime("%B")] + f" {str(jahr)[2:4]}"
-         except Exception as exc:
-            monatsname = dt.date(jahr, monat, 1).strftime("%B") + f" {str(jahr)[2:4]}"
+         # --- Monatsüberschrift, Länge und Tagesindizes des Monats aus dem Kalendergerüst
+         monatsname  = sk_monat.name
+         tage_des_monats, erster_wtag = sk_monat.tage, sk_monat.erster_wtag
+         tage_index  = range(sk_monat.erster, sk_monat.erster + tage_des_monats)
 
          x  = self.mgl + mo*self.widths["Monat"] + mgm_offset
          y1 = self.ht - self.mgt - self.heights["Monat"]
-         self.canv.setFillColorRGB(153/255, 204/255, 1)
-         self.canv.rect(x, y1, self.widths["Monat"], self.heights["Monat"], 1, 1)
-         self.canv.setFont(self.fontfms["default"], self.fontsizes["monatsname"])
-         self.canv.setFillColor(colors.black)
-         self.canv.drawCentredString(x + self.widths["Monat"]/2, y1+(self.heights["Monat"] -self.fontsizes["monatsname"])/2 + self.fontsizes["monatsname"]*0.2, monatsname)
-
-         # --- Tage des Monats schreiben
-         print(f"Gehe alle Tage des Monats {monatsname} durch")
-         _, tage_des_monats = calendar.monthrange(jahr, monat)
-         for tag in range(1, tage_des_monats +1):
-            dt_tag = dt.datetime(jahr, monat, tag)
-            try:
-               wochentag = self.locale['wochentageK']['de'][dt_tag.strftime('%a')]
-            except Exception as exc:
-               wochentag = dt_tag.strftime('%a')
+
+         # --- statischer Hintergrund der Monatsspalte (Kopfzeile, Wochenenden) als Vorlage, dazu die
+         #     Wochenenden ab dem 29. und die Auffüllung der fehlenden Tageszeilen bis zu 31
+         seite.append(Vorlage(self.vorlage_hintergrund(layout, erster_wtag), x))
+         for tag in range(TAGE_IM_FORM +1, tage_des_monats +1):
+            farbe = WOCHENEND_FARBEN.get((erster_wtag + tag - 1) % 7)
+            if farbe:
+               seite.append(Flaeche(x, y1 - tag*self.heights["Tag"], self.widths["Monat"], self.heights["Tag"], farbe))
+         if tage_des_monats < 31:
+            seite.append(Flaeche(x, y1 - 31*self.heights["Tag"], self.widths["Monat"], (31-tage_des_monats)*self.heights["Tag"], FARBE_LEER))
+         # --- Feier- und Ferientage einfärben, soweit sie sich vom Wochenend-Hintergrund unterscheiden
+         log.debug("Gehe alle Tage des Monats %s durch", monatsname)
+         for tag, i in enumerate(tage_index, start=1):
+            flags = self.tagesflags[i]
+            farbe = tagesfarbe(flags)
+            if farbe != tagesfarbe(flags & (TAG_SAMSTAG | TAG_SONNTAG)):
+               seite.append(Flaeche(x, y1 - tag*self.heights["Tag"], self.widths["Monat"], self.heights["Tag"], farbe))
+         # --- statisches Raster darüber (Rahmen, Tagesnummern, Wochentage, Legendenrahmen) als Vorlagen
+         seite.append(Vorlage(self.vorlage_raster(layout, tage_des_monats), x))
+         seite.append(Vorlage(self.vorlage_wochentage(layout, erster_wtag), x))
+         for tag in range(TAGE_IM_FORM +1, tage_des_monats +1):
+            seite.append(Text(x + self.widths["Tag"] + (self.widths["Wochentag"]/2), self.y_tagestext(y1 - tag*self.heights["Tag"]),
+                              WOCHENTAGE_KURZ[(erster_wtag + tag - 1) % 7], self.fontsizes["spalte_wtag"], ausrichtung='mitte'))
+
+         seite.append(Text(x + self.widths["Monat"]/2, y1+(self.heights["Monat"] -self.fontsizes["monatsname"])/2 + self.fontsizes["monatsname"]*0.2,
+                           monatsname, self.fontsizes["monatsname"], ausrichtung='mitte'))
+
+         # --- Tage des Monats schreiben: Kalenderwoche, Tagestexte und Verweise auf die Fußnoten
+         for tag, i in enumerate(tage_index, start=1):
             y2 = self.ht - self.mgt - self.heights["Monat"] - (tag * self.heights["Tag"])
-            self.canv.setFillColorRGB(1,1,1)
-
-            # --- Einfärbung der Tageszeile + Tageszeile rahmen
-            is_feiertag = self.is_feiertag(dt_tag)
-            is_ferientag = self.is_ferientag(dt_tag)
-            is_sonntag = (dt_tag.weekday() == 6)
-            is_samstag = (dt_tag.weekday() == 5)
-            #print(f">>> {dt_tag.date()}: ", end= "..")
-            if is_feiertag or is_sonntag: # Sonn- und Feiertags
-               #print(f" ist Sonntag ({is_sonntag}) oder is_feiertag ({is_feiertag})")
-               self.canv.setFillColorRGB(1,224/255,104/255)
-            elif is_samstag: # samstags
-               #print(f" ist Samstag ({is_samstag})")
-               self.canv.setFillColorRGB(1,235/255,153/255)
-            elif is_ferientag:
-               #print(f" is_ferientag ({is_ferientag})")
-               self.canv.setFillColorRGB(218/255,1,163/255)
-            else:
-               pass
-               #print(" ")
-            self.canv.rect(x, y2, self.widths["Monat"], self.heights["Tag"], 1, 1)
-
-            self.canv.setFillColor(colors.black)
-            # --- Spalte Tagesnr.
-            self.canv.setFont(self.fontfms['default'], self.fontsizes["spalte_wtag"])
-            y_tage = y2 + (self.heights["Tag"] - self.fontsizes['spalte_wtag'])/2 + self.fontsizes["spalte_wtag"]*0.2
-            self.canv.drawRightString(x + self.widths["Tag"] - 2.5, y_tage, str(tag))
-            # --- Spalte Wochentag
-            self.canv.drawCentredString(x + self.widths["Tag"] + (self.widths["Wochentag"]/2), y_tage, wochentag)
             # --- Spalte Kalenderwoche
-            if dt_tag.weekday() == 0: # Kalenderwoche an jedem Montag anzeigen
-               kw = dt_tag.isocalendar().week
+            if self.skelett.wochentag[i] == 0: # Kalenderwoche an jedem Montag anzeigen
+               kw = self.skelett.kw[i]
                x_kw = x + self.widths["Monat"] - 2
                y_kw = y2 + (self.heights["Tag"] - self.fontsizes["spalte_kw"])/2 + self.fontsizes["spalte_kw"]*0.02
-               self.canv.setFont(self.fontfms["default"], self.fontsizes["spalte_kw"])
-               self.canv.drawRightString(x_kw, y_kw, str(kw))
+               seite.append(Text(x_kw, y_kw, str(kw), self.fontsizes["spalte_kw"], ausrichtung='rechts'))
             # --- Spalte Tagestexte
             x_termine = x + self.widths["Tag"] + self.widths["Wochentag"] + 2.5
-            self.canv.setFont(self.fontfms["default"], self.fontsizes["spalte_termine"])
-            y_termin = y2
-            #print(f"dt_tag: {dt_tag} <=> ")
-            if dt_tag.date() in self.ebd:
-               #print("Ja, der Termin existiert in events_by_day")
-               if 'tagestexte' in self.ebd[dt_tag.date()]:
-                  ht_z  = self.fontsizes["spalte_termine"]-0.5
-                  anz_t = len(self.ebd[dt_tag.date()]["tagestexte"])
-                  ht_t  = anz_t * ht_z
-                  y_termin = y2 + self.heights["Tag"]/2 + (anz_t-1)*ht_z/2 - ht_z/2 + 0.75
-                  # self.ebd[dt_tag.date()]["tagestexte"].sort()
-                  for termin in self.ebd[dt_tag.date()]["tagestexte"]:
-                     self.canv.drawString(x_termine, y_termin, f"{termin}")
-                     y_termin -= ht_z
+            if self.ebd[i]:
+               ht_z  = self.fontsizes["spalte_termine"]-0.5
+               zeilen = self.zeilen_einpassen(self.ebd[i], self.widths['Termintexte'] - 2.5, self.fontsizes["spalte_termine"], 4)
+               y_termin = y2 + self.heights["Tag"]/2 + (len(zeilen)-1)*ht_z/2 - ht_z/2 + 0.75
+               for zeile in zeilen:
+                  seite.append(Text(x_termine + zeile.einzug, y_termin, zeile.text, zeile.groesse))
+                  y_termin -= ht_z
             # --- Spalte Verweise auf Fußnoten in Legende
-            if dt_tag.date() in self.fbd:
-               if len(self.fbd[dt_tag.date()]) > 0:
-                  ht_z  = self.fontsizes["spalte_fussnoten"]-0.5
-                  anz_f = len(self.ebd[dt_tag.date()])
-                  ht_f  = anz_f * ht_z
-                  y_fn = y2 + self.heights["Tag"]/2# + (anz_f-1)*ht_z/2 - ht_z/2
-                  x_fn = x + self.widths["Tag"] + self.widths["Wochentag"] + self.widths['Termintexte'] + self.widths["Fussnote"]/2
-                  for fn in self.fbd[dt_tag.date()]:
-                     self.canv.drawCentredString(x_fn, y_fn, f"{fn}")
-                     y_fn -= ht_z
-                     
-
-            
-         # --- fehlende Tageszeilen bis zu 31 auffüllen
-         if tag < 31:
-            rest_ht = (31-tag)*self.heights["Tag"]
-            rest_y  = self.ht - self.mgt - self.heights["Monat"] - (31*self.heights["Tag"])
-            self.canv.setFillColorRGB(0.81, 0.81, 0.81)
-            self.canv.rect(x, rest_y, self.widths["Monat"], rest_ht, 1, 1)
-         
-         # --- Legende rahmen
-         self.canv.setFillColorRGB(0,0,0)
+            if self.fbd[i]:
+               ht_z  = self.fontsizes["spalte_fussnoten"]-0.5
+               y_fn = y2 + self.heights["Tag"]/2# + (anz_f-1)*ht_z/2 - ht_z/2
+               x_fn = x + self.widths["Tag"] + self.widths["Wochentag"] + self.widths['Termintexte'] + self.widths["Fussnote"]/2
+               for fn in self.fbd[i]:
+                  seite.append(Text(x_fn, y_fn, f"{fn}", self.fontsizes["spalte_fussnoten"], ausrichtung='mitte'))
+                  y_fn -= ht_z
+
+         # --- Legende schreiben
          x_legende = x + 2
          y_legende = self.ht - self.mgt - self.heights["Monat"] - (31*self.heights["Tag"]) - mm2pts(2.5)
-         self.canv.setFont(self.fontfms["default"], self.fontsizes["spalte_termine"])
-         self.canv.drawString(x_legende, y_legende, f'Legende: ')
-         ht_legende_rect = y_legende - self.mgb - mm2pts(1)
-         self.canv.rect(x, self.mgb, self.widths["Monat"], ht_legende_rect, 1, 0)
-         # --- Legende schreiben
-         #str_fbm_mon = f'monat{dt_tag.date().month}'
-         key_fbm = (dt_tag.date().year, dt_tag.date().month)
+         key_fbm = (jahr, monat)
          if len(self.fbm[key_fbm]) > 0:
             ht_z = self.fontsizes["legende"]
             y_legendenzeile = y_legende - 2*ht_z
-            for index, fn in enumerate(self.fbm[key_fbm], start=1):
-               self.canv.drawString(x_legende, y_legendenzeile, f'{index}: {fn['fn_summary']}')
+            # --- so viele Zeilen passen über den unteren Rand; überzählige Zeilen laufen wie bisher darüber hinaus
+            max_zeilen = int((y_legendenzeile - self.mgb - 2) // ht_z) + 1
+            texte = [f'{index}: {fn.text}' for index, fn in enumerate(self.fbm[key_fbm], start=1)]
+            for zeile in self.zeilen_einpassen(texte, self.widths["Monat"] - 4, self.fontsizes["spalte_termine"], max_zeilen,
+                                               haengend=True):
+               seite.append(Text(x_legende + zeile.einzug, y_legendenzeile, zeile.text, zeile.groesse))
                y_legendenzeile -= ht_z
 
-      
-      
-      # --- erzeugte Seite auf dem canvas-Objekt darstellen
-      self.canv.showPage()
+      return seite
 
-   # --- PDF-Datei speichern -------------------------------------------------------------------------------------
-   def pdf_save(self):
-      self.canv.save()
-   # --- PDF-Kopf schreiben --------------------------------------------------------------------------------------
-   def pdf_writeHeader(self, str_header='default_header', x_header=0, y_header=0, x_offset=10):
-      self.canv.setFont(self.fontfms['header'], self.fontsizes["header"])
-      self.canv.drawString(x_header + x_offset, y_header, str_header)
-      self.canv.setFont(self.fontfms['default'], self.fontsizes["header"])
-      self.canv.drawRightString(x_header + 3*self.widths["Monat"] - x_offset, y_header, f'{self.pgNo}. Halbjahr')
-      self.canv.setFont(self.fontfms['default'], self.fontsizes["default"])
+   # --- Vorlagen für das statische Raster einer Monatsspalte ------------------------------------------------------
+   #     Das Raster hängt nicht vom Monat oder Jahr ab, sondern nur vom Wochentag des 1. (Wochenenden, Wochentags-
+   #     namen: 7 Varianten für die Tage 1-28) und von der Anzahl der Tage (Rahmen, Tagesnummern: 4 Varianten). Jede
+   #     Variante wird pro Layout einmal berechnet und von allen passenden Monaten wiederverwendet (PDF: Form-XObject,
+   #     SVG: <use>); die Tage 29-31 werden direkt gezeichnet. Berechnet wird bei x = 0, die Spalte wird beim
+   #     Einsetzen verschoben.
+   def vorlage_hintergrund(self, layout: Layout, erster_wtag: int) -> str:
+      # --- Flächen: Kopfzeile und Wochenenden der Tage 1-28
+      def berechnen():
+         y1 = self.ht - self.mgt - self.heights["Monat"]
+         elemente = [Flaeche(0, y1, self.widths["Monat"], self.heights["Monat"], FARBE_MONAT)]
+         for tag in range(1, TAGE_IM_FORM +1):
+            farbe = WOCHENEND_FARBEN.get((erster_wtag + tag - 1) % 7)
+            if farbe:
+               elemente.append(Flaeche(0, y1 - tag*self.heights["Tag"], self.widths["Monat"], self.heights["Tag"], farbe))
+         return elemente
+      return layout.vorlage(f"jc_hg_{erster_wtag}", berechnen)
+
+   def vorlage_raster(self, layout: Layout, tage_des_monats: int) -> str:
+      # --- Linien und Texte: Rahmen der Kopf- und Tageszeilen, Tagesnummern, Legende mit Rahmen
+      def berechnen():
+         y1 = self.ht - self.mgt - self.heights["Monat"]
+         elemente = [Flaeche(0, y1, self.widths["Monat"], self.heights["Monat"], rahmen=True)]
+         for tag in range(1, tage_des_monats +1):
+            y2 = y1 - tag*self.heights["Tag"]
+            elemente.append(Flaeche(0, y2, self.widths["Monat"], self.heights["Tag"], rahmen=True))
+            elemente.append(Text(self.widths["Tag"] - 2.5, self.y_tagestext(y2), str(tag), self.fontsizes["spalte_wtag"],
+                                 ausrichtung='rechts'))
+         rest_y = y1 - 31*self.heights["Tag"]
+         if tage_des_monats < 31:
+            elemente.append(Flaeche(0, rest_y, self.widths["Monat"], (31-tage_des_monats)*self.heights["Tag"], rahmen=True))
+         y_legende = rest_y - mm2pts(2.5)
+         elemente.append(Text(2, y_legende, 'Legende: ', self.fontsizes["spalte_termine"]))
+         elemente.append(Flaeche(0, self.mgb, self.widths["Monat"], y_legende - self.mgb - mm2pts(1), rahmen=True))
+         return elemente
+      return layout.vorlage(f"jc_raster_{tage_des_monats}", berechnen)
+
+   def vorlage_wochentage(self, layout: Layout, erster_wtag: int) -> str:
+      # --- Wochentagsnamen der Tage 1-28
+      def berechnen():
+         y1 = self.ht - self.mgt - self.heights["Monat"]
+         return [Text(self.widths["Tag"] + (self.widths["Wochentag"]/2), self.y_tagestext(y1 - tag*self.heights["Tag"]),
+                      WOCHENTAGE_KURZ[(erster_wtag + tag - 1) % 7], self.fontsizes["spalte_wtag"], ausrichtung='mitte')
+                 for tag in range(1, TAGE_IM_FORM +1)]
+      return layout.vorlage(f"jc_wtage_{erster_wtag}", berechnen)
+
+   # --- Texte einer Zelle in die Breite einpassen: jeder Text bekommt eine Zeile, Zeilen, die bis max_zeilen frei
+   #     bleiben, dürfen die Texte der Reihe nach zum Umbrechen verwenden (haengend: Folgezeilen hinter "n: ")
+   def zeilen_einpassen(self, texte, breite: float, groesse: float, max_zeilen: int, haengend=False) -> list[Zeile]:
+      zeilen = []
+      frei = max(0, max_zeilen - len(texte))
+      for text in texte:
+         text = text.strip()
+         einzug = text_breite(text[:text.find(' ') +1], 'default', groesse) if haengend else 0.0
+         eingepasst = text_einpassen(text, breite, groesse, 1 + frei, einzug=einzug)
+         frei -= len(eingepasst) - 1
+         zeilen += eingepasst
+      return zeilen
+
+   def y_tagestext(self, y2):
+      return y2 + (self.heights["Tag"] - self.fontsizes['spalte_wtag'])/2 + self.fontsizes["spalte_wtag"]*0.2
+
+   # --- Kopf einer A4-Hälfte ------------------------------------------------------------------------------------
+   def layout_header(self, seite: list, str_header='default_header', x_header=0, y_header=0, x_offset=10):
+      seite.append(Text(x_header + x_offset, y_header, str_header, self.fontsizes["header"], 'header'))
+      seite.append(Text(x_header + 3*self.widths["Monat"] - x_offset, y_header, self.seiten_titel(),
+                        self.fontsizes["header"], ausrichtung='rechts'))
+
+   # --- Beschriftung der Seite aus ihren Monaten statt einer Seitennummer (mehrjährige Zeiträume, beliebiger
+   #     Startmonat), z.B. "September 2025 – Februar 2026" oder "Januar – Juni 2026"
+   def seiten_titel(self) -> str:
+      erster, letzter = self.skelett.monate[0], self.skelett.monate[-1]
+      if erster is letzter:
+         return f"{MONATSNAMEN[erster.monat-1]} {erster.jahr}"
+      if erster.jahr == letzter.jahr:
+         return f"{MONATSNAMEN[erster.monat-1]} – {MONATSNAMEN[letzter.monat-1]} {letzter.jahr}"
+      return f"{MONATSNAMEN[erster.monat-1]} {erster.jahr} – {MONATSNAMEN[letzter.monat-1]} {letzter.jahr}"
    
-   # --- PDF-Fuß schreiben ---------------------------------------------------------------------------------------
-   def pdf_writeFooter(self, mo=0, mgm_offset=0):
+   # --- Fuß einer A4-Hälfte -------------------------------------------------------------------------------------
+   def layout_footer(self, seite: list, mo=0, mgm_offset=0):
       jetzt = datetime.now().strftime("%d.%m.%Y - %H:%M:%S")
       y_footer = mm2pts(6)
       x_footer1 = self.mgl + mo*self.widths["Monat"] + mgm_offset
       x_footer2 = self.mgl + (mo+3)*self.widths["Monat"] + mgm_offset
-      self.canv.setFont(self.fontfms['default'], self.fontsizes["footer"])
-      self.canv.drawString(x_footer1, y_footer, f"Kalenderfeed: {self.feedurl[0:100]}")
-      self.canv.drawRightString(x_footer2, y_footer, f"erstellt am: {jetzt}")
-      self.canv.setFont(self.fontfms['default'], self.fontsizes["default"])
+      seite.append(Text(x_footer1, y_footer, f"Kalenderfeed: {self.feedurl[0:100]}", self.fontsizes["footer"]))
+      seite.append(Text(x_footer2, y_footer, f"erstellt am: {jetzt}", self.fontsizes["footer"], ausrichtung='rechts'))
 
 # ################################################################################################################
-# ### GUI-Aufbau #################################################################################################
+# ### Layout-Modell und Ausgaben (PDF über reportlab, SVG als Text) ##############################################
 # ################################################################################################################
-class App(ttkb.Window):
-   def __init__(self):
-      super().__init__(themename="darkly")
-      self.title("Jahreskalender v0.1a: Kalenderstream -> PDF-Jahreskalender")
-      #print(f'ICON_PATH = {ICON_PATH}')
-      if ICON_PATH.exists():
-         #print(f"ICON_PATH '{ICON_PATH}' exists")
-         self.iconbitmap(ICON_PATH)
-
-      wind_width    = 600
-      wind_height   = 260
-      wind_screenwd = self.winfo_screenwidth()
-      wind_screenht = self.winfo_screenheight()
-      wind_x        = (wind_screenwd // 2 ) - (wind_width // 2)
-      wind_y        = (wind_screenht // 2 ) - (wind_height // 2)
-      self.geometry(f"{wind_width}x{wind_height}+{wind_x}+{wind_y}")
-      self.resizable(False, False)
+#     Koordinaten in pt wie in der PDF: Ursprung links unten, y nach oben
+class Flaeche(NamedTuple):
+   x:        float
+   y:        float
+   breite:   float
+   hoehe:    float
+   fuellung: tuple | None = None  # RGB 0..1, None = nicht füllen
+   rahmen:   bool = False         # Umriss mit LINIENBREITE zeichnen
 
-      
+class Text(NamedTuple):
+   x:           float
+   y:           float              # Grundlinie
+   text:        str
+   groesse:     float
+   schrift:     str = 'default'    # Rolle, siehe SCHRIFTEN
+   ausrichtung: str = 'links'      # links, mitte oder rechts: x ist dann der Anfang, die Mitte bzw. das Ende
 
-      # --- Überschrift-Eingabe ----------------------------------------------------------------------------------
-      cur_y = 20
-      x1 = 20
-      x2 = 155
-      x3 = 460
-      lbl_header = ttkb.Label(self, text="Kalender-Überschrift:")
-      lbl_header.place(x=x1, y=cur_y)
-      self.header_var = ttkb.StringVar()
-      ent_header = ttkb.Entry(self, textvariable=self.header_var, width=62)
-      ent_header.place(x=x2, y=cur_y, width=430)
-      # --- URL-Eingabe ------------------------------------------------------------------------------------------
-      cur_y = 60
-      lbl_url = ttkb.Label(self, text="Kalender-URL (.ics):")
-      lbl_url.place(x=x1, y=cur_y)
-      self.url_var = ttkb.StringVar()
-      ent_url = ttkb.Entry(self, textvariable=self.url_var, width=62)
-      ent_url.place(x=x2, y=cur_y, width=x3-x2-10)
-      btn_checkurl = ttkb.Button(self, text="Verbindung prüfen", command=self.on_check)
-      btn_checkurl.place(x=x3, y=cur_y, width=125)
-      # --- Statuslabel -------------------------------------------------------------------------------------------
-      self.status = ttkb.Label(self, text="", foreground="grey")
-      self.status.place(x=x2, y=cur_y + 30)
-      # --- Startjahr --------------------------------------------------------------------------------------------
-      ttkb.Label(self, text="Startjahr / Startmonat:").place(x=x1, y=140)
-      self.year_var = ttkb.StringVar(value=str(dt.date.today().year))
-      year_values = [str(y) for y in range(2000,2100)]
-      cbx_year = ttkb.Combobox(self, textvariable=self.year_var, values=year_values, width=10)
-      cbx_year.place(x=x2, y=140)
-      self.update_idletasks()
-      # --- Startmonat -------------------------------------------------------------------------------------------
-      self.month_var = ttkb.StringVar(value=str(1))
-      month_values = [str(m) for m in range(1,13)]
-      cbx_month = ttkb.Combobox(self, textvariable=self.month_var, values=month_values, width=5)
-      cbx_month.place(x=cbx_year.winfo_x() + cbx_year.winfo_width() + 10, y=140)
-      # --- Buttons -----------------------------------------------------------------------------------------------
-      self.btn_pdf = ttkb.Button(self, text="PDF-Jahreskalender erstellen", command=self.on_pdf, state="disabled")
-      self.btn_pdf.place(x=20, y=190, width=560)
-      # --- INI-Daten laden ---------------------------------------------------------------------------------------
-      self.load_defaults()
-      if self.url_var.get().strip(): # falls URL hinterlegt ist --> automatisch prüfen
-         self.on_check()
-   
-   # --------------------------------------------------------------------------------------------------------------
-   # --- Methode: Voreinstellungen (Profile) laden aus .ini-Datei -------------------------------------------------
-   def load_defaults(self):
-      cfg = configparser.ConfigParser()
-      if INI_PATH.exists():
-         cfg.read(INI_PATH, encoding="utf-8") # INI-Daten einlesen
+class Vorlage(NamedTuple):
+   name: str
+   x:    float                     # Verschiebung nach rechts
+
+#     Eine Seite ist eine Liste aus Flaeche, Text und Vorlage in Zeichenreihenfolge; das Layout selbst hält nur
+#     Format und Vorlagen, die Seiten gehen einzeln an die Ausgaben (siehe JCal.ausgeben)
+class Layout:
+   __slots__ = ('breite', 'hoehe', 'vorlagen')
+
+   def __init__(self, breite: float, hoehe: float):
+      self.breite, self.hoehe = breite, hoehe
+      self.vorlagen = {}   # Name -> Liste aus Flaeche und Text, berechnet bei x = 0
+
+   # --- Vorlage beim ersten Gebrauch berechnen, danach nur den Namen liefern
+   def vorlage(self, name: str, berechnen) -> str:
+      if name not in self.vorlagen:
+         self.vorlagen[name] = berechnen()
+      return name
+
+# --- Ausgabedatei atomar schreiben: erst eine temporäre Datei im selben Verzeichnis, dann umbenennen; Leser (Web-
+#     server, Freigaben) sehen so immer die alte oder die neue Datei, nie eine halb geschriebene; das Verzeichnis
+#     (z.B. --outdir im Stapelbetrieb) wird bei Bedarf angelegt
+@contextlib.contextmanager
+def atomar(ziel: Path):
+   ziel.parent.mkdir(parents=True, exist_ok=True)
+   tmp = ziel.with_name(f".{ziel.name}.{os.getpid()}.tmp")
+   try:
+      yield tmp
+      os.replace(tmp, ziel)
+   finally:
+      tmp.unlink(missing_ok=True)
+
+def svg_pfad(fpath, seite: int) -> Path:
+   fpath = Path(fpath)
+   return fpath.with_name(f"{fpath.stem}_{seite}.svg")
+
+LINIENBREITE = 0.03
+SCHRIFTEN = {'default': 'Calibri', 'header': 'Calibri-Fett', 'footer': 'Calibri-Kursiv'} # Rolle -> Name in FONT_FACES
+SCHWARZ   = (0, 0, 0)
+
+# --- Textbreiten mit den Metriken der PDF-Schriften; die gleichen Texte (Feiertage, "Ferien", Serientermine)
+#     kommen an vielen Tagen und in vielen Aufträgen vor, daher wird jede Messung im Prozess zwischengespeichert
+@functools.lru_cache(maxsize=16384)
+def text_breite(text: str, schrift: str, groesse: float) -> float:
+   from reportlab.pdfbase.pdfmetrics import stringWidth
+   return stringWidth(text, register_fonts()[SCHRIFTEN[schrift]], groesse)
+
+MIN_SCHRIFT_ANTEIL = 0.8   # Texte werden höchstens auf 80 % der Schriftgröße verkleinert
+AUSLASSUNG = "…"
+
+class Zeile(NamedTuple):
+   text:    str
+   groesse: float
+   einzug:  float = 0.0      # Folgezeilen umbrochener Texte
+
+# --- einen Text in höchstens max_zeilen Zeilen der Breite einpassen: passt er nicht, wird er zuerst verkleinert,
+#     reicht das nicht, an Leerzeichen umbrochen (solange Zeilen frei sind) und die letzte Zeile verkleinert bzw.
+#     mit "…" gekürzt
+@functools.lru_cache(maxsize=4096)
+def text_einpassen(text: str, breite: float, groesse: float, max_zeilen=1, schrift='default',
+                   einzug=0.0) -> tuple[Zeile, ...]:
+   zeilen = []
+   while len(zeilen) < max_zeilen - 1 and text_breite(text, schrift, groesse) * MIN_SCHRIFT_ANTEIL > breite - (einzug if zeilen else 0):
+      teil, rest = _umbrechen(text, breite - (einzug if zeilen else 0), schrift, groesse)
+      if not teil:
+         break
+      zeilen.append(Zeile(teil, groesse, einzug if zeilen else 0.0))
+      text = rest
+   zeilen.append(_einzeilig(text, breite - (einzug if zeilen else 0), schrift, groesse, einzug if zeilen else 0.0))
+   return tuple(zeilen)
+
+def _umbrechen(text: str, breite: float, schrift: str, groesse: float) -> tuple[str, str]:
+   # --- so viele Wörter wie in die Zeile passen; passt schon das erste nicht, wird nicht umbrochen
+   woerter = text.split(" ")
+   n = 0
+   while n < len(woerter) and text_breite(" ".join(woerter[:n+1]), schrift, groesse) <= breite:
+      n += 1
+   return " ".join(woerter[:n]), " ".join(woerter[n:])
+
+def _einzeilig(text: str, breite: float, schrift: str, groesse: float, einzug: float) -> Zeile:
+   laenge = text_breite(text, schrift, groesse)
+   if laenge <= breite:
+      return Zeile(text, groesse, einzug)
+   kleiner = int(groesse * breite / laenge * 10) / 10
+   if kleiner >= groesse * MIN_SCHRIFT_ANTEIL:
+      return Zeile(text, kleiner, einzug)
+   # --- längster Anfang, der mit "…" in der kleinsten Größe passt (binäre Suche über die Zeichenzahl)
+   groesse = int(groesse * MIN_SCHRIFT_ANTEIL * 10) / 10
+   von, bis = 0, len(text)
+   while von < bis:
+      mitte = (von + bis + 1) // 2
+      if text_breite(text[:mitte].rstrip() + AUSLASSUNG, schrift, groesse) <= breite:
+         von = mitte
       else:
-         cfg["Settings"] = {}                 # leere INI-Daten anlegen
-      
-      sec = cfg.setdefault("Settings", {})
-      # Standardwerte
-      url    = sec.get("url",    "")
-      year   = sec.get("year",   str(dt.date.today().year))
-      month  = sec.get("month",  str(dt.date.today().month))
-      header = sec.get("header", "Jahreskalender")
-      # ins GUI übernehmen
-      self.url_var.set(url)
-      self.year_var.set(year)
-      self.month_var.set(month)
-      self.header_var.set(header)
-
-      # INI ggf. neu schreiben, falls sie nicht da ist
-      if not INI_PATH.exists():
-         with INI_PATH.open("w", encoding="utf-8") as f:
-            cfg.write(f)
-   def save_defaults(self):
-      cfg = configparser.ConfigParser()
-      cfg["Settings"] = {'url':    self.url_var.get().strip(),
-                         'year':   self.year_var.get().strip(),
-                         'month':  self.month_var.get().strip(),
-                         'header': self.header_var.get().strip()}
-      with INI_PATH.open("w", encoding="utf-8") as f:
-         cfg.write(f)
+         bis = mitte - 1
+   return Zeile(text[:von].rstrip() + AUSLASSUNG, groesse, einzug)
 
-   
-   # -------------------------------------------------
-   # Kalenderstream prüfen
-   def check_stream(self, url: str) -> tuple[bool, str | None]:
-      url = url.strip()
-      if url=="": return False, "Bitte geben Sie einen Link zum Kalenderstream ein."
-      try:
-         resp = requests.get(url, timeout=10)
-         resp.raise_for_status()
-         # sehr grobe Prüfung auf ics-Stream (kann je anch Quelle variieren)
-         if b"BEGIN:VCALENDAR" not in resp.content[:200]:
-            return False, "Das scheint kein gültiger iCalendar-Stream zu sein"
-         return True, None
-      except Exception as exc:
-         return False, str(exc)
-
-   # ----------------------------------------------------------------------------------------------------------
-   # --- EVENT-Handler --------------------------------------------------------------------------------------------
-   def on_check(self):
-      url = self.url_var.get().strip()
-      ok, statuserr = self.check_stream(url)
-      if ok:
-         self.status.config(text="Verbindung erfolgreich", foreground="green")
-         self.btn_pdf.config(state="normal")
+# --- PDF Seite für Seite schreiben: jede Seite wird gezeichnet, sobald sie berechnet ist; reportlab hält die
+#     fertigen Seiten (Inhaltsströme) bis schliessen() im Dokument, das Layout der Seite wird aber nicht mehr gebraucht
+#     kompakt: gleichartige Zeichenbefehle zusammenfassen (siehe zeichnen_kompakt) und die Seiten komprimieren
+class PdfSchreiber:
+   def __init__(self, layout: Layout, fpath, kompakt=False):
+      from reportlab.pdfgen import canvas
+      from reportlab import rl_config
+      self.layout  = layout
+      self.kompakt = kompakt
+      self.komprimiert = bool(kompakt or rl_config.pageCompression) # ohne kompakt: Voreinstellung von reportlab
+      self.fonts   = register_fonts()
+      self.canv    = canvas.Canvas(str(fpath), pagesize=(layout.breite, layout.hoehe), pageCompression=1 if kompakt else None)
+      self.texte   = {'links': self.canv.drawString, 'mitte': self.canv.drawCentredString, 'rechts': self.canv.drawRightString}
+      self.statistik = []   # je Seite Operatoren und Bytes des Inhalts, einschließlich der dort angelegten Vorlagen
+      self._vorlagen = [0, 0]
+
+   def seite(self, elemente):
+      if self.kompakt:
+         self.zeichnen_kompakt(elemente)
       else:
-         self.status.config(text=f"{statuserr}", foreground="red")
-         self.btn_pdf.config(state="disabled")
+         self.zeichnen(elemente)
+      operatoren, groesse = pdf_inhalt_zaehlen(self.canv._code, self.komprimiert)
+      self.statistik.append({'seite':      len(self.statistik) +1,
+                             'operatoren': operatoren + self._vorlagen[0],
+                             'bytes':      groesse + self._vorlagen[1]})
+      self._vorlagen = [0, 0]
+      self.canv.showPage()
 
-   def on_pdf(self):
-      url = self.url_var.get().strip()
-      self.save_defaults()
-      try:
-         jcal.parseEvents(self.month_var.get().strip(), self.year_var.get().strip(), url)
-         with tempfile.TemporaryDirectory() as tmpdir:
-            pdf_tmp = Path(tmpdir) / "jcal_tmp.pdf"
-            jcal.createPdf(pdf_tmp, self.header_var.get().strip())
-            
-            # --- Speichern-unter-Dialog
-            def_name = f"jahreskalender_{int(self.year_var.get())}_{int(self.month_var.get())}.pdf"
-            file_path = fd.asksaveasfilename(
-               parent=self,
-               title="Jahreskalender-PDF speichern unter ...",
-               defaultextension=".pdf",
-               initialfile=def_name,
-               filetypes=[("PDF-Datei", "*.pdf")])
-            if not file_path:
-               return
-            Path(file_path).write_bytes(pdf_tmp.read_bytes())
-            
-         
-         messagebox.showinfo("Fertig", f"PDF wurde erzeugt:\n{file_path}")
-         open_file(file_path)
-      except Exception as exc:
-         messagebox.showerror("Fehler", f"PDF-Erzeugung schlug fehl:\n{exc}")
+   def schliessen(self):
+      self.canv.save()
+
+   def vorlage(self, el: Vorlage, zeichnen):
+      canv = self.canv
+      if not canv.hasForm(el.name):
+         canv.beginForm(el.name)
+         zeichnen(self.layout.vorlagen[el.name])
+         operatoren, groesse = pdf_inhalt_zaehlen(canv._code, self.komprimiert)
+         self._vorlagen[0] += operatoren
+         self._vorlagen[1] += groesse
+         canv.endForm()
+      if el.x:
+         canv.saveState()
+         canv.translate(el.x, 0)
+         canv.doForm(el.name)
+         canv.restoreState()
+      else:
+         canv.doForm(el.name)
+
+   def zeichnen(self, elemente):
+      # --- Schrift und Füllfarbe nur bei Änderung setzen; jede Seite und jede Vorlage beginnt neu
+      canv = self.canv
+      schrift, farbe = None, None
+      canv.setLineWidth(LINIENBREITE)
+      for el in elemente:
+         if type(el) is Text:
+            if schrift != (el.schrift, el.groesse):
+               schrift = (el.schrift, el.groesse)
+               canv.setFont(self.fonts[SCHRIFTEN[el.schrift]], el.groesse)
+            if farbe != SCHWARZ:
+               farbe = SCHWARZ
+               canv.setFillColorRGB(*farbe)
+            self.texte[el.ausrichtung](el.x, el.y, el.text)
+         elif type(el) is Flaeche:
+            if el.fuellung is not None and farbe != el.fuellung:
+               farbe = el.fuellung
+               canv.setFillColorRGB(*farbe)
+            canv.rect(el.x, el.y, el.breite, el.hoehe, int(el.rahmen), int(el.fuellung is not None))
+         else:
+            self.vorlage(el, self.zeichnen)
+
+   # --- Läufe gleichartiger Elemente (bis zur nächsten Vorlage bzw. zum nächsten Wechsel der Art) gemeinsam
+   #     zeichnen: gefüllte Flächen je Farbe als ein Pfad, Rahmen als ein Pfad, Texte je Schrift in einem Text-
+   #     objekt (BT ... ET) statt je Text. Das Bild bleibt gleich: Texte sind alle schwarz, Rahmen alle gleich
+   #     breit, und eine Fläche wird nur dann mit früheren Flächen ihrer Farbe zusammengelegt, wenn sie keine
+   #     dazwischen gezeichnete Fläche anderer Farbe überdeckt (siehe flaechen_gruppieren)
+   def zeichnen_kompakt(self, elemente):
+      canv = self.canv
+      farbe = None
+      canv.setLineWidth(LINIENBREITE)
+      for art, lauf in itertools.groupby(_zeichenarten(elemente), key=lambda eintrag: eintrag[0]):
+         lauf = [el for _, el in lauf]
+         if art == 'vorlage':
+            for el in lauf:
+               self.vorlage(el, self.zeichnen_kompakt)
+         elif art == 'flaeche':
+            for fuellung, flaechen in flaechen_gruppieren(lauf):
+               if farbe != fuellung:
+                  farbe = fuellung
+                  canv.setFillColorRGB(*farbe)
+               canv.drawPath(self.pfad(flaechen), stroke=0, fill=1)
+         elif art == 'rahmen':
+            canv.drawPath(self.pfad(lauf), stroke=1, fill=0)
+         else:
+            if farbe != SCHWARZ:
+               farbe = SCHWARZ
+               canv.setFillColorRGB(*farbe)
+            textobjekt = canv.beginText()
+            schriften = defaultdict(list)
+            for el in lauf:
+               schriften[(el.schrift, el.groesse)].append(el)
+            for (schrift, groesse), texte in schriften.items():
+               textobjekt.setFont(self.fonts[SCHRIFTEN[schrift]], groesse)
+               for el in texte:
+                  x = el.x
+                  if el.ausrichtung != 'links':
+                     x -= text_breite(el.text, el.schrift, el.groesse) / (2 if el.ausrichtung == 'mitte' else 1)
+                  textobjekt.setTextOrigin(x, el.y)
+                  textobjekt.textOut(el.text)
+            canv.drawText(textobjekt)
+
+   def pfad(self, flaechen):
+      pfad = self.canv.beginPath()
+      for el in flaechen:
+         pfad.rect(el.x, el.y, el.breite, el.hoehe)
+      return pfad
+
+# --- Elemente nach Art für zeichnen_kompakt; eine Fläche mit Füllung und Rahmen zählt als beides
+def _zeichenarten(elemente):
+   for el in elemente:
+      if type(el) is Text:
+         yield 'text', el
+      elif type(el) is Flaeche:
+         if el.fuellung is not None:
+            yield 'flaeche', el
+         if el.rahmen:
+            yield 'rahmen', el
+      else:
+         yield 'vorlage', el
+
+# --- gefüllte Flächen eines Laufs zu (Farbe, Flächen) zusammenfassen, in Zeichenreihenfolge der Gruppen: eine Fläche
+#     kommt zur letzten Gruppe ihrer Farbe, außer eine spätere Gruppe anderer Farbe überlappt sie (dann neue Gruppe)
+def flaechen_gruppieren(flaechen) -> list[tuple]:
+   gruppen = []
+   for el in flaechen:
+      for fuellung, liste in reversed(gruppen):
+         if fuellung == el.fuellung:
+            liste.append(el)
+            break
+         if any(_ueberlappen(el, anderes) for anderes in liste):
+            gruppen.append((el.fuellung, [el]))
+            break
+      else:
+         gruppen.append((el.fuellung, [el]))
+   return gruppen
+
+def _ueberlappen(a: Flaeche, b: Flaeche, rand=0.01) -> bool:
+   return (a.x + rand < b.x + b.breite and b.x + rand < a.x + a.breite and
+           a.y + rand < b.y + b.hoehe  and b.y + rand < a.y + a.hoehe)
+
+# --- Operatoren und Größe eines Inhaltsstroms (bei Kompression: Größe nach zlib), ohne Text in Zeichenketten
+PDF_ZEICHENKETTE = re.compile(r"\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>")
+PDF_OPERATOR     = re.compile(r"(?<![^\s\]\[])[A-Za-z'\"][A-Za-z0-9*'\"]*(?![^\s\[\]])")
+
+def pdf_inhalt_zaehlen(code: list[str], komprimiert=False) -> tuple[int, int]:
+   import zlib
+   inhalt = "\n".join(code)
+   operatoren = len(PDF_OPERATOR.findall(PDF_ZEICHENKETTE.sub(" ", inhalt)))
+   daten = inhalt.encode("latin-1", "replace")
+   return operatoren, len(zlib.compress(daten)) if komprimiert else len(daten)
+
+# --- SVG einer Seite: Vorlagen als <g> in <defs>, eingesetzt mit <use>; Linien wie in PDF-Betrachtern immer
+#     genau 1 Bildschirmpixel breit (non-scaling-stroke), sonst verschwinden die 0,03 pt in der Übersicht
+SVG_ANKER = {'links': '', 'mitte': ' text-anchor="middle"', 'rechts': ' text-anchor="end"'}
+SVG_STIL  = ('.r{stroke:#000;stroke-width:1px;vector-effect:non-scaling-stroke}'
+             'text{font-family:Calibri,Carlito,sans-serif;fill:#000}.header{font-weight:bold}.footer{font-style:italic}')
+
+def _svg_zahl(wert: float) -> str:
+   return f"{wert:.2f}".rstrip("0").rstrip(".")
+
+def _svg_farbe(rgb) -> str:
+   return "#" + "".join(f"{round(anteil*255):02x}" for anteil in rgb)
+
+def render_svg(layout: Layout, seite: list) -> str:
+   from xml.sax.saxutils import escape
+   hoehe = layout.hoehe
+
+   def elemente(liste, zeilen):
+      for el in liste:
+         if type(el) is Text:
+            klasse = f' class="{el.schrift}"' if el.schrift != 'default' else ''
+            zeilen.append(f'<text x="{_svg_zahl(el.x)}" y="{_svg_zahl(hoehe - el.y)}" font-size="{_svg_zahl(el.groesse)}"'
+                          f'{klasse}{SVG_ANKER[el.ausrichtung]}>{escape(el.text)}</text>')
+         elif type(el) is Flaeche:
+            fuellung = _svg_farbe(el.fuellung) if el.fuellung is not None else "none"
+            klasse   = ' class="r"' if el.rahmen else ''
+            zeilen.append(f'<rect x="{_svg_zahl(el.x)}" y="{_svg_zahl(hoehe - el.y - el.hoehe)}" width="{_svg_zahl(el.breite)}" '
+                          f'height="{_svg_zahl(el.hoehe)}" fill="{fuellung}"{klasse}/>')
+         else:
+            zeilen.append(f'<use xlink:href="#{el.name}" x="{_svg_zahl(el.x)}"/>')
+
+   zeilen = [f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+             f'width="{_svg_zahl(pts2mm(layout.breite))}mm" height="{_svg_zahl(pts2mm(hoehe))}mm" '
+             f'viewBox="0 0 {_svg_zahl(layout.breite)} {_svg_zahl(hoehe)}">',
+             f'<style>{SVG_STIL}</style>', '<defs>']
+   for name in dict.fromkeys(el.name for el in seite if type(el) is Vorlage):
+      zeilen.append(f'<g id="{name}">')
+      elemente(layout.vorlagen[name], zeilen)
+      zeilen.append('</g>')
+   zeilen += ['</defs>', '<rect width="100%" height="100%" fill="#fff"/>']
+   elemente(seite, zeilen)
+   zeilen.append('</svg>')
+   return "\n".join(zeilen) + "\n"
+
+# ################################################################################################################
+# ### Kommandozeile und Stapelverarbeitung (ohne GUI: tkinter/ttkbootstrap werden hier nicht geladen) ############
+# ################################################################################################################
+# --- Profile aus einer INI-Datei (ein Abschnitt je Profil, Schlüssel wie in jcal.ini) oder einer JSON-Datei lesen
+def load_profiles(path) -> list[dict]:
+   path = Path(path)
+   if path.suffix.lower() == ".json":
+      daten = json.loads(path.read_text(encoding="utf-8"))
+      if isinstance(daten, dict): # {"name": {...}, ...} oder [{"name": ..., ...}, ...]
+         daten = [{'name': name, **profil} for name, profil in daten.items()]
+      return daten
+   cfg = configparser.ConfigParser(interpolation=None) # URLs enthalten gerne '%'
+   cfg.read(path, encoding="utf-8")
+   return [{'name': sec, **cfg[sec]} for sec in cfg.sections()]
+
+def complete_profile(profil: dict, outdir: Path = Path(".")) -> dict:
+   heute = dt.date.today()
+   profil = dict(profil)
+   profil.setdefault('name',   'jahreskalender')
+   profil.setdefault('year',   str(heute.year))
+   profil.setdefault('month',  str(heute.month))
+   profil.setdefault('header', 'Jahreskalender')
+   profil.setdefault('parser', 'stream')
+   for key in ('svg', 'kompakt'):
+      profil[key] = str(profil.get(key, False)).strip().lower() in ('1', 'true', 'yes', 'ja', 'on')
+   # --- Länge des Zeitraums: 'months' (Anzahl der Monate) oder 'until' (letzter Monat als JJJJ-MM), Standard 1 Jahr
+   if profil.get('until'):
+      bis_jahr, _, bis_monat = str(profil.pop('until')).strip().partition("-")
+      profil['months'] = (int(bis_jahr) - int(profil['year']))*12 + int(bis_monat) - int(profil['month']) + 1
+   profil['months'] = int(profil.get('months', 12))
+   if profil['months'] < 1:
+      raise ValueError(f"Profil {profil['name']}: der Zeitraum endet vor dem Startmonat")
+   TerminFilter.aus_profil(profil) # Filter und Rollen prüfen, bevor ein Auftrag startet
+   profil['land'] = bundesland(profil.get('land'))
+   profil.setdefault('url', "")
+   if profil.get('ferien_tabelle') and not profil['land']:
+      raise ValueError(f"Profil {profil['name']}: für die Ferientabelle fehlt das Bundesland (land)")
+   if not split_feeds(profil['url']) and not profil['land']:
+      raise ValueError(f"Profil {profil['name']}: weder Feed (url) noch Bundesland (land) angegeben")
+   profil['out'] = str(Path(outdir) / profil.get('out', f"{profil['name']}.pdf"))
+   return profil
+
+# --- Ferientabelle, die ein Lauf mit diesem Profil liest: angegeben oder ferien.csv neben dem Skript (wie in JCal)
+def ferien_tabelle_von(profil: dict) -> Path | None:
+   if not profil['land']:
+      return None
+   if profil.get('ferien_tabelle'):
+      return Path(profil['ferien_tabelle'])
+   return FERIEN_TABELLE if FERIEN_TABELLE.exists() else None
+
+# --- ein Profil abarbeiten: eigene JCal-Instanz je Auftrag, damit Prozesse/Aufträge nichts teilen --------------------
+def render_job(profil: dict) -> dict:
+   t0 = time.perf_counter()
+   ergebnis = {'name': profil['name'], 'out': profil['out'], 'ok': False, 'fehler': None,
+               'termine': 0, 'parse_s': 0.0, 'pdf_s': 0.0, 'svg': [], 'bericht': None}
+   # --- feed_stand: Inhalt je Feed, den der Aufrufer schon geladen hat (Render-Dienst); genau diese Version einlesen
+   cache = FeedCache(stand=profil['feed_stand']) if profil.get('feed_stand') else None
+   jcal = JCal(cache=cache, parser=profil['parser'], termin_filter=TerminFilter.aus_profil(profil), land=profil['land'],
+               ferien_tabelle=profil.get('ferien_tabelle'))
+   try:
+      if profil.get('store'):
+         jcal.store = EventStore(profil['store'])
+      jcal.parseEvents(profil['month'], profil['year'], profil['url'], profil['months'])
+      t1 = time.perf_counter()
+      termine = len(jcal.idx_termine)
+      # --- PDF und SVG (gleiches Layout, nur eine weitere Ausgabe) in einem Durchgang, Seite für Seite
+      dateien = jcal.ausgeben(Path(profil['out']), profil['header'], svg=profil['svg'], freigeben=True,
+                              kompakt=profil['kompakt'])
+      ergebnis.update(ok=True, termine=termine, parse_s=t1 - t0, pdf_s=time.perf_counter() - t1,
+                      svg=[str(datei) for datei in dateien])
+   except Exception as exc:
+      ergebnis['fehler'] = f"{type(exc).__name__}: {exc}"
+      log.debug("Fehler in Profil %s", profil['name'], exc_info=True)
+   finally:
+      if jcal.store is not None:
+         jcal.store.close()
+   ergebnis['sekunden'] = time.perf_counter() - t0
+   ergebnis['bericht']  = jcal.report()
+   return ergebnis
+
+def print_job(ergebnis: dict):
+   if ergebnis['ok']:
+      print(f"OK      {ergebnis['name']:<24} {ergebnis['termine']:>6} Termine   Einlesen {ergebnis['parse_s']:6.2f} s   "
+            f"PDF {ergebnis['pdf_s']:6.2f} s   gesamt {ergebnis['sekunden']:6.2f} s   -> {ergebnis['out']}"
+            + (f" (+ {len(ergebnis['svg'])} SVG)" if ergebnis['svg'] else ""))
+   else:
+      print(f"FEHLER  {ergebnis['name']:<24} {ergebnis['fehler']}")
+
+# --- Worker-Prozess vorbereiten: Protokoll einrichten (bei spawn erbt der Worker es nicht) und Schriften laden
+def _worker_init(verbose=0):
+   setup_logging(verbose)
+   register_fonts()
+
+def run_batch(profile: list[dict], jobs=None, verbose=0) -> list[dict]:
+   t0 = time.perf_counter()
+   ergebnisse = []
+   import multiprocessing
+   from concurrent.futures import ProcessPoolExecutor
+   # --- Schriften vor dem Start der Worker laden: bei fork() erben alle Worker die geparsten Fonts, sonst lädt sie
+   #     jeder Worker einmal beim Start (nicht bei jedem Auftrag)
+   if multiprocessing.get_start_method() == "fork":
+      register_fonts()
+   with ProcessPoolExecutor(max_workers=jobs, initializer=_worker_init, initargs=(verbose,)) as pool:
+      futures = [pool.submit(render_job, profil) for profil in profile]
+      for future in as_completed(futures):
+         ergebnisse.append(future.result())
+         print_job(ergebnisse[-1])
+   ok = sum(1 for e in ergebnisse if e['ok'])
+   print(f"{ok} von {len(ergebnisse)} Kalendern erstellt in {time.perf_counter() - t0:.2f} s "
+         f"(Summe der Einzelzeiten {sum(e['sekunden'] for e in ergebnisse):.2f} s)")
+   return ergebnisse
+
+# --- Überwachungsmodus: Feeds regelmäßig bedingt abfragen und nur geänderte Ausgaben neu schreiben ----------------
+#     Je Profil werden die Prüfsummen der Feeds und der Halbjahre (Seiten) gemerkt. Sind alle Feeds unverändert, wird
+#     nichts eingelesen; sonst wird eingelesen und die PDF nur geschrieben, wenn sich ein Halbjahr geändert hat, die
+#     SVG-Dateien nur für die geänderten Halbjahre. Fehlende Ausgabedateien werden immer neu geschrieben.
+def watch_job(profil: dict, zustand: dict, cache: FeedCache) -> list[int]:
+   feeds = split_feeds(profil['url'])
+   # --- eine geänderte Ferientabelle zählt wie ein geänderter Feed
+   tabelle = ferien_tabelle_von(profil)
+   if tabelle:
+      feeds.append(str(tabelle))
+   feed_digest = hashlib.sha1(b"".join(feed_pruefsumme(cache, url) for url in feeds)).hexdigest()
+   out  = Path(profil['out'])
+   seiten = range(1, -(-profil['months'] // MONATE_JE_SEITE) +1)
+   fehlt = {seite for seite in seiten if not out.exists() or (profil['svg'] and not svg_pfad(out, seite).exists())}
+   if feed_digest == zustand.get('feeds') and not fehlt:
+      log.info("%s: Feeds unverändert", profil['name'])
+      return []
+
+   jcal = JCal(cache=cache, parser=profil['parser'], termin_filter=TerminFilter.aus_profil(profil), land=profil['land'],
+               ferien_tabelle=profil.get('ferien_tabelle'))
+   try:
+      if profil.get('store'):
+         jcal.store = EventStore(profil['store'])
+      # --- Feeds kommen aus dem Speicher des Caches
+      jcal.parseEvents(profil['month'], profil['year'], profil['url'], profil['months'])
+      digests = jcal.seiten_digests(profil['header'])
+      alt = zustand.get('seiten') or []
+      geaendert = sorted({seite for seite in seiten if seite > len(alt) or digests[seite-1] != alt[seite-1]} | fehlt)
+      if geaendert:
+         jcal.ausgeben(out, profil['header'], svg=profil['svg'], svg_seiten=geaendert, kompakt=profil['kompakt'])
+   finally:
+      if jcal.store is not None:
+         jcal.store.close()
+   zustand.update(feeds=feed_digest, seiten=digests)
+   if not geaendert:
+      log.info("%s: Feeds geändert, Kalender unverändert", profil['name'])
+   return geaendert
+
+def watch(profile: list[dict], intervall: float, runden=None):
+   # --- eigener Cache ohne Höchstalter, damit jede Runde beim Server nachfragt
+   cache = FeedCache(max_age=0)
+   zustaende = {profil['name']: {} for profil in profile}
+   runde = 0
+   print(f"Überwache {len(profile)} Kalender alle {intervall:g} s (Abbruch mit Strg+C)", flush=True)
+   try:
+      while runden is None or runde < runden:
+         runde += 1
+         for profil in profile:
+            try:
+               geaendert = watch_job(profil, zustaende[profil['name']], cache)
+            except Exception as exc:
+               log.warning("%s: Aktualisierung fehlgeschlagen (%s: %s)", profil['name'], type(exc).__name__, exc)
+               log.debug("Fehler in Profil %s", profil['name'], exc_info=True)
+               continue
+            if geaendert:
+               seiten = ", ".join(str(seite) for seite in geaendert)
+               print(f"{datetime.now():%d.%m.%Y %H:%M:%S}  {profil['name']}: Seite {seiten} aktualisiert -> {profil['out']}",
+                     flush=True)
+         if runden is None or runde < runden:
+            time.sleep(intervall)
+   except KeyboardInterrupt:
+      pass
+
+# --- JSON-Bericht je Lauf (Profil, Ergebnis, Zeitabschnitte, Zähler), z.B. um Verschlechterungen zu finden --------
+def write_report(path, ergebnisse: list[dict]):
+   if not path:
+      return
+   bericht = {'erstellt': datetime.now().isoformat(timespec="seconds"), 'laeufe': ergebnisse}
+   Path(path).write_text(json.dumps(bericht, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
+
+# --- Startzeit messen: jeweils ein neuer Prozess bis zur ersten Ausgabe (Hilfe bzw. Fenster sichtbar) -------------
+def measure_startup(runs=5) -> dict:
+   import statistics
+   cmd = [sys.executable] if getattr(sys, "frozen", False) else [sys.executable, str(Path(__file__).resolve())]
+   def messen(*args):
+      zeiten = []
+      for _ in range(runs):
+         t0 = time.perf_counter()
+         proc = subprocess.Popen(cmd + list(args), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+         proc.stdout.readline()
+         zeiten.append(time.perf_counter() - t0)
+         proc.stdout.read()
+         if proc.wait() != 0:
+            return None
+      return statistics.median(zeiten)
+   return {'cli_help_s':  messen("--help"),
+           'gui_window_s': messen("--gui-startup"),
+           'import_s':     IMPORT_SECONDS}
+
+TERMINFILTER_SCHLUESSEL = ('kategorien', 'ohne_kategorien', 'summary', 'ohne_summary', 'ort', 'ohne_ort', 'rollen')
+
+def build_argparser() -> argparse.ArgumentParser:
+   ap = argparse.ArgumentParser(prog="jcal", description="Kalenderstream(s) -> PDF-Jahreskalender. Ohne Argumente startet die GUI.")
+   ap.add_argument("-f", "--feed",   action="append",
+                   help="Kalenderfeed: URL, lokale .ics- oder .ics.gz-Datei, file://-URL oder - für stdin; mehrfach möglich")
+   ap.add_argument("-m", "--month",  help="Startmonat (1-12), Standard: aktueller Monat")
+   ap.add_argument("-y", "--year",   help="Startjahr, Standard: aktuelles Jahr")
+   zeitraum = ap.add_mutually_exclusive_group()
+   zeitraum.add_argument("--months", type=int, metavar="N", help="Länge des Zeitraums in Monaten, je 6 Monate eine Seite (Standard: 12)")
+   zeitraum.add_argument("--until",  metavar="JJJJ-MM", help="letzter Monat des Zeitraums, z.B. 2027-08")
+   ap.add_argument("--header",       help="Kalender-Überschrift, {jahre} wird ersetzt (Standard: 'Jahreskalender')")
+   ap.add_argument("-o", "--out",    help="Ausgabedatei (PDF)")
+   ap.add_argument("--svg",          action="store_true", help="zusätzlich je Halbjahr eine SVG-Datei neben der PDF erzeugen (<name>_1.svg, <name>_2.svg, ...)")
+   ap.add_argument("--land",         metavar="KÜRZEL", help=f"eingebaute Feiertage dieses Bundeslandes ohne Feed ({', '.join(BUNDESLAENDER)})")
+   ap.add_argument("--ferien-tabelle", dest="ferien_tabelle", metavar="DATEI",
+                   help="Schulferien aus dieser Tabelle ('Land;Name;erster Tag;letzter Tag' je Zeile), braucht --land")
+   ap.add_argument("--kategorie",    action="append", dest="kategorien", metavar="KATEGORIE",
+                   help="nur Termine mit dieser Kategorie einlesen, mehrfach möglich (mindestens eine muss passen)")
+   ap.add_argument("--ohne-kategorie", action="append", dest="ohne_kategorien", metavar="KATEGORIE",
+                   help="Termine mit dieser Kategorie beim Einlesen verwerfen, mehrfach möglich")
+   ap.add_argument("--summary",      metavar="REGEX", help="nur Termine, deren Titel auf den regulären Ausdruck passt")
+   ap.add_argument("--ohne-summary", metavar="REGEX", help="Termine verwerfen, deren Titel auf den regulären Ausdruck passt")
+   ap.add_argument("--ort",          metavar="REGEX", help="nur Termine, deren Ort (LOCATION) auf den regulären Ausdruck passt")
+   ap.add_argument("--ohne-ort",     metavar="REGEX", help="Termine verwerfen, deren Ort auf den regulären Ausdruck passt")
+   ap.add_argument("--rolle",        action="append", dest="rollen", metavar="KATEGORIE=ROLLE",
+                   help="Rolle einer Kategorie: feiertag, ferien oder normal (Standard: Feiertag(e)=feiertag, Ferien=ferien)")
+   ap.add_argument("--kompakt",      action="store_true", help="kompakte PDF: Flächen je Farbe und Texte je Schrift zusammengefasst, Seiten komprimiert")
+   ap.add_argument("-b", "--batch",  metavar="DATEI", help="Profile aus INI- (ein Abschnitt je Profil) oder JSON-Datei parallel erzeugen")
+   ap.add_argument("-j", "--jobs",   type=int, default=None, help="Anzahl paralleler Prozesse im Stapelbetrieb (Standard: Anzahl CPUs)")
+   ap.add_argument("--outdir",       default=".", help="Verzeichnis für die Ausgabedateien im Stapelbetrieb")
+   ap.add_argument("--parser",       choices=("stream", "icalendar"), default=None, help="Parser für die Feeds (Standard: stream)")
+   ap.add_argument("--store",        nargs="?", const=str(STORE_PATH), metavar="DATEI",
+                   help=f"Termine in einer SQLite-Datei speichern und Feeds nur bei Änderungen neu einlesen (Standard: {STORE_PATH})")
+   ap.add_argument("--serve",        nargs="?", type=int, const=8377, metavar="PORT",
+                   help="lokalen HTTP-Dienst starten, der PDFs auf Anfrage erzeugt (Standard-Port: 8377, siehe jcal_server.py)")
+   ap.add_argument("--watch",        type=float, metavar="SEKUNDEN",
+                   help="Feeds in diesem Abstand abfragen und nur geänderte Halbjahre neu erzeugen (bis Strg+C)")
+   ap.add_argument("-v", "--verbose", action="count", default=0, help="Ausgaben beim Einlesen und Erzeugen anzeigen (-vv: jeder Termin)")
+   ap.add_argument("--report",       metavar="DATEI", help="Laufzeiten und Zähler jedes Laufs als JSON-Bericht speichern")
+   ap.add_argument("--startup-time", action="store_true", help="Startzeit von Kommandozeile und GUI messen und ausgeben")
+   ap.add_argument("--gui-startup",  action="store_true", help=argparse.SUPPRESS) # Fenster öffnen, melden, schließen
+   return ap
+
+def main(argv=None) -> int:
+   argv = sys.argv[1:] if argv is None else argv
+   if not argv:
+      setup_logging()
+      from jcal_gui import main as gui_main # GUI-Toolkit nur laden, wenn die GUI gebraucht wird
+      gui_main()
+      return 0
+
+   args = build_argparser().parse_args(argv)
+   setup_logging(args.verbose)
+   if args.gui_startup:
+      from jcal_gui import App
+      app = App()
+      app.update()
+      print(f"Fenster nach {time.perf_counter() - _T_START:.3f} s sichtbar", flush=True)
+      app.destroy()
+      return 0
+   if args.startup_time:
+      messung = measure_startup()
+      ms = lambda sek: f"{sek*1000:6.0f} ms" if sek is not None else "nicht verfügbar"
+      print("Startzeit (Median aus 5 Läufen, jeweils neuer Prozess):")
+      print(f"  Kommandozeile '--help':   {ms(messung['cli_help_s'])}")
+      print(f"  GUI bis Fenster sichtbar: {ms(messung['gui_window_s'])}")
+      print(f"  Import von jcal:          {ms(messung['import_s'])}")
+      return 0
+   if args.serve:
+      from jcal_server import serve # HTTP-Dienst nur laden, wenn er gebraucht wird
+      serve(args.serve, jobs=args.jobs)
+      return 0
+   if args.batch:
+      profile = []
+      for profil in load_profiles(args.batch):
+         if args.parser: profil['parser'] = args.parser
+         if args.store:  profil['store']  = args.store
+         if args.svg:    profil['svg']    = True
+         if args.kompakt: profil['kompakt'] = True
+         for key in ("land", "ferien_tabelle", *TERMINFILTER_SCHLUESSEL):
+            if getattr(args, key): profil[key] = getattr(args, key)
+         if args.months: profil['months'] = args.months
+         if args.until:  profil['until']  = args.until
+         try:
+            profile.append(complete_profile(profil, Path(args.outdir)))
+         except ValueError as exc:
+            build_argparser().error(f"Profil {profil.get('name')}: {exc}")
+      if args.watch:
+         watch(profile, args.watch)
+         return 0
+      ergebnisse = run_batch(profile, args.jobs, args.verbose)
+      write_report(args.report, ergebnisse)
+      return 0 if all(e['ok'] for e in ergebnisse) else 1
+
+   if not args.feed and not args.land:
+      build_argparser().error("bitte --feed, --land oder --batch angeben")
+   profil = {'url': list(args.feed or ())}
+   for key in ("month", "year", "header", "parser", "store", "svg", "kompakt", "months", "until", "land", "ferien_tabelle",
+               *TERMINFILTER_SCHLUESSEL):
+      if getattr(args, key): profil[key] = getattr(args, key)
+   try:
+      profil = complete_profile(profil)
+   except ValueError as exc:
+      build_argparser().error(str(exc))
+   profil['out'] = args.out or f"jahreskalender_{int(profil['year'])}_{int(profil['month'])}.pdf"
+   if args.watch:
+      watch([profil], args.watch)
+      return 0
+   ergebnis = render_job(profil)
+   print_job(ergebnis)
+   write_report(args.report, [ergebnis])
+   return 0 if ergebnis['ok'] else 1
+
+IMPORT_SECONDS = time.perf_counter() - _T_START
 
 if __name__ == "__main__":
-   jcal = JCal()
-   App().mainloop()
-   
\ No newline at end of file
+   sys.exit(main())
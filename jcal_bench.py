@@ -0,0 +1,252 @@
+from __future__ import annotations
+# Benchmarks für den Jahreskalender: synthetische Feeds erzeugen, über einen lokalen HTTP-Server (mit Latenz und
+# ETag) ausliefern und Laufzeit sowie Spitzenspeicher für Abruf, Einlesen, Fußnoten und PDF messen.
+#
+#   python jcal_bench.py                                  # Standardgrößen, Ergebnis in jcal_bench.json
+#   python jcal_bench.py -n 100 -n 200000 --latency 0.2   # eigene Größen und Latenz
+#   python jcal_bench.py --write-ics feed.ics -n 5000     # nur einen synthetischen Feed schreiben
+import argparse
+import datetime as dt
+from datetime import date, timedelta
+import hashlib
+import http.server
+import json
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+import jcal
+from jcal import JCal, FeedCache
+
+BENCH_SIZES   = (100, 1_000, 10_000, 50_000, 200_000) # Anzahl der Termine je Feed
+BENCH_LATENCY = 0.05                                  # Sekunden Wartezeit des Servers je Anfrage
+BENCH_REPEAT  = 3                                     # Zeitmessungen je Größe, gewertet wird die schnellste
+BENCH_OUT     = "jcal_bench.json"
+
+# ################################################################################################################
+# ### Synthetische Feeds ##########################################################################################
+# ################################################################################################################
+# --- Terminarten mit Anteil: (Name, Gewicht); verteilt über zwei Jahre rund um den Kalenderzeitraum, damit auch
+#     der Vorfilter des Parsers etwas zu verwerfen hat
+TERMINARTEN = (("termin", 50), ("ganztaegig", 18), ("mehrtaegig", 12), ("monatswechsel", 5),
+               ("mehrtaegig_mZ", 5), ("feiertag", 5), ("ferien", 5))
+
+def generate_ics(anzahl: int, start_year: int, start_month: int = 8, seed: int = 1) -> bytes:
+   rnd    = random.Random(seed)
+   beginn = date(start_year, start_month, 1) - timedelta(days=180)
+   tage   = 2 * 365
+   arten, gewichte = zip(*TERMINARTEN)
+   zeilen = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//jcal//bench//DE", "CALSCALE:GREGORIAN"]
+   for nr, art in enumerate(rnd.choices(arten, gewichte, k=anzahl)):
+      tag = beginn + timedelta(days=rnd.randrange(tage))
+      kategorien = None
+      if art == "termin":
+         std, dauer = rnd.randrange(7, 20), rnd.choice((30, 45, 60, 90, 120))
+         anfang = dt.datetime.combine(tag, dt.time(std, rnd.choice((0, 15, 30, 45))))
+         ende   = anfang + timedelta(minutes=dauer)
+         dtstart = f"DTSTART;TZID=Europe/Berlin:{anfang:%Y%m%dT%H%M%S}"
+         dtend   = f"DTEND;TZID=Europe/Berlin:{ende:%Y%m%dT%H%M%S}"
+         summary = f"Termin {nr} " + rnd.choice(("Konferenz", "Elternabend", "Klassenarbeit", "Fachschaft", "AG"))
+      elif art == "mehrtaegig_mZ":
+         anfang = dt.datetime.combine(tag, dt.time(rnd.randrange(8, 16)))
+         ende   = anfang + timedelta(days=rnd.randrange(1, 4), hours=rnd.randrange(0, 6))
+         dtstart = f"DTSTART:{anfang:%Y%m%dT%H%M%S}Z"
+         dtend   = f"DTEND:{ende:%Y%m%dT%H%M%S}Z"
+         summary = f"Fahrt {nr}"
+      else:
+         if art == "monatswechsel":   # beginnt in den letzten Tagen eines Monats und endet im nächsten
+            tag   = (tag.replace(day=1) + timedelta(days=32)).replace(day=1) - timedelta(days=rnd.randrange(1, 5))
+            dauer = rnd.randrange(3, 10)
+         elif art == "mehrtaegig":
+            dauer = rnd.randrange(2, 8)
+         elif art == "ferien":
+            dauer = rnd.randrange(5, 15)
+            kategorien = "Ferien"
+         elif art == "feiertag":
+            dauer = 1
+            kategorien = "Feiertag"
+         else:
+            dauer = 1
+         dtstart = f"DTSTART;VALUE=DATE:{tag:%Y%m%d}"
+         dtend   = f"DTEND;VALUE=DATE:{tag + timedelta(days=dauer):%Y%m%d}"
+         summary = {"ferien": f"Ferien {nr}", "feiertag": f"Feiertag {nr}"}.get(
+                    art, f"Projekt {nr}, mit einem längeren Titel\\, der über die Zeilenbreite hinausgeht")
+      zeilen += ["BEGIN:VEVENT", f"UID:bench-{seed}-{nr}@jcal", "DTSTAMP:20240101T000000Z", dtstart, dtend,
+                 f"SUMMARY:{summary}"]
+      if kategorien:
+         zeilen.append(f"CATEGORIES:{kategorien}")
+      if nr % 10 == 0:                # gelegentlich ein VALARM, den der Parser überspringen muss
+         zeilen += ["BEGIN:VALARM", "ACTION:DISPLAY", "TRIGGER:-PT15M", "DESCRIPTION:Erinnerung", "END:VALARM"]
+      zeilen.append("END:VEVENT")
+   zeilen.append("END:VCALENDAR")
+   return "".join(_falten(zeile) + "\r\n" for zeile in zeilen).encode("utf-8")
+
+def _falten(zeile: str) -> str:
+   # --- Zeilen nach RFC 5545 nach 75 Bytes falten (Folgezeilen beginnen mit einem Leerzeichen)
+   daten = zeile.encode("utf-8")
+   if len(daten) <= 75:
+      return zeile
+   teile, pos, breite = [], 0, 75
+   while pos < len(daten):
+      ende = min(pos + breite, len(daten))
+      while ende < len(daten) and (daten[ende] & 0xC0) == 0x80: # nicht mitten in einem UTF-8-Zeichen trennen
+         ende -= 1
+      teile.append(daten[pos:ende].decode("utf-8"))
+      pos, breite = ende, 74
+   return "\r\n ".join(teile)
+
+# ################################################################################################################
+# ### Lokaler Feed-Server (Ersatz für den echten Kalenderserver) ###################################################
+# ################################################################################################################
+class FeedHandler(http.server.BaseHTTPRequestHandler):
+   def do_GET(self):
+      server = self.server
+      time.sleep(server.latency)
+      feed = server.feeds.get(self.path)
+      if feed is None:
+         self.send_error(404)
+         return
+      body, etag = feed
+      with server.lock:
+         server.anfragen += 1
+      if self.headers.get("If-None-Match") == etag:
+         self.send_response(304)
+         self.send_header("ETag", etag)
+         self.end_headers()
+         return
+      self.send_response(200)
+      self.send_header("Content-Type", "text/calendar; charset=utf-8")
+      self.send_header("Content-Length", str(len(body)))
+      self.send_header("ETag", etag)
+      self.end_headers()
+      self.wfile.write(body)
+
+   def log_message(self, *args):
+      pass
+
+class FeedServer(http.server.ThreadingHTTPServer):
+   daemon_threads = True
+
+   def __init__(self, latency=BENCH_LATENCY, host="127.0.0.1", port=0):
+      super().__init__((host, port), FeedHandler)
+      self.latency  = latency
+      self.feeds    = {}   # Pfad -> (Inhalt, ETag)
+      self.lock     = threading.Lock()
+      self.anfragen = 0
+
+   def add_feed(self, name: str, body: bytes) -> str:
+      self.feeds[f"/{name}"] = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+      return f"http://{self.server_address[0]}:{self.server_address[1]}/{name}"
+
+   def __enter__(self):
+      threading.Thread(target=self.serve_forever, daemon=True).start()
+      return self
+
+   def __exit__(self, *exc):
+      self.shutdown()
+      self.server_close()
+
+# ################################################################################################################
+# ### Messungen ###################################################################################################
+# ################################################################################################################
+# --- ein Lauf: kalter Abruf, Abruf mit 304, Einlesen (Feed aus dem Speicher), Fußnoten neu aufbauen, PDF erzeugen
+def bench_lauf(url: str, start_month: int, start_year: int, cache_dir: Path, pdf: Path, speicher=False) -> dict:
+   stufen = {}
+   def messen(name, funktion):
+      if speicher:
+         tracemalloc.reset_peak()
+         basis = tracemalloc.get_traced_memory()[0]
+      t0 = time.perf_counter()
+      ergebnis = funktion()
+      stufen[name] = {'sekunden': time.perf_counter() - t0}
+      if speicher:
+         aktuell, peak = tracemalloc.get_traced_memory()
+         stufen[name]['peak_kb']     = round((peak - basis) / 1024)
+         stufen[name]['behalten_kb'] = round((aktuell - basis) / 1024)   # nach der Stufe noch belegt
+      return ergebnis
+
+   cache = FeedCache(cache_dir=cache_dir, max_age=0, mem_ttl=0)
+   messen('abruf', lambda: cache.fetch(url))
+   messen('abruf_304', lambda: cache.fetch(url))
+   kalender = JCal(cache=FeedCache(cache_dir=cache_dir, max_age=3600)) # Feed frisch genug: kein Netz beim Einlesen
+   messen('einlesen', lambda: kalender.parseEvents(start_month, start_year, url))
+   zaehler = kalender.metriken.report()['zaehler']   # vor dem erneuten Aufbau der Fußnoten, der sie sonst doppelt zählt
+   win_von = date(start_year, start_month, 1)
+   messen('fussnoten', lambda: kalender.build_window(win_von, win_von.replace(year=win_von.year + 1)))
+   messen('pdf', lambda: kalender.createPdf(pdf, "Benchmark {jahre}"))
+   return {'stufen': stufen, 'spans': kalender.report()['spans'], 'zaehler': zaehler}
+
+def bench_groesse(server: FeedServer, anzahl: int, start_month: int, start_year: int, repeat: int, arbeitsdir: Path) -> dict:
+   body = generate_ics(anzahl, start_year, start_month)
+   url  = server.add_feed(f"bench_{anzahl}.ics", body)
+   laeufe = []
+   for lauf in range(repeat):
+      laeufe.append(bench_lauf(url, start_month, start_year, arbeitsdir / f"cache_{anzahl}_{lauf}", arbeitsdir / "bench.pdf"))
+   # --- Spitzenspeicher in einem eigenen Lauf, da tracemalloc die Zeitmessung stark verfälscht
+   tracemalloc.start()
+   try:
+      mit_speicher = bench_lauf(url, start_month, start_year, arbeitsdir / f"cache_{anzahl}_mem", arbeitsdir / "bench.pdf", True)
+   finally:
+      tracemalloc.stop()
+   stufen = {name: {'sekunden': round(min(lauf['stufen'][name]['sekunden'] for lauf in laeufe), 6),
+                    'sekunden_alle': [round(lauf['stufen'][name]['sekunden'], 6) for lauf in laeufe],
+                    'peak_kb': werte['peak_kb'], 'behalten_kb': werte['behalten_kb']}
+             for name, werte in mit_speicher['stufen'].items()}
+   # --- Speicher des eingelesenen Modells (ohne den im Feed-Cache gehaltenen Feed) je 10.000 Termine im Zeitraum
+   im_zeitraum = mit_speicher['zaehler'].get('termine_im_zeitraum', 0)
+   modell_kb   = stufen['einlesen']['behalten_kb'] - len(body) / 1024
+   return {'termine': anzahl, 'bytes': len(body), 'stufen': stufen,
+           'kb_je_10k_termine': round(modell_kb * 10000 / im_zeitraum) if im_zeitraum else None,
+           'spans': laeufe[-1]['spans'], 'zaehler': laeufe[-1]['zaehler']}
+
+def print_groesse(ergebnis: dict):
+   stufen = "   ".join(f"{name} {werte['sekunden']*1000:8.1f} ms / {werte['peak_kb']:>7} KB"
+                        for name, werte in ergebnis['stufen'].items())
+   print(f"{ergebnis['termine']:>7} Termine {ergebnis['bytes']/1024:8.0f} KB   {stufen}   "
+         f"Modell {ergebnis['kb_je_10k_termine']} KB je 10k Termine", flush=True)
+
+def run_benchmarks(sizes=BENCH_SIZES, latency=BENCH_LATENCY, repeat=BENCH_REPEAT, start_month=8, start_year=2024) -> dict:
+   jcal.setup_logging()
+   ergebnisse = []
+   with tempfile.TemporaryDirectory(prefix="jcal_bench_") as tmp, FeedServer(latency) as server:
+      for anzahl in sizes:
+         ergebnisse.append(bench_groesse(server, anzahl, start_month, start_year, repeat, Path(tmp)))
+         print_groesse(ergebnisse[-1])
+      anfragen = server.anfragen
+   return {'erstellt':   dt.datetime.now().isoformat(timespec="seconds"),
+           'python':     sys.version.split()[0],
+           'plattform':  platform.platform(),
+           'parameter':  {'latency': latency, 'repeat': repeat, 'start_month': start_month, 'start_year': start_year},
+           'anfragen':   anfragen,
+           'ergebnisse': ergebnisse}
+
+# ################################################################################################################
+# ### Kommandozeile ###############################################################################################
+# ################################################################################################################
+def main(argv=None) -> int:
+   ap = argparse.ArgumentParser(prog="jcal_bench", description="Benchmarks für Abruf, Einlesen, Fußnoten und PDF des Jahreskalenders")
+   ap.add_argument("-n", "--size",    type=int, action="append", help=f"Anzahl der Termine im Feed, mehrfach möglich (Standard: {', '.join(map(str, BENCH_SIZES))})")
+   ap.add_argument("--latency",       type=float, default=BENCH_LATENCY, help="Wartezeit des Servers je Anfrage in Sekunden")
+   ap.add_argument("-r", "--repeat",  type=int, default=BENCH_REPEAT, help="Zeitmessungen je Größe (gewertet wird die schnellste)")
+   ap.add_argument("-m", "--month",   type=int, default=8, help="Startmonat des Kalenders")
+   ap.add_argument("-y", "--year",    type=int, default=2024, help="Startjahr des Kalenders")
+   ap.add_argument("-o", "--out",     default=BENCH_OUT, help="Ergebnisdatei (JSON)")
+   ap.add_argument("--write-ics",     metavar="DATEI", help="nur einen synthetischen Feed (erste Größe) schreiben und beenden")
+   args = ap.parse_args(argv)
+   sizes = args.size or BENCH_SIZES
+
+   if args.write_ics:
+      Path(args.write_ics).write_bytes(generate_ics(sizes[0], args.year, args.month))
+      return 0
+   ergebnis = run_benchmarks(sizes, args.latency, args.repeat, args.month, args.year)
+   Path(args.out).write_text(json.dumps(ergebnis, indent=2, ensure_ascii=False), encoding="utf-8")
+   print(f"Ergebnis gespeichert in {args.out}")
+   return 0
+
+if __name__ == "__main__":
+   sys.exit(main())
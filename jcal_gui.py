@@ -0,0 +1,301 @@
+from __future__ import annotations
+# Benutzeroberfläche des Jahreskalenders (wird nur für die GUI geladen, die Kommandozeile kommt ohne tkinter aus)
+from tkinter import ttk, messagebox, filedialog as fd
+import ttkbootstrap as ttkb
+from ttkbootstrap.icons import Icon
+import configparser
+import re
+
+from pathlib import Path
+import datetime as dt
+import tempfile
+import queue
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from jcal import JCal, Abgebrochen, INI_PATH, ICON_PATH, FEED_WORKERS, split_feeds, pruefe_feed, open_file
+
+FORTSCHRITT = {'feeds':   "Feeds geladen",        # Texte für die Fortschrittsmeldungen von JCal.melde()
+               'termine': "Termine eingelesen",
+               'monate':  "Monate gezeichnet",
+               'seiten':  "Seiten gezeichnet"}
+
+# --- die Eingabezeile hält mehrere Feeds durch Leerzeichen getrennt; getrennt wird nur vor einer weiteren URL, damit
+#     lokale Pfade und file://-URLs Leerzeichen enthalten dürfen (in der INI steht ein Feed je Zeile)
+def feeds_der_zeile(zeile: str) -> list[str]:
+   return split_feeds(re.split(r"\s+(?=(?:https?|webcal|file)://)", zeile.strip()))
+
+# ################################################################################################################
+# ### GUI-Aufbau #################################################################################################
+# ################################################################################################################
+class App(ttkb.Window):
+   def __init__(self):
+      super().__init__(themename="darkly")
+      self.jcal = JCal()
+      # --- Prüfen und PDF-Erzeugung laufen in Worker-Threads; Ergebnisse und Fortschritt kommen über die Queue
+      #     zurück in die Tk-Schleife (Tk-Widgets dürfen nur aus dem Hauptthread angefasst werden)
+      self.worker = ThreadPoolExecutor(max_workers=2, thread_name_prefix="jcal")
+      self.queue  = queue.Queue()
+      self.jobs   = {}   # Art ('check'/'pdf') -> (Auftragsschlüssel, Abbruch-Event, Future)
+      self.protocol("WM_DELETE_WINDOW", self.on_close)
+      self.title("Jahreskalender v0.1a: Kalenderstream -> PDF-Jahreskalender")
+      #print(f'ICON_PATH = {ICON_PATH}')
+      if ICON_PATH.exists():
+         #print(f"ICON_PATH '{ICON_PATH}' exists")
+         self.iconbitmap(ICON_PATH)
+
+      wind_width    = 600
+      wind_height   = 260
+      wind_screenwd = self.winfo_screenwidth()
+      wind_screenht = self.winfo_screenheight()
+      wind_x        = (wind_screenwd // 2 ) - (wind_width // 2)
+      wind_y        = (wind_screenht // 2 ) - (wind_height // 2)
+      self.geometry(f"{wind_width}x{wind_height}+{wind_x}+{wind_y}")
+      self.resizable(False, False)
+
+      
+
+      # --- Überschrift-Eingabe ----------------------------------------------------------------------------------
+      cur_y = 20
+      x1 = 20
+      x2 = 155
+      x3 = 460
+      lbl_header = ttkb.Label(self, text="Kalender-Überschrift:")
+      lbl_header.place(x=x1, y=cur_y)
+      self.header_var = ttkb.StringVar()
+      ent_header = ttkb.Entry(self, textvariable=self.header_var, width=62)
+      ent_header.place(x=x2, y=cur_y, width=430)
+      # --- URL-Eingabe ------------------------------------------------------------------------------------------
+      cur_y = 60
+      lbl_url = ttkb.Label(self, text="Kalender-URL(s) (.ics):")
+      lbl_url.place(x=x1, y=cur_y)
+      self.url_var = ttkb.StringVar()
+      ent_url = ttkb.Entry(self, textvariable=self.url_var, width=62)
+      ent_url.place(x=x2, y=cur_y, width=x3-x2-10)
+      btn_checkurl = ttkb.Button(self, text="Verbindung prüfen", command=self.on_check)
+      btn_checkurl.place(x=x3, y=cur_y, width=125)
+      # --- Statuslabel -------------------------------------------------------------------------------------------
+      self.status = ttkb.Label(self, text="", foreground="grey")
+      self.status.place(x=x2, y=cur_y + 30)
+      # --- Startjahr --------------------------------------------------------------------------------------------
+      ttkb.Label(self, text="Startjahr / Startmonat:").place(x=x1, y=140)
+      self.year_var = ttkb.StringVar(value=str(dt.date.today().year))
+      year_values = [str(y) for y in range(2000,2100)]
+      cbx_year = ttkb.Combobox(self, textvariable=self.year_var, values=year_values, width=10)
+      cbx_year.place(x=x2, y=140)
+      self.update_idletasks()
+      # --- Startmonat -------------------------------------------------------------------------------------------
+      self.month_var = ttkb.StringVar(value=str(1))
+      month_values = [str(m) for m in range(1,13)]
+      cbx_month = ttkb.Combobox(self, textvariable=self.month_var, values=month_values, width=5)
+      cbx_month.place(x=cbx_year.winfo_x() + cbx_year.winfo_width() + 10, y=140)
+      # --- Buttons -----------------------------------------------------------------------------------------------
+      self.btn_pdf = ttkb.Button(self, text="PDF-Jahreskalender erstellen", command=self.on_pdf, state="disabled")
+      self.btn_pdf.place(x=20, y=190, width=x3-20-10)
+      self.btn_cancel = ttkb.Button(self, text="Abbrechen", command=self.on_cancel, state="disabled", bootstyle="secondary")
+      self.btn_cancel.place(x=x3, y=190, width=125)
+      # --- INI-Daten laden ---------------------------------------------------------------------------------------
+      self.load_defaults()
+      if self.url_var.get().strip(): # falls URL hinterlegt ist --> automatisch prüfen, sobald das Fenster steht
+         self.after(100, self.on_check)
+      self.after(50, self.poll_queue)
+   
+   # --------------------------------------------------------------------------------------------------------------
+   # --- Methode: Voreinstellungen (Profile) laden aus .ini-Datei -------------------------------------------------
+   def load_defaults(self):
+      cfg = configparser.ConfigParser()
+      if INI_PATH.exists():
+         cfg.read(INI_PATH, encoding="utf-8") # INI-Daten einlesen
+      else:
+         cfg["Settings"] = {}                 # leere INI-Daten anlegen
+      
+      sec = cfg.setdefault("Settings", {})
+      # Standardwerte
+      url    = sec.get("url",    "")
+      year   = sec.get("year",   str(dt.date.today().year))
+      month  = sec.get("month",  str(dt.date.today().month))
+      header = sec.get("header", "Jahreskalender")
+      # ins GUI übernehmen
+      self.url_var.set(" ".join(split_feeds(url)))
+      self.year_var.set(year)
+      self.month_var.set(month)
+      self.header_var.set(header)
+
+      # INI ggf. neu schreiben, falls sie nicht da ist
+      if not INI_PATH.exists():
+         with INI_PATH.open("w", encoding="utf-8") as f:
+            cfg.write(f)
+   def save_defaults(self):
+      cfg = configparser.ConfigParser()
+      cfg["Settings"] = {'url':    "\n".join(feeds_der_zeile(self.url_var.get())),
+                         'year':   self.year_var.get().strip(),
+                         'month':  self.month_var.get().strip(),
+                         'header': self.header_var.get().strip()}
+      with INI_PATH.open("w", encoding="utf-8") as f:
+         cfg.write(f)
+
+   
+   # -------------------------------------------------
+   # Kalenderstream prüfen
+   def check_stream(self, url: str, abbruch: threading.Event | None = None) -> tuple[bool, str | None]:
+      url = url.strip()
+      if url=="": return False, "Bitte geben Sie einen Link zum Kalenderstream ein."
+      # --- jeder Stream wird nach den ersten Kilobytes geprüft; die geladenen Feeds bleiben im Prozess gespeichert,
+      #     damit parseEvents sie ohne zweiten Abruf verwenden kann (lokale Dateien werden nur angelesen)
+      feeds = feeds_der_zeile(url)
+      with ThreadPoolExecutor(max_workers=min(FEED_WORKERS, len(feeds))) as pool:
+         futures = {feed: pool.submit(pruefe_feed, self.jcal.cache, feed) for feed in feeds}
+         for feed, future in futures.items():
+            try:
+               future.result()
+            except Exception as exc:
+               return False, (f"{feed[0:60]}: {exc}" if len(feeds) > 1 else str(exc))
+            if abbruch is not None and abbruch.is_set():
+               raise Abgebrochen("check")
+      return True, None
+
+   # ----------------------------------------------------------------------------------------------------------
+   # --- Hintergrundaufträge ------------------------------------------------------------------------------------
+   #     Ein Auftrag je Art: ein erneuter Klick mit denselben Eingaben wird zusammengefasst (der laufende Auftrag
+   #     genügt), bei geänderten Eingaben wird der laufende abgebrochen und der neue gestartet.
+   def start_job(self, art: str, schluessel: tuple, auftrag) -> bool:
+      laufend = self.jobs.get(art)
+      if laufend and not laufend[2].done():
+         if laufend[0] == schluessel:
+            return False
+         laufend[1].set()
+      abbruch = threading.Event()
+      future  = self.worker.submit(self._run_job, art, abbruch, auftrag)
+      self.jobs[art] = (schluessel, abbruch, future)
+      self.btn_cancel.config(state="normal")
+      return True
+
+   def _run_job(self, art: str, abbruch: threading.Event, auftrag):
+      # --- läuft im Worker-Thread: nur über die Queue mit der GUI sprechen
+      melden = lambda stufe, erledigt, gesamt: self.queue.put(('progress', art, abbruch, (stufe, erledigt, gesamt)))
+      try:
+         self.queue.put(('done', art, abbruch, auftrag(abbruch, melden)))
+      except Abgebrochen:
+         self.queue.put(('cancelled', art, abbruch, None))
+      except Exception as exc:
+         self.queue.put(('error', art, abbruch, exc))
+
+   def poll_queue(self):
+      try:
+         while True:
+            typ, art, abbruch, daten = self.queue.get_nowait()
+            laufend = self.jobs.get(art)
+            if laufend is None or laufend[1] is not abbruch:
+               if typ == 'done' and art == 'pdf':   # überholter Auftrag: temporäre Datei aufräumen
+                  shutil.rmtree(Path(daten).parent, ignore_errors=True)
+               continue                             # Meldungen abgelöster Aufträge ignorieren
+            if typ == 'progress':
+               if abbruch.is_set():
+                  continue
+               stufe, erledigt, gesamt = daten
+               self.status.config(text=f"{FORTSCHRITT.get(stufe, stufe)}: {erledigt}" + (f" von {gesamt}" if gesamt else ""),
+                                  foreground="grey")
+               continue
+            del self.jobs[art]
+            getattr(self, f"{art}_{typ}")(daten)
+            if not self.jobs:
+               self.btn_cancel.config(state="disabled")
+      except queue.Empty:
+         pass
+      self.after(50, self.poll_queue)
+
+   # ----------------------------------------------------------------------------------------------------------
+   # --- EVENT-Handler --------------------------------------------------------------------------------------------
+   def on_check(self):
+      url = self.url_var.get().strip()
+      if self.start_job('check', (url,), lambda abbruch, melden: self.check_stream(url, abbruch)):
+         self.status.config(text="Verbindung wird geprüft ...", foreground="grey")
+         self.btn_pdf.config(state="disabled")
+
+   def check_done(self, ergebnis):
+      ok, statuserr = ergebnis
+      if ok:
+         self.status.config(text="Verbindung erfolgreich", foreground="green")
+         self.btn_pdf.config(state="normal")
+      else:
+         self.status.config(text=f"{statuserr}", foreground="red")
+         self.btn_pdf.config(state="disabled")
+
+   def check_error(self, exc):
+      self.check_done((False, str(exc)))
+
+   def check_cancelled(self, _):
+      self.status.config(text="Prüfung abgebrochen", foreground="grey")
+
+   def on_pdf(self):
+      url    = self.url_var.get().strip()
+      month  = self.month_var.get().strip()
+      year   = self.year_var.get().strip()
+      header = self.header_var.get().strip()
+      self.save_defaults()
+
+      def auftrag(abbruch, melden):
+         # --- eigene JCal-Instanz je Auftrag (gemeinsamer Feed-Cache), die PDF entsteht in einem temporären Ordner
+         jcal = JCal(cache=self.jcal.cache)
+         jcal.abbruch, jcal.progress = abbruch, melden
+         tmpdir = tempfile.mkdtemp(prefix="jcal_")
+         try:
+            jcal.parseEvents(month, year, feeds_der_zeile(url))
+            pdf_tmp = Path(tmpdir) / "jcal_tmp.pdf"
+            jcal.createPdf(pdf_tmp, header)
+         except BaseException:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+            raise
+         # --- Monat und Jahr des Auftrags für den Dateinamen (die Eingabefelder können sich inzwischen geändert haben)
+         return pdf_tmp, jcal.startM, jcal.startY
+
+      if self.start_job('pdf', (url, month, year, header), auftrag):
+         self.status.config(text="PDF wird erzeugt ...", foreground="grey")
+
+   def pdf_done(self, ergebnis: tuple[Path, int, int]):
+      pdf_tmp, month, year = ergebnis
+      try:
+         # --- Speichern-unter-Dialog
+         def_name = f"jahreskalender_{year}_{month}.pdf"
+         file_path = fd.asksaveasfilename(
+            parent=self,
+            title="Jahreskalender-PDF speichern unter ...",
+            defaultextension=".pdf",
+            initialfile=def_name,
+            filetypes=[("PDF-Datei", "*.pdf")])
+         if not file_path:
+            self.status.config(text="PDF nicht gespeichert", foreground="grey")
+            return
+         Path(file_path).write_bytes(pdf_tmp.read_bytes())
+         self.status.config(text="PDF erzeugt", foreground="green")
+         messagebox.showinfo("Fertig", f"PDF wurde erzeugt:\n{file_path}")
+         open_file(file_path)
+      except Exception as exc:
+         messagebox.showerror("Fehler", f"PDF konnte nicht gespeichert werden:\n{exc}")
+      finally:
+         shutil.rmtree(pdf_tmp.parent, ignore_errors=True)
+
+   def pdf_error(self, exc):
+      self.status.config(text="PDF-Erzeugung fehlgeschlagen", foreground="red")
+      messagebox.showerror("Fehler", f"PDF-Erzeugung schlug fehl:\n{exc}")
+
+   def pdf_cancelled(self, _):
+      self.status.config(text="PDF-Erzeugung abgebrochen", foreground="grey")
+
+   def on_cancel(self):
+      for _, abbruch, _ in self.jobs.values():
+         abbruch.set()
+      self.status.config(text="wird abgebrochen ...", foreground="grey")
+
+   def on_close(self):
+      self.on_cancel()
+      self.worker.shutdown(wait=False, cancel_futures=True)
+      self.destroy()
+
+def main():
+   App().mainloop()
+
+if __name__ == "__main__":
+   main()
+   
\ No newline at end of file
@@ -0,0 +1,348 @@
+from __future__ import annotations
+# Lokaler Render-Dienst für den Jahreskalender: liefert die PDF zu (Feed(s), Startmonat, Startjahr, Überschrift) per
+# HTTP, damit nicht jede Lehrkraft die GUI einzeln bedienen muss.
+#
+#   python jcal_server.py                                  # http://127.0.0.1:8377/, Worker = Anzahl CPUs
+#   python jcal_server.py --port 9000 -j 2
+#
+#   GET /kalender.pdf?feed=URL[&feed=URL2...]&month=8&year=2025&header=Jahreskalender%20{jahre}
+#   GET /kalender.pdf?feed=URL&month=8&year=2025&months=36      # oder &until=2028-07, je 6 Monate eine Seite
+#   GET /kalender.pdf?feed=URL&month=8&year=2025&land=BY        # Feiertage des Landes ohne eigenen Feed
+#   GET /metrics                                           # Trefferquote, Renderzeiten, Warteschlange (JSON)
+#
+# Fertige PDFs liegen in einem LRU-Cache im Speicher und auf der Platte; der Schlüssel enthält die Parameter und die
+# Version jedes Feeds (ETag bzw. Last-Modified, sonst eine Prüfsumme), ein geänderter Feed ergibt also eine neue PDF.
+# Gleiche Anfragen, die gleichzeitig ankommen, warten auf denselben Feed-Abruf und dieselbe Erzeugung; der Worker
+# bekommt die Feeds in der Version des Schlüssels mit und ruft sie nicht erneut ab. Erzeugt wird in einem Prozess-Pool
+# mit fester Größe; sind zu viele Erzeugungen offen, antwortet der Dienst mit 503 statt die Maschine zu überlasten.
+import argparse
+import collections
+import hashlib
+import http.server
+import json
+import multiprocessing
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, Future
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qs
+
+import jcal
+from jcal import FeedCache, CACHE_DIR, split_feeds, ist_lokal, complete_profile, ferien_tabelle_von, render_job, log
+
+SERVER_PORT       = 8377
+SERVER_FEED_ALTER = 60                  # Sekunden, in denen ein Feed ohne Rückfrage beim Server als aktuell gilt
+SERVER_MEM_BYTES  = 64 * 1024 * 1024    # Obergrenze der PDFs im Speicher
+SERVER_DISK_BYTES = 500 * 1024 * 1024   # Obergrenze der PDFs auf der Platte
+SERVER_DISK_DIR   = CACHE_DIR / "pdf"
+SERVER_WARTEND    = 32                  # höchstens so viele offene Erzeugungen, darüber 503
+SERVER_MESSWERTE  = 500                 # so viele Laufzeiten gehen in die Kennzahlen ein
+SERVER_MAX_MONATE = 120                 # längster Zeitraum je Anfrage (10 Jahre, 20 Seiten)
+
+# ################################################################################################################
+# ### PDF-Cache: Speicher und Platte, jeweils LRU mit Obergrenze in Bytes ##########################################
+# ################################################################################################################
+class PdfCache:
+   def __init__(self, verzeichnis=SERVER_DISK_DIR, mem_bytes=SERVER_MEM_BYTES, disk_bytes=SERVER_DISK_BYTES):
+      self.verzeichnis = Path(verzeichnis)
+      self.mem_bytes   = mem_bytes
+      self.disk_bytes  = disk_bytes
+      self._mem        = collections.OrderedDict() # Schlüssel -> PDF, zuletzt benutzte am Ende
+      self._mem_gesamt = 0
+      self._lock       = threading.Lock()
+      self.verzeichnis.mkdir(parents=True, exist_ok=True)
+
+   def pfad(self, schluessel: str) -> Path:
+      return self.verzeichnis / f"{schluessel}.pdf"
+
+   # --- liefert (PDF, 'mem' | 'disk') oder (None, None)
+   def get(self, schluessel: str):
+      with self._lock:
+         pdf = self._mem.get(schluessel)
+         if pdf is not None:
+            self._mem.move_to_end(schluessel)
+            return pdf, 'mem'
+      pfad = self.pfad(schluessel)
+      try:
+         pdf = pfad.read_bytes()
+         os.utime(pfad) # Änderungszeit = letzte Verwendung, danach richtet sich die Verdrängung auf der Platte
+      except OSError:
+         return None, None
+      self._merken(schluessel, pdf)
+      return pdf, 'disk'
+
+   # --- eine fertig geschriebene Datei (im selben Verzeichnis) übernehmen
+   def put(self, schluessel: str, datei: Path) -> bytes:
+      pdf = datei.read_bytes()
+      os.replace(datei, self.pfad(schluessel))
+      self._merken(schluessel, pdf)
+      self.evict()
+      return pdf
+
+   def _merken(self, schluessel: str, pdf: bytes):
+      with self._lock:
+         if schluessel in self._mem:
+            return
+         self._mem[schluessel] = pdf
+         self._mem_gesamt += len(pdf)
+         while self._mem_gesamt > self.mem_bytes and len(self._mem) > 1:
+            _, alt = self._mem.popitem(last=False)
+            self._mem_gesamt -= len(alt)
+
+   def evict(self):
+      eintraege = []
+      for pfad in self.verzeichnis.glob("*.pdf"):
+         try:
+            stat = pfad.stat()
+         except OSError:
+            continue
+         eintraege.append((stat.st_mtime, stat.st_size, pfad))
+      gesamt = sum(groesse for _, groesse, _ in eintraege)
+      for _, groesse, pfad in sorted(eintraege):
+         if gesamt <= self.disk_bytes:
+            break
+         pfad.unlink(missing_ok=True)
+         gesamt -= groesse
+
+   def stats(self) -> dict:
+      with self._lock:
+         return {'mem_eintraege': len(self._mem), 'mem_bytes': self._mem_gesamt}
+
+# ################################################################################################################
+# ### Dienst: Schlüssel bilden, zusammenführen, erzeugen lassen, Kennzahlen #######################################
+# ################################################################################################################
+class RenderDienst:
+   def __init__(self, jobs=None, cache: PdfCache | None = None):
+      self.cache  = cache or PdfCache()
+      self.feeds  = FeedCache(max_age=SERVER_FEED_ALTER, mem_ttl=SERVER_FEED_ALTER)
+      # --- Worker nicht per fork() aus dem laufenden HTTP-Server erzeugen: sie würden sonst den Socket, auf dem der
+      #     Server lauscht, und die Sperren seiner Threads erben
+      self.pool   = ProcessPoolExecutor(max_workers=jobs, initializer=jcal._worker_init, initargs=(0,),
+                                        mp_context=multiprocessing.get_context("spawn"))
+      self._offen = {}   # Schlüssel -> Future der laufenden Erzeugung
+      self._abrufe = {}  # URL -> Future des laufenden Feed-Abrufs
+      self._lock  = threading.Lock()
+      self.zaehler = collections.Counter()
+      self.renderzeiten  = collections.deque(maxlen=SERVER_MESSWERTE)
+      self.antwortzeiten = collections.deque(maxlen=SERVER_MESSWERTE)
+
+   # --- Feed abrufen: (Inhalt, Version); gleichzeitige Abrufe derselben URL warten auf denselben Abruf
+   def feed(self, url: str) -> tuple[bytes, str]:
+      with self._lock:
+         future = self._abrufe.get(url)
+         abrufen = future is None
+         if abrufen:
+            future = self._abrufe[url] = Future()
+      if abrufen:
+         try:
+            body = self.feeds.fetch(url)
+            future.set_result((body, self.feeds.validator(url) or hashlib.sha1(body).hexdigest()))
+         except BaseException as exc:
+            future.set_exception(exc)
+         finally:
+            with self._lock:
+               del self._abrufe[url]
+      return future.result()
+
+   # --- Schlüssel aus den Parametern und der aktuellen Version jedes Feeds; dazu der Inhalt jedes Feeds in genau
+   #     dieser Version, damit der Worker nicht erneut abruft und die PDF immer zum Schlüssel passt
+   def schluessel(self, profil: dict) -> tuple[str, dict]:
+      versionen, stand = [], {}
+      for url in split_feeds(profil['url']):
+         stand[url], version = self.feed(url)
+         versionen.append(version)
+      # --- eine geänderte Ferientabelle ergibt wie ein geänderter Feed eine neue PDF
+      tabelle = ferien_tabelle_von(profil)
+      if tabelle:
+         try:
+            stand = tabelle.stat()
+            versionen.append([str(tabelle), stand.st_mtime_ns, stand.st_size])
+         except OSError:
+            versionen.append([str(tabelle), None, None])
+      teile = [split_feeds(profil['url']), int(profil['month']), int(profil['year']), profil['months'], profil['header'],
+               profil['parser'], profil['land'], versionen]
+      return hashlib.sha1(json.dumps(teile).encode("utf-8")).hexdigest(), stand
+
+   # --- PDF liefern: (PDF, Herkunft, Schlüssel); Herkunft ist mem, disk, render oder coalesced
+   def pdf(self, profil: dict):
+      schluessel, stand = self.schluessel(profil)
+      pdf, herkunft = self.cache.get(schluessel)
+      if pdf is not None:
+         self.zaehle(herkunft)
+         return pdf, herkunft, schluessel
+      with self._lock:
+         future = self._offen.get(schluessel)
+         herkunft = 'coalesced' if future is not None else 'render'
+         if future is None:
+            if len(self._offen) >= SERVER_WARTEND:
+               self.zaehle('abgelehnt')
+               raise Ueberlastet(len(self._offen))
+            future = self._offen[schluessel] = Future()
+      self.zaehle(herkunft)
+      if herkunft == 'render':
+         self._erzeugen(schluessel, {**profil, 'feed_stand': stand}, future)
+      return future.result(), herkunft, schluessel
+
+   def _erzeugen(self, schluessel: str, profil: dict, future: Future):
+      t0 = time.perf_counter()
+      tmp = self.cache.verzeichnis / f".{schluessel}.{threading.get_ident()}.tmp.pdf"
+      try:
+         ergebnis = self.pool.submit(render_job, {**profil, 'name': schluessel[:12], 'out': str(tmp)}).result()
+         if not ergebnis['ok']:
+            raise RenderFehler(ergebnis['fehler'])
+         future.set_result(self.cache.put(schluessel, tmp))
+      except BaseException as exc:
+         self.zaehle('fehler')
+         future.set_exception(exc)
+      finally:
+         tmp.unlink(missing_ok=True)
+         with self._lock:
+            del self._offen[schluessel]
+         self.renderzeiten.append(time.perf_counter() - t0)
+
+   def zaehle(self, name: str):
+      with self._lock:
+         self.zaehler[name] += 1
+
+   def metriken(self) -> dict:
+      with self._lock:
+         zaehler, offen = dict(self.zaehler), len(self._offen)
+         renderzeiten, antwortzeiten = list(self.renderzeiten), list(self.antwortzeiten)
+      treffer  = zaehler.get('mem', 0) + zaehler.get('disk', 0)
+      anfragen = treffer + zaehler.get('render', 0) + zaehler.get('coalesced', 0)
+      return {'anfragen':      anfragen,
+              'zaehler':       zaehler,
+              'trefferquote':  round(treffer / anfragen, 4) if anfragen else None,
+              'offen':         offen,
+              'renderzeit_s':  verteilung(renderzeiten),
+              'antwortzeit_s': verteilung(antwortzeiten),
+              'pdf_cache':     self.cache.stats(),
+              'feed_cache':    self.feeds.stats()}
+
+   def close(self):
+      self.pool.shutdown(wait=False, cancel_futures=True)
+
+class Ueberlastet(Exception):
+   pass
+
+class RenderFehler(Exception):
+   pass
+
+def verteilung(werte: list[float]) -> dict | None:
+   if not werte:
+      return None
+   werte = sorted(werte)
+   return {'anzahl':     len(werte),
+           'mittel':     round(statistics.fmean(werte), 4),
+           'median':     round(werte[len(werte) // 2], 4),
+           'p95':        round(werte[min(len(werte) - 1, int(len(werte) * 0.95))], 4),
+           'max':        round(werte[-1], 4)}
+
+# --- Anfrageparameter -> Profil wie im Stapelbetrieb; ValueError bei fehlenden oder ungültigen Angaben
+def profil_aus_anfrage(query: dict) -> dict:
+   feeds = [url for wert in query.get('feed', []) for url in split_feeds(wert)]
+   if not feeds and not query.get('land'):
+      raise ValueError("Parameter 'feed' oder 'land' fehlt")
+   # --- keine Dateien des Servers ausliefern: nur Feeds im Netz
+   if any(ist_lokal(url) for url in feeds):
+      raise ValueError("nur http(s)-Feeds erlaubt")
+   profil = {'url': feeds}
+   for key in ('month', 'year', 'months', 'until', 'land', 'header', 'parser'):
+      if query.get(key):
+         profil[key] = query[key][0]
+   # --- Zahlen selbst prüfen, damit die Antwort nicht die Meldung von int() enthält
+   for key in ('month', 'year', 'months'):
+      if key in profil and not profil[key].strip().isdecimal():
+         raise ValueError("ungültiger Monat oder ungültiges Jahr" if key != 'months' else "ungültige Anzahl Monate")
+   if 'until' in profil and not re.fullmatch(r"\d{4}-\d{1,2}", profil['until'].strip()):
+      raise ValueError("ungültiges Ende (until), erwartet JJJJ-MM")
+   profil = complete_profile(profil)
+   if not 1 <= int(profil['month']) <= 12 or not 1 <= int(profil['year']) <= 9999:
+      raise ValueError("ungültiger Monat oder ungültiges Jahr")
+   if profil['months'] > SERVER_MAX_MONATE:
+      raise ValueError(f"höchstens {SERVER_MAX_MONATE} Monate je Kalender")
+   if profil['parser'] not in ("stream", "icalendar"):
+      raise ValueError("ungültiger Parser")
+   return profil
+
+# ################################################################################################################
+# ### HTTP #######################################################################################################
+# ################################################################################################################
+class RenderHandler(http.server.BaseHTTPRequestHandler):
+   dienst: RenderDienst = None   # wird von serve() gesetzt
+
+   def do_GET(self):
+      teile = urlsplit(self.path)
+      if teile.path == "/metrics":
+         return self.senden(200, json.dumps(self.dienst.metriken(), indent=2).encode("utf-8"), "application/json")
+      if teile.path != "/kalender.pdf":
+         return self.senden(404, "GET /kalender.pdf?feed=URL&month=M&year=J[&months=N|&until=JJJJ-MM]&header=TEXT oder GET /metrics\n")
+      t0 = time.perf_counter()
+      try:
+         profil = profil_aus_anfrage(parse_qs(teile.query))
+         pdf, herkunft, schluessel = self.dienst.pdf(profil)
+      except ValueError as exc:
+         return self.senden(400, f"{exc}\n")
+      except Ueberlastet:
+         return self.senden(503, "zu viele offene Anfragen, bitte später erneut versuchen\n", kopf={'Retry-After': "5"})
+      except Exception as exc:
+         log.warning("Kalender konnte nicht erzeugt werden: %s: %s", type(exc).__name__, exc)
+         return self.senden(502, f"Kalender konnte nicht erzeugt werden: {exc}\n")
+      self.dienst.antwortzeiten.append(time.perf_counter() - t0)
+      etag = f'"{schluessel}"'
+      if self.headers.get("If-None-Match") == etag:
+         return self.senden(304, b"", kopf={'ETag': etag})
+      dateiname = f"jahreskalender_{int(profil['year'])}_{int(profil['month'])}.pdf"
+      self.senden(200, pdf, "application/pdf", kopf={'ETag': etag, 'X-Cache': herkunft,
+                                                     'Content-Disposition': f'inline; filename="{dateiname}"'})
+
+   def senden(self, status: int, inhalt, typ="text/plain; charset=utf-8", kopf=None):
+      if isinstance(inhalt, str):
+         inhalt = inhalt.encode("utf-8")
+      self.send_response(status)
+      for name, wert in (kopf or {}).items():
+         self.send_header(name, wert)
+      if status != 304:
+         self.send_header("Content-Type", typ)
+         self.send_header("Content-Length", str(len(inhalt)))
+      self.end_headers()
+      if status != 304:
+         self.wfile.write(inhalt)
+
+   def log_message(self, format, *args):
+      log.info("%s - %s", self.address_string(), format % args)
+
+def serve(port=SERVER_PORT, host="127.0.0.1", jobs=None):
+   dienst = RenderDienst(jobs)
+   handler = type("Handler", (RenderHandler,), {'dienst': dienst})
+   server = http.server.ThreadingHTTPServer((host, port), handler)
+   server.daemon_threads = True
+   print(f"Render-Dienst auf http://{host}:{server.server_port}/ (Abbruch mit Strg+C)", flush=True)
+   try:
+      server.serve_forever()
+   except KeyboardInterrupt:
+      pass
+   finally:
+      server.server_close()
+      dienst.close()
+
+# ################################################################################################################
+# ### Kommandozeile ###############################################################################################
+# ################################################################################################################
+def main(argv=None) -> int:
+   ap = argparse.ArgumentParser(prog="jcal_server", description="Lokaler HTTP-Dienst: PDF-Jahreskalender zu Feed, Startmonat, Startjahr und Überschrift")
+   ap.add_argument("--host",         default="127.0.0.1", help="Adresse, an die der Dienst gebunden wird (Standard: nur lokal)")
+   ap.add_argument("--port",         type=int, default=SERVER_PORT, help=f"Port (Standard: {SERVER_PORT})")
+   ap.add_argument("-j", "--jobs",   type=int, default=None, help="Anzahl paralleler Erzeugungen (Standard: Anzahl CPUs)")
+   ap.add_argument("-v", "--verbose", action="count", default=0, help="Anfragen protokollieren")
+   args = ap.parse_args(argv)
+   jcal.setup_logging(args.verbose)
+   serve(args.port, args.host, args.jobs)
+   return 0
+
+if __name__ == "__main__":
+   sys.exit(main())